@@ -0,0 +1,245 @@
+# async_enrichment.py
+# asyncio engine for I/O-bound enrichment: per-provider limits, a global in-flight cap, thread-safe progress
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Iterator, List
+
+from batch_enrichment import BatchProgress
+from pipeline_executor import TaskInterrupted, dependency_indices
+
+# Provider calls in flight across every batch in the process
+ASYNC_MAX_IN_FLIGHT = int(os.environ.get("C360_ASYNC_MAX_IN_FLIGHT", "256"))
+# Companies one batch keeps in progress (each one has up to len(TASKS) calls)
+ASYNC_COMPANIES_IN_FLIGHT = int(os.environ.get("C360_ASYNC_COMPANIES", "64"))
+# Seconds the script thread waits on the bridge queue before re-checking the run
+BRIDGE_POLL_SECONDS = 0.1
+
+
+# ---------------------------
+# Limits
+# ---------------------------
+class TokenBucket:
+    """`rate` tokens per second, up to `burst` saved; acquire() waits for one. Loop-local."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ProviderLimiter:
+    """Concurrency semaphore + optional token bucket for one provider."""
+
+    def __init__(self, max_concurrency: int | None, rate_per_second: float, burst: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._bucket = TokenBucket(rate_per_second, burst) if rate_per_second > 0 else None
+
+    async def __aenter__(self) -> None:
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        if self._bucket is not None:
+            try:
+                await self._bucket.acquire()
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+
+    async def __aexit__(self, *exc) -> None:
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+
+# ---------------------------
+# Engine
+# ---------------------------
+class AsyncEnrichmentEngine:
+    """
+    Owns one event loop on a daemon thread. Coroutines are submitted from
+    any thread (submit() returns a concurrent.futures.Future); provider
+    calls made through call() share the global in-flight cap and their
+    provider's ProviderLimiter. The loop thread never touches Streamlit:
+    results reach the script thread through queues (see run_batch_async).
+    """
+
+    def __init__(self, max_in_flight: int = ASYNC_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self._loop = asyncio.new_event_loop()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._stats = {"calls": 0, "in_flight": 0, "peak_in_flight": 0}
+        self._thread = threading.Thread(target=self._loop.run_forever, name="c360-async", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Awaitable) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _limiter(self, provider) -> ProviderLimiter:
+        limiter = self._limiters.get(provider.name)
+        if limiter is None:
+            limiter = ProviderLimiter(provider.max_concurrency, provider.rate_per_second, provider.burst)
+            self._limiters[provider.name] = limiter
+        return limiter
+
+    async def call(self, provider, stage: str, company: str, cols: List[str], row) -> Dict:
+        """provider.afetch(...) under the global cap and the provider's limits."""
+        # Provider limits first: calls queued on a throttled provider must not hold global slots
+        async with self._limiter(provider), self._in_flight:
+            self._stats["calls"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+            try:
+                return await provider.afetch(stage, company, cols, row)
+            finally:
+                self._stats["in_flight"] -= 1
+
+    def stats(self) -> Dict:
+        return dict(self._stats)
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_ENGINE: AsyncEnrichmentEngine | None = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_async_engine() -> AsyncEnrichmentEngine:
+    """Process-wide engine (one loop thread shared by every session)."""
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = AsyncEnrichmentEngine()
+        return _ENGINE
+
+
+# ---------------------------
+# Task graph
+# ---------------------------
+async def run_dag_async(
+    tasks: List[Dict],
+    run_task: Callable[[int, Dict, threading.Event], Awaitable],
+    cancel: threading.Event | None = None,
+) -> Dict[int, Dict]:
+    """
+    asyncio counterpart of pipeline_executor.run_dag_inline: every task starts
+    as soon as its "depends_on" tasks finished (independent stages overlap)
+    and the terminal event per task position is returned.
+    """
+    deps = dependency_indices(tasks)
+    cancel = cancel or threading.Event()
+    outcomes: Dict[int, Dict] = {}
+    done: Dict[int, asyncio.Event] = {i: asyncio.Event() for i in range(len(tasks))}
+
+    async def run_one(index: int) -> None:
+        try:
+            for d in deps[index]:
+                await done[d].wait()
+            if any(outcomes[d]["type"] != "finished" for d in deps[index]):
+                outcomes[index] = {"type": "skipped", "index": index, "reason": "upstream task did not complete"}
+            elif cancel.is_set():
+                outcomes[index] = {"type": "interrupted", "index": index}
+            else:
+                try:
+                    result = await run_task(index, tasks[index], cancel)
+                except TaskInterrupted:
+                    outcomes[index] = {"type": "interrupted", "index": index}
+                except Exception as e:
+                    outcomes[index] = {"type": "failed", "index": index, "error": str(e)}
+                else:
+                    outcomes[index] = {"type": "finished", "index": index, "result": result}
+        finally:
+            done[index].set()
+
+    await asyncio.gather(*(run_one(i) for i in range(len(tasks))))
+    return outcomes
+
+
+# ---------------------------
+# Batch runner
+# ---------------------------
+def run_batch_async(
+    positions: List[int],
+    enrich_company: Callable[[int, threading.Event], Awaitable[Dict]],
+    companies_in_flight: int = ASYNC_COMPANIES_IN_FLIGHT,
+    cancel: threading.Event | None = None,
+    engine: AsyncEnrichmentEngine | None = None,
+) -> Iterator[Dict]:
+    """
+    Same contract as batch_enrichment.run_batch, but `enrich_company` is a
+    coroutine function run on the engine's loop with up to
+    `companies_in_flight` companies at once. Outcomes cross back to the
+    caller's thread through a queue.Queue (the thread-safe bridge), so the
+    generator can drive Streamlit widgets directly. Closing the generator
+    (or setting `cancel`) stops starting companies and cancels running ones.
+    """
+    engine = engine or get_async_engine()
+    cancel = cancel or threading.Event()
+    bridge: "queue.Queue[tuple]" = queue.Queue()
+    progress = BatchProgress(len(positions))
+
+    async def drive() -> None:
+        window = asyncio.Semaphore(max(1, companies_in_flight))
+
+        async def one(position: int) -> None:
+            try:
+                outcome = await enrich_company(position, cancel)
+            except Exception as e:
+                outcome = {"ok": False, "failed_tasks": ["(company)"], "error": str(e)}
+            finally:
+                window.release()
+            bridge.put((position, outcome))
+
+        running = set()
+        try:
+            for position in positions:
+                await window.acquire()
+                if cancel.is_set():
+                    window.release()
+                    break
+                task = asyncio.ensure_future(one(position))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in running:
+                task.cancel()
+            raise
+
+    future = engine.submit(drive())
+    completed = False
+    try:
+        while progress.done < len(positions):
+            try:
+                position, outcome = bridge.get(timeout=BRIDGE_POLL_SECONDS)
+            except queue.Empty:
+                if future.done() and bridge.empty():
+                    future.result()  # re-raise a driver failure
+                    break  # cancelled: no more outcomes will arrive
+                continue
+            progress.record(outcome)
+            yield {"position": position, "outcome": outcome, "progress": progress.snapshot()}
+        completed = True
+    finally:
+        if not completed:
+            cancel.set()
+            future.cancel()
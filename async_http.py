@@ -0,0 +1,77 @@
+# async_http.py
+# asyncio JSON client (aiohttp) with a keep-alive pool, timeouts and retry/backoff
+
+import asyncio
+import json
+from typing import Dict, Tuple
+from urllib.request import getproxies
+
+import aiohttp
+
+
+class AsyncHttpError(Exception):
+    """Connection / protocol failure after the client's retries were used up."""
+
+
+class AsyncHttpClient:
+    """
+    GET-only client for JSON provider APIs over one aiohttp session, bound
+    to the event loop that creates it (create it from a coroutine). At most
+    `pool_size` connections per host, kept alive between calls; proxy
+    settings come from the environment (HTTP(S)_PROXY / NO_PROXY), as for
+    the requests session. Retries cover connection errors, timeouts and
+    `retry_statuses` with exponential backoff (honouring a numeric Retry-After).
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        connect_timeout: float,
+        read_timeout: float,
+        retries: int,
+        backoff: float,
+        retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_statuses = retry_statuses
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0, limit_per_host=pool_size),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            headers={"Accept": "application/json"},
+            # Env proxies (and .netrc) are re-read per request with trust_env; only pay for it when set
+            trust_env=bool(getproxies()),
+        )
+
+    async def get_json(self, url: str, params: Dict | None = None) -> Tuple[int, Dict | None]:
+        """(status, parsed JSON body or None)."""
+        attempt = 0
+        while True:
+            retry_after = ""
+            try:
+                async with self._session.get(url, params=params) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After", "")
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt >= self.retries:
+                    raise AsyncHttpError(f"{type(exc).__name__} calling {url}") from exc
+            else:
+                if status not in self.retry_statuses or attempt >= self.retries:
+                    try:
+                        return status, json_body(body)
+                    except ValueError:
+                        return status, None
+            delay = self.backoff * (2 ** attempt)
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._session.close()
+
+
+def json_body(body: bytes) -> Dict | None:
+    """Parsed JSON, or None for an empty body (204 / 304 ...); raises ValueError if malformed."""
+    return json.loads(body) if body else None
@@ -0,0 +1,138 @@
+# batch_enrichment.py
+# Bounded-pool batch runner that takes a whole lead list through the Company 360 pipeline
+
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List
+
+
+BATCH_MAX_WORKERS = int(os.environ.get("C360_BATCH_WORKERS", "8"))
+# Seconds each simulated log line takes in batch mode (the single-company console uses 0.7)
+BATCH_STEP_DELAY = float(os.environ.get("C360_BATCH_STEP_DELAY", "0"))
+# Futures kept in flight per worker, so a 100k-row list never queues 100k futures
+IN_FLIGHT_PER_WORKER = 2
+
+
+# ---------------------------
+# Progress accounting
+# ---------------------------
+class BatchProgress:
+    """Counters for one batch run: throughput, ETA and per-task failure counts."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.succeeded = 0
+        self.task_failures: Dict[str, int] = defaultdict(int)
+        self.tasks_run = 0
+        self.tasks_reused = 0
+        self.started_at = time.perf_counter()
+
+    def record(self, outcome: Dict) -> None:
+        self.done += 1
+        if outcome["ok"]:
+            self.succeeded += 1
+        for task_name in outcome["failed_tasks"]:
+            self.task_failures[task_name] += 1
+        self.tasks_run += outcome.get("tasks_run", 0)
+        self.tasks_reused += outcome.get("tasks_reused", 0)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def companies_per_minute(self) -> float:
+        return (self.done / self.elapsed * 60.0) if self.elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> float | None:
+        """Seconds left at the current rate (None until the first company completes)."""
+        if not self.done:
+            return None
+        return (self.total - self.done) * (self.elapsed / self.done)
+
+    def snapshot(self) -> Dict:
+        return {
+            "total": self.total,
+            "done": self.done,
+            "succeeded": self.succeeded,
+            "failed": self.done - self.succeeded,
+            "companies_per_minute": round(self.companies_per_minute(), 1),
+            "eta_seconds": self.eta_seconds(),
+            "elapsed_seconds": round(self.elapsed, 2),
+            "task_failures": dict(self.task_failures),
+            "tasks_run": self.tasks_run,
+            "tasks_reused": self.tasks_reused,
+        }
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+def run_batch(
+    positions: List[int],
+    enrich_company: Callable[[int, threading.Event], Dict],
+    max_workers: int = BATCH_MAX_WORKERS,
+    cancel: threading.Event | None = None,
+) -> Iterator[Dict]:
+    """
+    Enrich every row position with `enrich_company(position, cancel)` on a
+    bounded thread pool and yield, on the caller's thread, one event per
+    finished company:
+
+      {"position", "outcome": {"ok", "failed_tasks", ...}, "progress": snapshot}
+
+    enrich_company must return a dict with "ok" and "failed_tasks" (task
+    names), optionally "tasks_run" / "tasks_reused" counts for incremental
+    runs; an exception counts the whole company as failed. Closing the
+    generator (or setting `cancel`) stops submitting new companies.
+    """
+    cancel = cancel or threading.Event()
+    progress = BatchProgress(len(positions))
+    window = max(1, max_workers) * IN_FLIGHT_PER_WORKER
+    todo = iter(positions)
+    in_flight: Dict = {}
+
+    def submit_next(pool: ThreadPoolExecutor) -> None:
+        while len(in_flight) < window and not cancel.is_set():
+            position = next(todo, None)
+            if position is None:
+                return
+            in_flight[pool.submit(enrich_company, position, cancel)] = position
+
+    completed = False
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="c360-batch")
+    try:
+        submit_next(pool)
+        while in_flight:
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in finished:
+                position = in_flight.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = {"ok": False, "failed_tasks": ["(company)"], "error": str(e)}
+                progress.record(outcome)
+                yield {"position": position, "outcome": outcome, "progress": progress.snapshot()}
+            submit_next(pool)
+        completed = True
+    finally:
+        if not completed:
+            cancel.set()  # closed early: stop companies still running
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def format_eta(seconds: float | None) -> str:
+    """'1h 02m', '3m 05s', '12s' or '—' when unknown."""
+    if seconds is None:
+        return "—"
+    seconds = int(round(seconds))
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
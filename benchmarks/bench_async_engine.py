@@ -0,0 +1,92 @@
+# benchmarks/bench_async_engine.py
+# Provider-call throughput vs. concurrency: asyncio engine vs. a thread pool, against a local stand-in
+#
+# Usage:
+#   python benchmarks/bench_async_engine.py                              # 1, 8, 64, 256 in flight
+#   python benchmarks/bench_async_engine.py --calls 2000 --latency 0.2 --concurrency 32,512
+#   python benchmarks/bench_async_engine.py --rate 100                   # token bucket: 100 calls/s
+#
+# The stand-in sleeps --latency per request, so ideal throughput is
+# concurrency / latency until something else (client, server, rate limit)
+# becomes the bottleneck.
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from async_enrichment import AsyncEnrichmentEngine  # noqa: E402
+from enrichment_providers import HttpProvider, build_http_session  # noqa: E402
+from provider_standins import StandInProvider, fixtures_from_frame  # noqa: E402
+
+STAGE = "Technographic Profiling"
+COLS = ["Tech Install"]
+
+
+def make_frame(companies: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "company_name": [f"Bench Company {i}" for i in range(companies)],
+        "Official Domain": [f"bench{i}.example" for i in range(companies)],
+        "Tech Install": ["Salesforce, HubSpot, AWS"] * companies,
+    })
+
+
+def run_async(url: str, rows, concurrency: int, rate: float) -> tuple[float, int]:
+    """(calls/s, peak calls in flight) through the engine with a per-provider limit of `concurrency`."""
+    engine = AsyncEnrichmentEngine(max_in_flight=concurrency)
+    provider = HttpProvider(url, max_concurrency=concurrency, rate_per_second=rate, burst=max(1, int(rate // 10)))
+
+    async def all_calls():
+        await asyncio.gather(*(engine.call(provider, STAGE, r["company_name"], COLS, r) for r in rows))
+
+    t0 = time.perf_counter()
+    engine.submit(all_calls()).result()
+    elapsed = time.perf_counter() - t0
+    peak = engine.stats()["peak_in_flight"]
+    engine.close()
+    return len(rows) / elapsed, peak
+
+
+def run_threads(url: str, rows, concurrency: int) -> float:
+    """calls/s with one thread per in-flight call (pooled requests session)."""
+    provider = HttpProvider(url, session=build_http_session(pool_size=concurrency))
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda r: provider.fetch(STAGE, r["company_name"], COLS, r), rows))
+    return len(rows) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="asyncio engine vs. thread pool: provider-call throughput")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,8,64,256", help="comma-separated in-flight limits")
+    parser.add_argument("--latency", type=float, default=0.1, help="stand-in latency per request (s)")
+    parser.add_argument("--rate", type=float, default=0.0, help="token-bucket limit in calls/s (0 = none)")
+    parser.add_argument("--skip-threads", action="store_true")
+    args = parser.parse_args()
+
+    frame = make_frame(200)
+    fixtures = fixtures_from_frame(frame)
+    records = frame.to_dict("records")
+    rows = [records[i % len(records)] for i in range(args.calls)]
+
+    print(f"{'in flight':>9} | {'ideal/s':>8} | {'asyncio/s':>9} | {'peak':>5} | {'threads/s':>9}")
+    print("-" * 54)
+    for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+        ideal = concurrency / args.latency if not args.rate else min(args.rate, concurrency / args.latency)
+        with StandInProvider(fixtures, latency=args.latency) as standin:
+            rate, peak = run_async(standin.url, rows, concurrency, args.rate)
+        threads = "—"
+        if not args.skip_threads:
+            with StandInProvider(fixtures, latency=args.latency) as standin:
+                threads = f"{run_threads(standin.url, rows, concurrency):.1f}"
+        print(f"{concurrency:>9} | {ideal:>8.0f} | {rate:>9.1f} | {peak:>5} | {threads:>9}")
+
+
+if __name__ == "__main__":
+    main()
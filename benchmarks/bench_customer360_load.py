@@ -0,0 +1,92 @@
+# benchmarks/bench_customer360_load.py
+# Cold-load time and peak RSS: Customer360 workbook (XLSX) vs. Parquet snapshot
+#
+# Usage:
+#   python benchmarks/bench_customer360_load.py                 # 10k, 100k, 1M rows
+#   python benchmarks/bench_customer360_load.py --rows 10000    # quick run
+#
+# Each load runs in a fresh subprocess so timings are cold and the peak RSS
+# (ru_maxrss) belongs to that load alone. Writing the 1M-row XLSX fixture with
+# openpyxl is slow; fixtures are kept in --workdir and reused on later runs.
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_loader import CUSTOMER360_SHEET, DEFAULT_EXCEL_RELPATH  # noqa: E402
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r"""
+import resource, sys, time
+import pandas as pd
+kind, path = sys.argv[1], sys.argv[2]
+t0 = time.perf_counter()
+if kind == "xlsx":
+    df = pd.read_excel(path, sheet_name="{sheet}")
+else:
+    df = pd.read_parquet(path)
+elapsed = time.perf_counter() - t0
+# VmHWM is per address space; ru_maxrss would also count the parent's peak on Linux
+try:
+    with open("/proc/self/status") as fh:
+        rss_kb = next(int(ln.split()[1]) for ln in fh if ln.startswith("VmHWM:"))
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+print(f"{{elapsed:.4f}} {{rss_kb}} {{len(df)}}")
+""".format(sheet=CUSTOMER360_SHEET)
+
+
+def make_fixture(rows: int, workdir: str) -> tuple[str, str]:
+    """Tile the demo rows up to `rows` and write matching XLSX + Parquet files."""
+    xlsx_path = os.path.join(workdir, f"customer360_{rows}.xlsx")
+    pq_path = os.path.join(workdir, f"customer360_{rows}.parquet")
+    if os.path.exists(xlsx_path) and os.path.exists(pq_path):
+        return xlsx_path, pq_path
+
+    base = pd.read_excel(os.path.join(REPO_DIR, DEFAULT_EXCEL_RELPATH), sheet_name=CUSTOMER360_SHEET)
+    reps = -(-rows // len(base))
+    df = pd.concat([base] * reps, ignore_index=True).iloc[:rows].copy()
+    df["unique_id"] = [f"bench_{i}" for i in range(rows)]
+    df["company_name"] = df["company_name"].astype(str) + " #" + pd.Series(range(rows)).astype(str)
+
+    df.to_parquet(pq_path, index=False)
+    df.to_excel(xlsx_path, sheet_name=CUSTOMER360_SHEET, index=False)
+    return xlsx_path, pq_path
+
+
+def cold_load(kind: str, path: str) -> tuple[float, int]:
+    """Load `path` in a fresh interpreter; returns (seconds, peak RSS in KiB)."""
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, kind, path],
+        check=True, capture_output=True, text=True,
+    ).stdout.split()
+    return float(out[0]), int(out[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Customer360 XLSX vs. Parquet cold-load benchmark")
+    parser.add_argument("--rows", default="10000,100000,1000000", help="comma-separated row counts")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "c360_bench"))
+    args = parser.parse_args()
+    os.makedirs(args.workdir, exist_ok=True)
+
+    print(f"{'rows':>9} | {'format':<8} | {'load (s)':>9} | {'peak RSS (MiB)':>14} | {'file (MiB)':>10}")
+    print("-" * 64)
+    for rows in [int(r) for r in args.rows.split(",") if r.strip()]:
+        xlsx_path, pq_path = make_fixture(rows, args.workdir)
+        for kind, path in (("xlsx", xlsx_path), ("parquet", pq_path)):
+            secs, rss_kb = cold_load(kind, path)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            print(f"{rows:>9} | {kind:<8} | {secs:>9.3f} | {rss_kb / 1024:>14.1f} | {size_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_detailed_log.py
+# Detailed-log rendering throughput: one generate_detailed_log() call per task vs. the batch API
+#
+# Usage:
+#   python benchmarks/bench_detailed_log.py                     # 1k, 10k, 50k companies
+#   python benchmarks/bench_detailed_log.py --companies 200000
+#
+# Every company gets the five built-in step logs. "per call" is what the
+# pipeline does per task; "batch" renders each step for all companies in
+# one pass (shared run timestamp) straight into a file sink.
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from log_templates import get_log_template, write_detailed_logs  # noqa: E402
+
+STEPS = ["website", "firmo", "techno", "financials", "growth"]
+
+
+def per_call(targets, sink) -> None:
+    for company, website, csafe in targets:
+        run_ts = datetime.datetime.now()
+        for step in STEPS:
+            sink(get_log_template(step).render(company, website, csafe, run_ts))
+
+
+def batch(targets, sink) -> None:
+    for step in STEPS:
+        write_detailed_logs(step, targets, sink)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="generate_detailed_log per call vs. batch rendering")
+    parser.add_argument("--companies", default="1000,10000,50000", help="comma-separated company counts")
+    args = parser.parse_args()
+
+    print(f"{'companies':>9} | {'per call logs/s':>15} | {'batch logs/s':>12} | {'MB written':>10}")
+    print("-" * 57)
+    for n in [int(c) for c in args.companies.split(",") if c.strip()]:
+        targets = [(f"Bench Company {i}", f"bench{i}.example", f"Bench_Company_{i}") for i in range(n)]
+        rates = []
+        for fn in (per_call, batch):
+            with tempfile.TemporaryFile("w", encoding="utf-8") as sink:
+                t0 = time.perf_counter()
+                fn(targets, sink.write)
+                rates.append(n * len(STEPS) / (time.perf_counter() - t0))
+                size = sink.tell()
+        print(f"{n:>9,} | {rates[0]:>15,.0f} | {rates[1]:>12,.0f} | {size / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
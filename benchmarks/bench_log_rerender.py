@@ -0,0 +1,95 @@
+# benchmarks/bench_log_rerender.py
+# Per-rerun cost of showing a completed run's task logs: re-parse vs. store read vs. render cache
+#
+# Usage:
+#   python benchmarks/bench_log_rerender.py                         # 5 tasks x 10, 100, 1k, 10k lines
+#   python benchmarks/bench_log_rerender.py --lines 50,500 --reruns 200
+#
+# "re-parse" is the old page code: every task's log kept as one
+# "{ts} - {cls} - {text}" string in session state, split and formatted
+# twice per rerun. "store" rebuilds the boxes from the run log store on
+# every rerun; "cache" is what reruns do now (one render-cache hit per task).
+
+import argparse
+import html
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from log_stream import RenderedLogCache, log_box_html  # noqa: E402
+from run_log_store import RunLogStore, log_record  # noqa: E402
+
+TASKS = 5
+CLASSES = ("title", "info", "step", "ok", "warn")
+
+
+def make_lines(n: int):
+    return [(CLASSES[k % len(CLASSES)], f"Agent step {k}: resolved signal <{k}> for acme.example") for k in range(n)]
+
+
+def rerender_reparse(session_logs) -> int:
+    """The previous rerun path, verbatim in spirit (both passes)."""
+    sent = 0
+    for existing_log in session_logs:
+        formatted_html = ""
+        for ln in existing_log.split("\n"):
+            try:
+                _, cls, text = ln.split(" - ", 2)
+                cls = cls.lower()
+            except ValueError:
+                cls = "info"
+                text = ln
+            formatted_html += f"<div class='agent-log-line {cls}'>{html.escape(text)}</div>"
+        log_html = "".join([f"<div class='agent-log-line'>{line}</div>" for line in existing_log.split("\n")])
+        sent += len(formatted_html) + len(log_html)
+    return sent
+
+
+def rerender_store(store: RunLogStore, run_id: str) -> int:
+    stored = store.task_lines(run_id)
+    return sum(len(log_box_html((r["cls"], r["text"]) for r in stored.get(i, []))) for i in range(TASKS))
+
+
+def rerender_cache(cache: RenderedLogCache, run_id: str) -> int:
+    return sum(len(cache.get((run_id, i))) for i in range(TASKS))
+
+
+def per_rerun_ms(fn, reruns: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(reruns):
+        fn()
+    return (time.perf_counter() - t0) / reruns * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rerun render cost for a completed 5-task run")
+    parser.add_argument("--lines", default="10,100,1000,10000", help="comma-separated lines per task")
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'lines/task':>10} | {'re-parse ms':>11} | {'store ms':>9} | {'cache ms':>9} | {'speedup':>8}")
+    print("-" * 60)
+    for n in [int(x) for x in args.lines.split(",") if x.strip()]:
+        lines = make_lines(n)
+        session_logs = ["\n".join(f"2026-01-01 00:00:00 - {cls} - {text}" for cls, text in lines)] * TASKS
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RunLogStore(tmp)
+            run_id = f"bench{n}"
+            for i in range(TASKS):
+                store.append([log_record(run_id, "Acme", f"Task {i}", i, "step", text, cls) for cls, text in lines])
+            cache = RenderedLogCache()
+            for i in range(TASKS):
+                cache.put((run_id, i), log_box_html(lines))  # done once, when each task completes
+
+            # Fewer repetitions for the slow paths at large sizes
+            slow_reruns = max(1, args.reruns // max(1, n // 1000))
+            reparse = per_rerun_ms(lambda: rerender_reparse(session_logs), slow_reruns)
+            stored = per_rerun_ms(lambda: rerender_store(store, run_id), slow_reruns)
+            cached = per_rerun_ms(lambda: rerender_cache(cache, run_id), args.reruns)
+        print(f"{n:>10,} | {reparse:>11.3f} | {stored:>9.3f} | {cached:>9.4f} | {reparse / max(cached, 1e-9):>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
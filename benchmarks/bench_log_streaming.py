@@ -0,0 +1,105 @@
+# benchmarks/bench_log_streaming.py
+# Bytes sent to the browser per task log: full re-render per line vs. LogStream
+#
+# Usage:
+#   python benchmarks/bench_log_streaming.py                       # 10, 100, 1k, 10k lines
+#   python benchmarks/bench_log_streaming.py --lines 500 --rate 20
+#
+# Lines arrive at --rate lines/s on a simulated clock, so the numbers are
+# deterministic and the run takes milliseconds. "Bytes" is the markdown
+# payload handed to Streamlit (log box + progress HTML); websocket framing
+# and protobuf overhead add a roughly constant cost per frame on top.
+
+import argparse
+import html
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from log_stream import DEFAULT_MAX_HZ, DEFAULT_WINDOW, LogStream  # noqa: E402
+
+
+def progress_html(pct: int) -> str:
+    # Same markup as the task cards' "Executing... N%" block
+    return (
+        f"<div style='width:100%'>"
+        f"<div style='margin-bottom:6px; font-weight:600; font-size: 13px; color: #333;'>Executing... {pct}%</div>"
+        f"<progress value='{pct}' max='100' class='progress-inline'></progress>"
+        f"</div>"
+    )
+
+
+def sample_line(n: int) -> tuple[str, str]:
+    return "info", f"🔍 Step {n}: parsed provider response for Example Corp (source page {n % 17})"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Recorder:
+    """Stands in for st.empty(): counts elements and frames instead of rendering."""
+
+    def __init__(self):
+        self.elements = 0
+
+    def container(self, **kwargs):
+        return self
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self.elements += 1
+
+
+def full_rerender(lines: int) -> tuple[int, int]:
+    """Previous behaviour: whole log box + progress re-sent on every line."""
+    sent, frames, log_html = 0, 0, ""
+    for n in range(1, lines + 1):
+        cls, text = sample_line(n)
+        log_html += f"<div class='agent-log-line {cls}'>{html.escape(text)}</div>"
+        sent += len(f"<div class='agent-log-box'>{log_html}</div>".encode("utf-8"))
+        sent += len(progress_html(int(n / lines * 100)).encode("utf-8"))
+        frames += 1
+    return sent, frames
+
+
+def streamed(lines: int, rate: float, max_hz: float, window: int) -> tuple[int, int]:
+    """LogStream: appended lines only, coalesced to `max_hz`, bounded window."""
+    clock = _Clock()
+    placeholder = _Recorder()
+    stream = LogStream(
+        placeholder, "bench", progress_placeholder=placeholder, progress_html=progress_html,
+        max_hz=max_hz, window=window, clock=clock,
+    )
+    for n in range(1, lines + 1):
+        clock.now = n / rate
+        cls, text = sample_line(n)
+        stream.append(cls, text, pct=int(n / lines * 100))
+    stream.flush(force=True)
+    return stream.bytes_sent, stream.frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Task log streaming: bytes sent before / after LogStream")
+    parser.add_argument("--lines", default="10,100,1000,10000", help="comma-separated log lengths")
+    parser.add_argument("--rate", type=float, default=50.0, help="log lines per second")
+    parser.add_argument("--max-hz", type=float, default=DEFAULT_MAX_HZ)
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    args = parser.parse_args()
+
+    print(f"{'lines':>7} | {'full re-render':>16} | {'frames':>7} | {'LogStream':>12} | {'frames':>7} | {'ratio':>7}")
+    print("-" * 72)
+    for lines in [int(n) for n in args.lines.split(",") if n.strip()]:
+        before, before_frames = full_rerender(lines)
+        after, after_frames = streamed(lines, args.rate, args.max_hz, args.window)
+        print(
+            f"{lines:>7} | {before / 1024:>13.1f} KiB | {before_frames:>7} | "
+            f"{after / 1024:>8.1f} KiB | {after_frames:>7} | {before / max(after, 1):>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
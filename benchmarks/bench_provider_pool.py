@@ -0,0 +1,81 @@
+# benchmarks/bench_provider_pool.py
+# Provider calls against a local stand-in: pooled keep-alive session vs. a new connection per call
+#
+# Usage:
+#   python benchmarks/bench_provider_pool.py                          # 1, 8, 32 threads
+#   python benchmarks/bench_provider_pool.py --calls 200 --latency 0.1 --threads 1,16
+#
+# The stand-in (provider_standins.py) sleeps --latency per request, so the
+# throughput shows how many calls are really in flight; "connections" is the
+# number of TCP connections the server accepted.
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from enrichment_providers import HttpProvider, build_http_session  # noqa: E402
+from provider_standins import StandInProvider, fixtures_from_frame  # noqa: E402
+
+COLS = ["Tech Install"]
+
+
+def make_fixtures(companies: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "company_name": [f"Bench Company {i}" for i in range(companies)],
+        "Official Domain": [f"bench{i}.example" for i in range(companies)],
+        "Tech Install": ["Salesforce, HubSpot, AWS"] * companies,
+    })
+
+
+def run(url: str, calls: int, threads: int, pooled: bool, frame: pd.DataFrame) -> tuple[float, float]:
+    """Returns (calls per second, median call latency in ms)."""
+    session = build_http_session(pool_size=max(threads, 1)) if pooled else None
+    rows = [frame.iloc[i % len(frame)] for i in range(calls)]
+
+    def one(row) -> float:
+        # Unpooled: a fresh session (and TCP connection) per call
+        provider = HttpProvider(url, session=session or requests.Session())
+        t0 = time.perf_counter()
+        provider.fetch("Technographic Profiling", row["company_name"], COLS, row)
+        elapsed = time.perf_counter() - t0
+        if session is None:
+            provider._session.close()
+        return elapsed
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(one, rows))
+    total = time.perf_counter() - t0
+    if session is not None:
+        session.close()
+    return calls / total, statistics.median(latencies) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pooled vs. unpooled provider calls against a local stand-in")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--threads", default="1,8,32", help="comma-separated worker counts")
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in latency per request (s)")
+    args = parser.parse_args()
+
+    frame = make_fixtures(100)
+    print(f"{'threads':>7} | {'client':<8} | {'calls/s':>8} | {'p50 (ms)':>8} | {'connections':>11}")
+    print("-" * 56)
+    for threads in [int(t) for t in args.threads.split(",") if t.strip()]:
+        for pooled in (True, False):
+            with StandInProvider(fixtures_from_frame(frame), latency=args.latency) as standin:
+                rate, p50 = run(standin.url, args.calls, threads, pooled, frame)
+                conns = standin.stats()["connections"]
+            label = "pooled" if pooled else "per-call"
+            print(f"{threads:>7} | {label:<8} | {rate:>8.1f} | {p50:>8.1f} | {conns:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# checkpoints.py
+# Durable per-task checkpoints so interrupted pipeline / batch runs can resume
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Set
+
+DEFAULT_CHECKPOINT_RELPATH = os.path.join("Files", "run_checkpoints.sqlite3")
+
+# Run statuses: "running" (or died mid-run), "interrupted", "complete", "superseded"
+RESUMABLE_STATUSES = ("running", "interrupted")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id      TEXT PRIMARY KEY,
+        kind        TEXT NOT NULL,
+        label       TEXT NOT NULL,
+        params      TEXT NOT NULL,
+        status      TEXT NOT NULL,
+        created_at  REAL NOT NULL,
+        updated_at  REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        run_id      TEXT NOT NULL,
+        item        TEXT NOT NULL,
+        task        TEXT NOT NULL,
+        payload     TEXT NOT NULL,
+        created_at  REAL NOT NULL,
+        PRIMARY KEY (run_id, item, task)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS runs_by_label ON runs (kind, label, updated_at)",
+)
+
+
+def default_checkpoint_path() -> str:
+    """Checkpoint file next to the bundled workbook (overridable with C360_CHECKPOINTS)."""
+    return os.environ.get("C360_CHECKPOINTS") or os.path.join(os.getcwd(), DEFAULT_CHECKPOINT_RELPATH)
+
+
+class CheckpointStore:
+    """
+    SQLite store of runs and their completed units of work. A unit is
+    (item, task): item is "" for a single-company pipeline run and the row
+    position for batch runs. Payloads are JSON.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = os.path.abspath(path or default_checkpoint_path())
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection: commits on success, always closes."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---------------------------
+    # Runs
+    # ---------------------------
+    def start_run(
+        self, kind: str, label: str, params: Dict, run_id: str | None = None, live: Iterable[str] = ()
+    ) -> str:
+        """
+        Create a run (or mark an existing one running again on resume). Older
+        resumable runs with the same (kind, label) are superseded, except the
+        `live` ones (still executing in some session's job).
+        """
+        run_id = run_id or uuid.uuid4().hex[:12]
+        now = time.time()
+        keep = [run_id, *set(live)]
+        with self._connect() as conn:
+            # Only the newest run per (kind, label) stays resumable
+            conn.execute(
+                "UPDATE runs SET status = 'superseded', updated_at = ? "
+                f"WHERE kind = ? AND label = ? AND run_id NOT IN ({', '.join('?' for _ in keep)}) "
+                f"AND status IN ({', '.join('?' for _ in RESUMABLE_STATUSES)})",
+                (now, kind, label, *keep, *RESUMABLE_STATUSES),
+            )
+            conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, 'running', ?, ?) "
+                "ON CONFLICT(run_id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at",
+                (run_id, kind, label, json.dumps(params), now, now),
+            )
+        return run_id
+
+    def set_status(self, run_id: str, status: str) -> None:
+        with self._connect() as conn:
+            # A superseded run stays superseded when its (cancelled) job winds down
+            conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ? "
+                f"AND NOT (status = 'superseded' AND ? IN ({', '.join('?' for _ in RESUMABLE_STATUSES)}))",
+                (status, time.time(), run_id, status, *RESUMABLE_STATUSES),
+            )
+
+    def get_run(self, run_id: str) -> Dict | None:
+        with self._connect() as conn:
+            found = conn.execute(
+                "SELECT run_id, kind, label, params, status, created_at, updated_at FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        return self._run_dict(found) if found else None
+
+    def latest_resumable(
+        self,
+        kind: str,
+        label: str | None = None,
+        params: Dict | None = None,
+        exclude: Iterable[str] = (),
+    ) -> Dict | None:
+        """
+        Most recent run of `kind` (optionally for `label`) that did not
+        complete, whose params include every item of `params` (e.g. the same
+        dataset_version). Runs in `exclude` (still executing) are skipped.
+        """
+        query = (
+            "SELECT run_id, kind, label, params, status, created_at, updated_at FROM runs "
+            f"WHERE kind = ? AND status IN ({', '.join('?' for _ in RESUMABLE_STATUSES)})"
+        )
+        args = [kind, *RESUMABLE_STATUSES]
+        if label is not None:
+            query += " AND label = ?"
+            args.append(label)
+        exclude = set(exclude)
+        with self._connect() as conn:
+            for found in conn.execute(query + " ORDER BY updated_at DESC", args).fetchall():
+                run = self._run_dict(found)
+                if run["run_id"] in exclude:
+                    continue
+                if params and any(run["params"].get(k) != v for k, v in params.items()):
+                    continue
+                run["checkpoints"] = conn.execute(
+                    "SELECT COUNT(*) FROM checkpoints WHERE run_id = ?", (run["run_id"],)
+                ).fetchone()[0]
+                return run
+        return None
+
+    @staticmethod
+    def _run_dict(row) -> Dict:
+        keys = ("run_id", "kind", "label", "params", "status", "created_at", "updated_at")
+        run = dict(zip(keys, row))
+        run["params"] = json.loads(run["params"])
+        return run
+
+    # ---------------------------
+    # Checkpoints
+    # ---------------------------
+    def save(self, run_id: str, task: str, payload: Dict, item: str = "") -> None:
+        """Record one completed unit of work (idempotent)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                (run_id, str(item), task, json.dumps(payload), now),
+            )
+            conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+
+    def load_tasks(self, run_id: str, item: str = "") -> Dict[str, Dict]:
+        """task -> payload for one item of a run."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT task, payload FROM checkpoints WHERE run_id = ? AND item = ?", (run_id, str(item))
+            ).fetchall()
+        return {task: json.loads(payload) for task, payload in rows}
+
+    def completed_items(self, run_id: str, task: str) -> Set[str]:
+        """Items of a run that have a checkpoint for `task` (e.g. finished batch companies)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT item FROM checkpoints WHERE run_id = ? AND task = ?", (run_id, task)
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def discard(self, run_id: str) -> None:
+        """Drop a run and its checkpoints."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+
+_STORES: Dict[str, CheckpointStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_checkpoint_store(path: str | None = None) -> CheckpointStore:
+    """Process-wide store instance per database file."""
+    path = os.path.abspath(path or default_checkpoint_path())
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = CheckpointStore(path)
+            _STORES[path] = store
+        return store
@@ -0,0 +1,158 @@
+# compaction.py
+# Schema-driven memory compaction of Customer360 frames + per-column memory report
+
+import re
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------
+# Compaction schema
+# ---------------------------
+# Column -> kind:
+#   "category" low-cardinality enumerations / bands
+#   "money"    display text kept + parsed USD float32 in "<col>__value"
+#   "percent"  display text kept + parsed percent float32 in "<col>__value"
+#   "url"      repeated URLs, dictionary-encoded (each distinct string stored once)
+# Text of "money" / "percent" / "url" columns only becomes a category when values repeat.
+#   "int"      downcast to the smallest nullable integer
+# Columns not listed (free text, ids) are left as loaded.
+COMPACT_SCHEMA: Dict[str, str] = {
+    "Employee Range": "category",
+    "Company Revenue($)": "category",
+    "Company Industry": "category",
+    "Signal Type": "category",
+    "lead_priority_label": "category",
+    "Funding Amount($)": "money",
+    "Revenue Growth": "percent",
+    "Net Income Change": "percent",
+    "Operating Cash Flow Change": "percent",
+    "CapEx Change": "percent",
+    "EPS Change": "percent",
+    "Official Domain": "url",
+    "Facebook URL": "url",
+    "LinkedIn URL": "url",
+    "Instagram URL": "url",
+    "Signal Links": "url",
+    "Company Founding Year": "int",
+}
+
+DERIVED_SUFFIX = "__value"
+# Free-form text columns are only dictionary-encoded when values actually repeat
+# (distinct / rows at most this); mostly-unique text costs more as a category
+URL_DISTINCT_RATIO = 0.5
+
+_MONEY_RE = re.compile(r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*([KMBT])?", re.IGNORECASE)
+_PERCENT_RE = re.compile(r"([+-]?\d+(?:\.\d+)?)\s*%")
+_MULTIPLIERS = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+
+def parse_money(raw) -> float:
+    """'$835M (Monex ...)' -> 835e6, '163 M' -> 163e6, '-' -> NaN."""
+    m = _MONEY_RE.search(str(raw)) if isinstance(raw, str) else None
+    if not m:
+        return np.nan
+    value = float(m.group(1).replace(",", ""))
+    return value * _MULTIPLIERS.get((m.group(2) or "").upper(), 1.0)
+
+
+def parse_percent(raw) -> float:
+    """'+4.31% (2024 vs 2023)' -> 4.31, '-' -> NaN."""
+    m = _PERCENT_RE.search(str(raw)) if isinstance(raw, str) else None
+    return float(m.group(1)) if m else np.nan
+
+
+# ---------------------------
+# Compaction
+# ---------------------------
+def _as_category(s: pd.Series) -> pd.Series:
+    return s.astype("category") if not isinstance(s.dtype, pd.CategoricalDtype) else s
+
+
+def _repeats(s: pd.Series) -> bool:
+    return bool(len(s)) and s.nunique(dropna=True) / len(s) <= URL_DISTINCT_RATIO
+
+
+def _smallest_int(s: pd.Series) -> pd.Series:
+    values = pd.to_numeric(s, errors="coerce")
+    lo, hi = values.min(), values.max()
+    for dtype, info in (("Int8", np.iinfo(np.int8)), ("Int16", np.iinfo(np.int16)), ("Int32", np.iinfo(np.int32))):
+        if pd.isna(lo) or (info.min <= lo and hi <= info.max):
+            return values.astype(dtype)
+    return values.astype("Int64")
+
+
+def compact_customer360(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a compacted copy of a Customer360 frame (input is not modified)."""
+    out = df.copy(deep=False)
+    for col, kind in COMPACT_SCHEMA.items():
+        if col not in out.columns:
+            continue
+        s = out[col]
+        if kind == "category":
+            out[col] = _as_category(s)
+        elif kind in ("money", "percent"):
+            parse = parse_money if kind == "money" else parse_percent
+            # Parse each distinct value once, then broadcast through the codes
+            codes, uniques = pd.factorize(s)
+            parsed = np.asarray([parse(v) for v in uniques], dtype=np.float32)
+            values = np.where(codes >= 0, parsed[codes] if len(parsed) else np.nan, np.nan).astype(np.float32)
+            if _repeats(s):
+                out[col] = _as_category(s)
+            out[col + DERIVED_SUFFIX] = values
+        elif kind == "url":
+            if _repeats(s):
+                out[col] = _as_category(s)
+        elif kind == "int":
+            out[col] = _smallest_int(s)
+    return out
+
+
+def strip_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop the parsed "<col>__value" helpers (e.g. before CSV export)."""
+    derived = [c for c in df.columns if str(c).endswith(DERIVED_SUFFIX)]
+    return df.drop(columns=derived) if derived else df
+
+
+# ---------------------------
+# Memory report
+# ---------------------------
+def memory_report(before: pd.DataFrame, after: pd.DataFrame, include_total: bool = True) -> pd.DataFrame:
+    """
+    Deep bytes per column before/after compaction, plus a TOTAL row. A parsed
+    "<col>__value" helper is counted in its source column's row ("after"
+    covers both), so per-column savings show the real cost of the pair.
+    """
+    b = before.memory_usage(index=False, deep=True)
+    a = after.memory_usage(index=False, deep=True)
+    rows = []
+    for col in after.columns:
+        if str(col).endswith(DERIVED_SUFFIX) and str(col)[: -len(DERIVED_SUFFIX)] in after.columns:
+            continue
+        derived = col + DERIVED_SUFFIX
+        has_derived = derived in after.columns
+        rows.append({
+            "column": col,
+            "dtype_before": str(before[col].dtype) if col in before.columns else "(derived)",
+            "dtype_after": str(after[col].dtype) + (f" + {after[derived].dtype}" if has_derived else ""),
+            "bytes_before": int(b.get(col, 0)),
+            "bytes_after": int(a[col]) + (int(a[derived]) if has_derived else 0),
+        })
+    report = pd.DataFrame(rows)
+    return add_report_total(report) if include_total else report
+
+
+def add_report_total(report: pd.DataFrame) -> pd.DataFrame:
+    """Append a TOTAL row and the saved_pct column to a memory report."""
+    report = report.drop(columns=["saved_pct"], errors="ignore").reset_index(drop=True)
+    report.loc[len(report)] = {
+        "column": "TOTAL", "dtype_before": "", "dtype_after": "",
+        "bytes_before": int(report["bytes_before"].sum()), "bytes_after": int(report["bytes_after"].sum()),
+    }
+    before = report["bytes_before"]
+    report["saved_pct"] = np.where(
+        before > 0, (1 - report["bytes_after"] / before.where(before > 0, 1)) * 100, np.nan
+    ).round(1)
+    return report
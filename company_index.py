@@ -0,0 +1,88 @@
+# company_index.py
+# Immutable normalized-company-name -> row-position index, one per dataset version
+
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+import pandas as pd
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize company names for fuzzy matching:
+    - lowercase
+    - remove spaces, hyphens, punctuation
+    """
+    if not name:
+        return ""
+    name = name.lower().strip()
+    name = re.sub(r"[^a-z0-9]", "", name)
+    return name
+
+
+# ---------------------------
+# Index cache
+# ---------------------------
+INDEX_CACHE_ENTRIES = 4
+NORMALIZED_MEMO_LIMIT = 1_000_000
+
+# version -> read-only {normalized name: (row positions...)}
+_INDEXES: "OrderedDict[str, Mapping[str, Tuple[int, ...]]]" = OrderedDict()
+# raw company_name -> normalized key, shared by every build so a new dataset
+# version only pays the regex for names it has not seen before
+_NORMALIZED: Dict[str, str] = {}
+_LOCK = threading.Lock()
+
+
+def _normalized(raw: str) -> str:
+    key = _NORMALIZED.get(raw)
+    if key is None:
+        if len(_NORMALIZED) >= NORMALIZED_MEMO_LIMIT:
+            _NORMALIZED.clear()
+        key = normalize_company_name(raw)
+        _NORMALIZED[raw] = key
+    return key
+
+
+def build_company_index(df: pd.DataFrame, column: str = "company_name") -> Mapping[str, Tuple[int, ...]]:
+    """Build a read-only mapping of normalized name -> positional row indices."""
+    positions: Dict[str, list] = {}
+    if column in df.columns:
+        for pos, raw in enumerate(df[column].astype(str).tolist()):
+            positions.setdefault(_normalized(raw), []).append(pos)
+    return MappingProxyType({k: tuple(v) for k, v in positions.items()})
+
+
+def get_company_index(df: pd.DataFrame, version: str) -> Mapping[str, Tuple[int, ...]]:
+    """
+    Return the index for `version` (e.g. workbook signature or upload digest),
+    building it on first use. The same version must always describe the same
+    frame, since the index stores row positions.
+    """
+    with _LOCK:
+        index = _INDEXES.get(version)
+        if index is not None:
+            _INDEXES.move_to_end(version)
+            return index
+
+        index = build_company_index(df)
+        _INDEXES[version] = index
+        while len(_INDEXES) > INDEX_CACHE_ENTRIES:
+            _INDEXES.popitem(last=False)
+        return index
+
+
+def lookup_company_positions(index: Mapping[str, Tuple[int, ...]], name: str) -> Tuple[int, ...]:
+    """Row positions whose normalized company_name equals the normalized `name`."""
+    return index.get(normalize_company_name(name), ())
+
+
+def lookup_company_rows(df: pd.DataFrame, index: Mapping[str, Tuple[int, ...]], name: str) -> pd.DataFrame:
+    """Rows of `df` whose normalized company_name equals the normalized `name`."""
+    positions = lookup_company_positions(index, name)
+    if not positions:
+        return df.iloc[0:0]
+    return df.iloc[list(positions)]
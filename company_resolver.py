@@ -0,0 +1,170 @@
+# company_resolver.py
+# Character-trigram fuzzy company resolver shared by Lead Management and Insight Studio
+
+import heapq
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from company_index import normalize_company_name
+from data_loader import customer360_version, load_customer360
+
+
+# ---------------------------
+# Alias registry
+# ---------------------------
+# canonical company_name -> extra spellings users type for it
+COMPANY_ALIASES: Dict[str, List[str]] = {
+    "A-Mark": ["A-Mark Precious Metals", "AMark", "A Mark", "A Mark Precious Metals"],
+    "Sigmatron International": ["SigmaTron", "SigmaTron Intl"],
+    "VF Corporation": ["VF Corp", "VFC"],
+}
+
+DEFAULT_MIN_SCORE = 0.45
+
+
+def register_alias(canonical: str, *aliases: str) -> None:
+    """Add spellings for a company; resolvers built afterwards will index them."""
+    known = COMPANY_ALIASES.setdefault(canonical, [])
+    for alias in aliases:
+        if alias and alias not in known:
+            known.append(alias)
+    with _LOCK:
+        _RESOLVERS.clear()
+
+
+def domain_label(url: str) -> str:
+    """'https://www.amark.com/' -> 'amark' (registrable label only)."""
+    host = re.sub(r"^[a-z]+://", "", str(url or "").strip().lower()).split("/")[0]
+    host = re.sub(r"^www\d*\.", "", host)
+    return host.split(".")[0] if host else ""
+
+
+def trigrams(key: str) -> frozenset:
+    """Padded character trigrams of an already-normalized key."""
+    if not key:
+        return frozenset()
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+# ---------------------------
+# Resolver
+# ---------------------------
+class CompanyResolver:
+    """
+    Inverted trigram index over company names, domains and aliases.
+    Each indexed term points at one canonical name; resolve() ranks
+    canonical names by the Dice similarity of their best-matching term.
+    """
+
+    # Postings longer than this are only used when the query has nothing rarer
+    FREQUENT_POSTINGS = 2000
+    MAX_CANDIDATES = 64
+
+    def __init__(self):
+        self._canonical: List[str] = []          # term id -> canonical name
+        self._grams: List[frozenset] = []        # term id -> trigram set
+        self._exact: Dict[str, str] = {}         # normalized term -> canonical name
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(set(self._canonical))
+
+    def add(self, canonical: str, terms: Iterable[str]) -> None:
+        """Index `canonical` under its own name plus every term in `terms`."""
+        seen = set()
+        for term in [canonical, *terms]:
+            key = normalize_company_name(str(term or ""))
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._exact.setdefault(key, canonical)
+            term_id = len(self._canonical)
+            self._canonical.append(canonical)
+            grams = trigrams(key)
+            self._grams.append(grams)
+            for g in grams:
+                self._postings[g].append(term_id)
+
+    def resolve(self, query: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """Top-k (canonical name, score in 0..1) for `query`, best first."""
+        key = normalize_company_name(str(query or ""))
+        if not key:
+            return []
+
+        q_grams = trigrams(key)
+        exact = self._exact.get(key)
+
+        # Candidate generation: count hits from the rarest postings first
+        lists = sorted((self._postings[g] for g in q_grams if g in self._postings), key=len)
+        usable = [p for p in lists if len(p) <= self.FREQUENT_POSTINGS] or lists[:2]
+        hits: Dict[int, int] = defaultdict(int)
+        for postings in usable:
+            for term_id in postings:
+                hits[term_id] += 1
+        candidates = heapq.nlargest(self.MAX_CANDIDATES, hits, key=hits.__getitem__)
+
+        # Verification: exact Dice over full trigram sets, best term per company
+        best: Dict[str, float] = {}
+        if exact is not None:
+            best[exact] = 1.0
+        q_len = len(q_grams)
+        for term_id in candidates:
+            grams = self._grams[term_id]
+            score = 2.0 * len(q_grams & grams) / (q_len + len(grams))
+            name = self._canonical[term_id]
+            if score > best.get(name, 0.0):
+                best[name] = score
+
+        ranked = heapq.nlargest(k, best.items(), key=lambda kv: kv[1])
+        return [(name, round(score, 4)) for name, score in ranked if score >= min_score]
+
+    def best_match(self, query: str, min_score: float = DEFAULT_MIN_SCORE) -> str | None:
+        """Single canonical name for `query`, or None when nothing is confident."""
+        top = self.resolve(query, k=1, min_score=min_score)
+        return top[0][0] if top else None
+
+
+def build_resolver(df: pd.DataFrame) -> CompanyResolver:
+    """Index company_name, Official Domain and registered aliases for a frame."""
+    resolver = CompanyResolver()
+    if "company_name" not in df.columns:
+        return resolver
+    names = df["company_name"].astype(str).tolist()
+    domains = df["Official Domain"].astype(str).tolist() if "Official Domain" in df.columns else [""] * len(names)
+    for name, domain in zip(names, domains):
+        resolver.add(name, [domain_label(domain), *COMPANY_ALIASES.get(name, [])])
+    return resolver
+
+
+# ---------------------------
+# Shared resolver cache (one per dataset version)
+# ---------------------------
+RESOLVER_CACHE_ENTRIES = 4
+_RESOLVERS: "OrderedDict[str, CompanyResolver]" = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def get_company_resolver(df: pd.DataFrame, version: str) -> CompanyResolver:
+    """Resolver for a dataset version (same versions as company_index)."""
+    with _LOCK:
+        resolver = _RESOLVERS.get(version)
+        if resolver is not None:
+            _RESOLVERS.move_to_end(version)
+            return resolver
+        resolver = build_resolver(df)
+        _RESOLVERS[version] = resolver
+        while len(_RESOLVERS) > RESOLVER_CACHE_ENTRIES:
+            _RESOLVERS.popitem(last=False)
+        return resolver
+
+
+def get_default_resolver() -> CompanyResolver:
+    """Resolver over the bundled Customer360 workbook (for pages without a frame)."""
+    return get_company_resolver(
+        load_customer360(columns=["company_name", "Official Domain"]), customer360_version()
+    )
@@ -4,16 +4,43 @@
 import streamlit as st
 import pandas as pd
 import time
-from typing import Dict, List
+from typing import Dict, List, Set
 import html
 import datetime
 import re
 import os
+import threading
+import asyncio
+from contextlib import closing
+from functools import partial
+
+from checkpoints import get_checkpoint_store
+from company_index import get_company_index, lookup_company_positions, normalize_company_name
+from company_resolver import get_company_resolver
+from compaction import strip_derived_columns
+from dataset_overlay import apply_overlay, compute_overlay, overlay_nbytes
+from async_enrichment import ASYNC_COMPANIES_IN_FLIGHT, get_async_engine, run_batch_async, run_dag_async
+from batch_enrichment import BATCH_MAX_WORKERS, BATCH_STEP_DELAY, BatchProgress, format_eta, run_batch
+from enrichment_cache import DAY, DEFAULT_TTL_SECONDS, get_enrichment_cache, source_fingerprint
+from enrichment_providers import get_provider, provider_names
+from job_runner import get_job_manager, queue_notice
+from log_stream import DEFAULT_MAX_HZ, LOG_STREAM_CSS, LogStream, get_rendered_log_cache, log_box_html
+from run_log_store import get_run_log_store, log_record
+from log_exports import consolidated_log, csv_export, log_archive, timings_json
+from log_templates import get_log_template
+from tracing import get_tracer
+from single_flight import FlightCancelled, get_single_flight
+from prefetch import PREFETCH_MIN_SCORE, get_prefetcher
+from pipeline_executor import TaskInterrupted, execute_dag, run_dag_inline, topological_order
+from data_loader import customer360_version, default_excel_path, load_customer360, loader_memory_report, loader_stats
+from upload_ingest import ingest_upload_cached
 
 # --- IMPORTS FOR PAGE RENDERING ---
 try:
-    from lead_scoring import lead_scoring_page
+    from lead_scoring import LEAD_SCORING_COLUMNS, lead_scoring_page
 except ImportError:
+    LEAD_SCORING_COLUMNS = ["unique_id", "company_name", "lead_priority_label"]
+
     def lead_scoring_page(df):
         st.markdown("<div class='main-panel'>", unsafe_allow_html=True)
         st.warning("🚨 Lead Scoring page module not found. Displaying placeholder.")
@@ -70,6 +97,12 @@ def _clear_right_side():
     "role",
     "username",
     "uploaded_df",
+    "uploaded_spill",
+    "uploaded_file_id",
+    "uploaded_digest",
+    "uploaded_summary",
+    "upload_overlay",
+    "upload_mode",
     "main_view",
 
     # Insight Studio
@@ -84,11 +117,27 @@ def _clear_right_side():
     "lead_ctx_text",
     "lead_list_name",
     "lead_prioritization_df",
+    "lead_job_id",
+    "lead_job_consumed",
 
     # Pipeline continuity
     "pipeline_company",
+
+    # Batch enrichment (not tied to the selected company)
+    "batch_export_positions",
+    "batch_summary",
+    "batch_log_run",
+    "batch_job_id",
+    "batch_job_consumed",
 }
 
+    # A running job belongs to the previous company: stop it and detach
+    get_job_manager().cancel(st.session_state.get("pipeline_job_id"))
+    # Speculation for the previous name is abandoned (queued work never starts)
+    if st.session_state.get("prefetch") is not None:
+        st.session_state["prefetch"].cancel()
+    st.query_params.pop("pipeline_job", None)
+
     # st.session_state["last_selected_company"] = st.session_state.get("company_input")
     if "company_input" in st.session_state and st.session_state.company_input:
         st.session_state["last_selected_company"] = st.session_state.company_input
@@ -103,7 +152,6 @@ def _clear_right_side():
     st.session_state["stop_requested"] = False
     # reset run flags
     st.session_state["pipeline_has_run"] = False
-    st.session_state["detailed_logs_list"] = []
 
 
 # --- NEW FUNCTION FOR INSIGHT STUDIO SIDEBAR INPUTS ---
@@ -753,11 +801,6 @@ div[data-testid="stFileUploader"] button:hover {
 # ---------------------------
 # Log helpers
 # ---------------------------
-def _log_block_step(lines: list[str]) -> str:
-    """Join a list of log lines into a block with a trailing blank line."""
-    return "\n".join(lines) + "\n\n"
-
-
 def _safe_filename_component(s: str) -> str:
     """Make a safe filename component (alphanumeric + underscore, short)."""
     if not s:
@@ -766,18 +809,6 @@ def _safe_filename_component(s: str) -> str:
     s = re.sub(r"[^A-Za-z0-9_\-\.]", "", s)
     return s[:120]
 
-def normalize_company_name(name: str) -> str:
-    """
-    Normalize company names for fuzzy matching:
-    - lowercase
-    - remove spaces, hyphens, punctuation
-    """
-    if not name:
-        return ""
-    name = name.lower().strip()
-    name = re.sub(r"[^a-z0-9]", "", name)
-    return name
-
 
 def generate_detailed_log(
     step_key: str,
@@ -788,149 +819,26 @@ def generate_detailed_log(
     run_ts: datetime.datetime | None = None,
 ) -> str:
     """
-    Build the detailed download text according to the templates provided.
+    Build the detailed download text from the step's pre-compiled template
+    (log_templates.py; unknown step keys get a generic log).
     step_key values: "website", "firmo", "techno", "financials", "growth"
+    and anything added with register_log_template().
     """
-    # run timestamp (local with offset)
-    if run_ts is None:
-        run_ts = datetime.datetime.now(datetime.timezone.utc).astimezone()
-    run_iso = run_ts.isoformat()
-
-    # base header
-    header = [
-        "=== AGENTIC PIPELINE DETAILED LOG ===",
-        f"Run Timestamp: {run_iso}",
-        f"Company: {company_display or 'UNKNOWN'}",
-        f"Task: {step_key}",
-        "-" * 39,
-        "",
-    ]
-    buf = "\n".join(header)
-
-
-    # For convenience use a short ts string inside each template line
-    ts = run_ts.strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
-
-    # Build the relevant step template
-    if step_key == "website":
-        lines = [
-            f"{ts} - INFO - Starting Website Extraction Pipeline",
-            f"{ts} - INFO - Input: Company Name = \"{company_display}\"",
-            f"{ts} - INFO - Searching Google for official website (region = USA)",
-            f"{ts} - INFO - Applying LLM-based ranking to find the most authoritative domain",
-            f"{ts} - INFO - Extracted Website: {website_display}",
-            f"{ts} - INFO - Performing entity resolution",
-            f"{ts} - INFO - - Normalizing entity name variants",
-            f"{ts} - INFO - - Deduping against existing entity registry (S3 master list)",
-            f"{ts} - INFO - Canonical Company Profile created",
-            f"{ts} - INFO - Storing extracted website record",
-            f"{ts} - INFO - Saved to: s3://b2b-growth-agent/data_ingestion/Output/website/{csafe}.json",
-            f"{ts} - INFO - Website extraction completed successfully",
-        ]
-        buf += _log_block_step(lines)
-
-    elif step_key == "firmo":
-        lines = [
-            f"{ts} - INFO - Starting Firmographic Enrichment",
-            f"{ts} - INFO - Reading input file from s3://b2b-growth-agent/data_ingestion/Output/website/{csafe}.json",
-            f"{ts} - INFO - Input: Company = \"{company_display}\", Website = {website_display}",
-            f"{ts} - INFO - [LAMBDA] Event received: {{\"Records\": [{{\"s3\": {{\"bucket\": {{\"name\": \"b2b-growth-agent\"}}, \"object\": {{\"key\": \"data_ingestion/Output/website/{csafe}.json\"}}}}}}], \"run_firmo_lambda\": true}}",
-            f"{ts} - INFO - Pulling data from firmographic sources (LLM-enriched + multi-source lookup)",
-            f"{ts} - INFO - Extracting legal name, HQ, founding year, addresses, and entity hierarchy",
-            f"{ts} - INFO - Enriching revenue, employee range, industry classification",
-            f"{ts} - INFO - Fetching social links (LinkedIn, Facebook, Instagram)",
-            f"{ts} - INFO - Lambda completed successfully",
-            f"{ts} - INFO - 🌐 Crawling company homepages and classifying links by theme...",
-            f"{ts} - INFO - Scraping {csafe.lower()} - {website_display} ...",
-            f"{ts} - INFO - 🤖 Extracting structured info using Gemini URL Context + Google Search fallback...",
-            f"{ts} - INFO - 🔎 URL-context retrieved About Us / Company Info for {company_display}",
-            f"{ts} - INFO - 🔎 URL-context retrieved Leadership & Governance for {company_display}",
-            f"{ts} - INFO - 🔎 URL-context retrieved Products / Services / Solutions for {company_display}",
-            f"{ts} - INFO - 🔎 URL-context retrieved Subsidiaries / Brands for {company_display}",
-            f"{ts} - INFO - 🔎 URL-context retrieved Headquarters / Locations for {company_display}",
-            f"{ts} - INFO - 🔎 URL-context retrieved Contact Us for {company_display}",
-            f"{ts} - INFO - 🔎 URL-context retrieved Social Media for {company_display}",
-            f"{ts} - INFO - Running website content extraction (About, Products, Contact, Newsroom)",
-            f"{ts} - INFO - Generating company overview summary using LLM",
-            f"{ts} - INFO - Performing final entity dedupe and consistency checks",
-            f"{ts} - INFO - Writing enriched firmographic profile to S3",
-            f"{ts} - INFO - Saved to: s3://b2b-growth-agent/data_ingestion/Output/firmo/{csafe}.json",
-            f"{ts} - INFO - Firmographic enrichment completed successfully",
-        ]
-        buf += _log_block_step(lines)
-
-    elif step_key == "techno":
-        lines = [
-            f"{ts} - INFO - Starting Technographic Profiling",
-            f"{ts} - INFO - Input Entity = \"{company_display}\"",
-            f"{ts} - INFO - [LAMBDA] Event received: {{\"Records\": [{{\"s3\": {{\"bucket\": {{\"name\": \"b2b-growth-agent\"}}, \"object\": {{\"key\": \"data_ingestion/Output/website/{csafe}.json\"}}}}}}], \"run_techno_lambda\": true}}",
-            f"{ts} - INFO - Hitting technographic vendor APIs and public fingerprints for the detected domains",
-            f"{ts} - INFO - Mapping identified products to normalized product categories (CRM, Marketing Automation, Cloud, Data, Security, etc.)",
-            f"{ts} - INFO - Computing tech maturity level based on stack depth, cloud adoption and modern tool usage",
-            f"{ts} - INFO - Writing technographic profile to S3",
-            f"{ts} - INFO - Saved to: s3://b2b-growth-agent/data_ingestion/Output/techno/{csafe}.json",
-            f"{ts} - INFO - Lambda completed successfully",
-            f"{ts} - INFO - Technographic profiling completed successfully",
-        ]
-        buf += _log_block_step(lines)
-
-    elif step_key == "financials":
-        lines = [
-            f"{ts} - INFO - Starting Financial Insights Pipeline",
-            f"{ts} - INFO - Input Entity = \"{company_display}\"",
-            f"{ts} - INFO - [LAMBDA] Event received: {{\"Records\": [{{\"s3\": {{\"bucket\": {{\"name\": \"b2b-growth-agent\"}}, \"object\": {{\"key\": \"data_ingestion/Output/website/{csafe}.json\"}}}}}}], \"run_finance_lambda\": true}}",
-            f"{ts} - INFO - Gathering available financial data for \"{company_display}\"",
-            f"{ts} - INFO - Extracting last 3 years (and latest quarters where available) of revenue, EBITDA, net income and operating cash flow",
-            f"{ts} - INFO - Computing YoY and QoQ percentage changes",
-            f"{ts} - INFO - Deriving financial health & momentum indicators (growth, profitability, leverage and liquidity)",
-            f"{ts} - INFO - Preparing financial summary for downstream 360 view",
-            f"{ts} - INFO - Saved to: s3://b2b-growth-agent/data_ingestion/Output/financials/{csafe}.json",
-            f"{ts} - INFO - Lambda completed successfully",
-            f"{ts} - INFO - Financial insights generated successfully",
-        ]
-        buf += _log_block_step(lines)
-
-    elif step_key == "growth":
-        lines = [
-            f"{ts} - INFO - Starting Growth Signal Extraction",
-            f"{ts} - INFO - Input Entity = \"{company_display}\"",
-            f"{ts} - INFO - [LAMBDA] Event received: {{\"Records\": [{{\"s3\": {{\"bucket\": {{\"name\": \"b2b-growth-agent\"}}, \"object\": {{\"key\": \"data_ingestion/Output/website/{csafe}.json\"}}}}}}], \"run_growth_signals_lambda\": true}}",
-            f"{ts} - INFO - Fetching last 12 months of news, blogs, and press releases for \"{company_display}\"",
-            f"{ts} - INFO - Deduping articles and filtering high-quality signals",
-            f"{ts} - INFO - Running LLM-based theme classification using the GTM taxonomy (Growth Signals, Financials, Risk, Strategic Outlook, Customer & Market, Competitor, ESG, Challenges)",
-            f"{ts} - INFO - Highlighting Growth Signal sub-themes: Acquisition & Mergers, Awards & Industry Recognition, Business Expansion, Leadership Changes, New Product/Technology Launches, Fundings & Capital Raises.",
-            f"{ts} - INFO - Capturing Risk-oriented themes: Regulatory/Legal/Compliance, ESG & Sustainability, Bankruptcy & Financial Distress.",
-            f"{ts} - INFO - Enriching Financials-related news: Revenue & Earnings, Profitability & Dividends, Debt & Liquidity.",
-            f"{ts} - INFO - Adding context from Strategic Outlook, Customer/Market focus, Competitor actions and Business Pain Points.",
-            f"{ts} - INFO - Tagging sentiment, timestamps, and source URLs",
-            f"{ts} - INFO - Exporting structured signal dataset",
-            f"{ts} - INFO - Saved to: s3://b2b-growth-agent/data_ingestion/Output/growth/{csafe}.json",
-            f"{ts} - INFO - Lambda completed successfully",
-            f"{ts} - INFO - Growth signal extraction completed successfully",
-        ]
-        buf += _log_block_step(lines)
-
-    else:
-        # generic fallback
-        lines = [
-            f"{ts} - INFO - Starting {step_key}",
-            f"{ts} - INFO - No specific template found; logging basic step info",
-            f"{ts} - INFO - Completed {step_key}",
-        ]
-        buf += _log_block_step(lines)
-
-    # add a tailing meta line
-    buf += f"\n--- Generated by Agentic Lead Intelligence on {run_iso} ---\n"
-    return buf
+    return get_log_template(step_key).render(company_display, website_display, csafe, run_ts)
 
 
 # ---------------------------
 # tasks config
 # ---------------------------
+# "depends_on": every downstream stage reads the website record
+# (.../Output/website/{csafe}.json), so they run in parallel once it exists.
+# "cache_ttl_days": how long a task's output is served from the enrichment cache.
 TASKS: List[Dict] = [
-    {"name": "Website Extraction", "cols": ["Official Domain"], "icon": "🌐"},
+    {"name": "Website Extraction", "cols": ["Official Domain"], "icon": "🌐", "cache_ttl_days": 30},
     {
         "name": "Firmographic Enrichment",
+        "depends_on": ["Website Extraction"],
+        "cache_ttl_days": 30,
         "cols": [
             "Company Overview",
             "Company Founding Year",
@@ -946,9 +854,17 @@ TASKS: List[Dict] = [
         ],
         "icon": "🏢",
     },
-    {"name": "Technographic Profiling", "cols": ["Tech Install"], "icon": "🖥️"},
+    {
+        "name": "Technographic Profiling",
+        "depends_on": ["Website Extraction"],
+        "cache_ttl_days": 7,
+        "cols": ["Tech Install"],
+        "icon": "🖥️",
+    },
     {
         "name": "Financial Insights",
+        "depends_on": ["Website Extraction"],
+        "cache_ttl_days": 7,
         "cols": [
             "Financial Summary",
             "Revenue Growth",
@@ -962,12 +878,63 @@ TASKS: List[Dict] = [
     },
     {
         "name": "Growth Signals",
+        "depends_on": ["Website Extraction"],
+        "cache_ttl_days": 1,
         "cols": ["Signal Type", "Signal Details", "Signal Links"],
         "icon": "📈",
     },
 ]
 
 
+# Columns the page needs on every rerun: company lookup, fuzzy resolver, export keys
+KEY_COLUMNS: List[str] = ["unique_id", "company_name", "Official Domain"]
+
+
+def pipeline_columns() -> List[str]:
+    """KEY_COLUMNS plus every column a TASKS step reads (projection for Run Process)."""
+    cols = list(KEY_COLUMNS)
+    for task in TASKS:
+        cols.extend(c for c in task["cols"] if c not in cols)
+    return cols
+
+
+def _set_upload_spill(lease) -> None:
+    """Hold this session's lease on a spilled upload, releasing the one it replaces."""
+    previous = st.session_state.pop("uploaded_spill", None)
+    if previous is not None and previous is not lease:
+        previous.release()
+    if lease is not None:
+        st.session_state["uploaded_spill"] = lease
+
+
+def _dataset_source(excel_path: str):
+    """
+    Loader for the active dataset (session upload, spilled upload, merged
+    overlay, else the shared workbook) that no longer touches session_state,
+    so background jobs can call it: loader(columns) -> DataFrame.
+    """
+    if "uploaded_df" in st.session_state:
+        uploaded_df = st.session_state["uploaded_df"]
+        return lambda columns=None: uploaded_df
+    if st.session_state.get("uploaded_spill") is not None:
+        # The loader holds its own lease: the spill outlives a replaced upload while a job reads it
+        return st.session_state["uploaded_spill"].share()
+    if st.session_state.get("upload_overlay") is not None:
+        # Merge mode: shared base columns + this session's compact delta
+        overlay = st.session_state["upload_overlay"]
+        return lambda columns=None: apply_overlay(load_customer360(excel_path, columns=columns), overlay, columns)
+    return lambda columns=None: load_customer360(excel_path, columns=columns)
+
+
+def _load_dataset_columns(excel_path: str, columns: List[str] | None = None) -> pd.DataFrame:
+    """
+    The active dataset projected to `columns` (None = every column). In-memory
+    uploads are already fully materialized and are returned as-is; merged
+    uploads are applied as an overlay on top of the shared workbook columns.
+    """
+    return _dataset_source(excel_path)(columns)
+
+
 # ---------------------------
 # Static signal counts per company (for log simulation)
 # ---------------------------
@@ -1389,6 +1356,858 @@ def task_name_to_step_key(task_name: str) -> str:
     return m.get(task_name, task_name.lower().replace(" ", "_"))
 
 
+# ---------------------------
+# Task bodies (run on executor worker threads: no Streamlit calls here)
+# ---------------------------
+def build_task_result_html(task: Dict, row: pd.Series) -> str:
+    """Enrichment-details HTML for one task from the company's Customer360 row."""
+    html_rows = []
+
+    if task["name"] == "Growth Signals":
+        details = row.get("Signal Details", "")
+        links = row.get("Signal Links", "")
+        formatted = format_growth_signals(details, links)
+        html_rows.append(
+            f"<div class='kv'><div class='label'>Growth Signals</div>{formatted}</div>"
+        )
+    else:
+        for col in task["cols"]:
+            raw_val = row.get(col, "(no value)")
+            if isinstance(raw_val, str):
+                raw_val = raw_val.strip()
+
+            if col.lower() in ["other locations", "locations", "hq locations"]:
+                raw_val = format_locations_to_bullets(raw_val)
+
+            if col == "Tech Install":
+                raw_val = format_tech_install(raw_val)
+
+            html_rows.append(
+                f"<div class='kv'><div class='label'>{pretty_label(col)}</div>{raw_val}</div>"
+            )
+
+    return f"<div class='output-box'>{''.join(html_rows)}</div>"
+
+
+def task_cache_ttl(task: Dict) -> float:
+    """Seconds a task's output stays in the enrichment cache."""
+    days = task.get("cache_ttl_days")
+    return days * DAY if days is not None else DEFAULT_TTL_SECONDS
+
+
+def task_fingerprints(row: pd.Series) -> Dict[str, str]:
+    """
+    Per-task input fingerprint for a company row: the task's own `cols` plus
+    the fingerprints of the tasks it depends on, so a changed Official Domain
+    dirties every downstream stage while a changed Tech Install only dirties
+    Technographic Profiling. The stage's provider name is included, so
+    switching a stage to another source re-runs it.
+    """
+    fingerprints: Dict[str, str] = {}
+    for i in topological_order(TASKS):
+        task = TASKS[i]
+        upstream = [fingerprints[name] for name in task.get("depends_on", [])]
+        fingerprints[task["name"]] = source_fingerprint(
+            [task["name"], get_provider(task["name"]).name, *(row.get(c) for c in task["cols"]), *upstream]
+        )
+    return fingerprints
+
+
+def run_enrichment_task(
+    task: Dict,
+    row: pd.Series,
+    company: str,
+    csafe: str,
+    step_delay: float,
+    emit,
+    cancel: threading.Event,
+    cache=None,
+) -> Dict:
+    """
+    Stream one task's agentic log lines through `emit("line", ...)`, fetch the
+    stage's fields from its provider (enrichment_providers; Customer360
+    columns by default), then return {"result_html", "detailed_log", "lines",
+    "cached"}. Provider errors propagate and fail the task. With a `cache`,
+    a task whose input fingerprint is unchanged since its last run (and whose
+    output is still within TTL) is not re-run: its stored output and log are
+    replayed instantly. An output prefetched while the company was being
+    selected (prefetch_company) still streams its log at the normal pace but
+    skips the provider call. Concurrent runs of the same company/task/inputs
+    (another analyst, an overlapping batch) share one provider call and
+    result ("shared": True). Raises TaskInterrupted on cancel.
+    """
+    tracer = get_tracer()
+    fingerprint = task_fingerprints(row)[task["name"]]
+    prefetched = None
+    if cache is not None:
+        with tracer.span("lookup", task["name"]):
+            hit = cache.get(company, task["name"], fingerprint)
+        if hit is not None and hit.get("prefetched"):
+            prefetched = {k: v for k, v in hit.items() if k != "prefetched"}
+        elif hit is not None:
+            total_lines = len(hit["lines"])
+            for idx, line in enumerate(hit["lines"], start=1):
+                emit("line", cls=line["cls"], text=line["text"], pct=int((idx / max(total_lines, 1)) * 100))
+            return {**hit, "cached": True}
+
+    agent_steps = get_agentic_steps(task["name"], company)
+    total_lines = len(agent_steps)
+
+    for idx, step in enumerate(agent_steps, start=1):
+        if cancel.is_set():
+            raise TaskInterrupted()
+        # Wall time includes the simulated delay; CPU time is the real work
+        with tracer.span("step", task["name"]):
+            emit(
+                "line",
+                cls=step.get("cls", "info"),
+                text=step.get("text", ""),
+                pct=int((idx / max(total_lines, 1)) * 100),
+            )
+            cancel.wait(step_delay)
+
+    if cancel.is_set():
+        raise TaskInterrupted()
+
+    if prefetched is not None:
+        result, shared = prefetched, False
+    else:
+        def compute() -> Dict:
+            with tracer.span("provider", task["name"]):
+                fields = get_provider(task["name"]).fetch(task["name"], company, task["cols"], row)
+            return _task_result(task, row, company, csafe, agent_steps, fields)
+
+        try:
+            result, shared = get_single_flight().do(_flight_key(task, company, fingerprint), compute, cancel)
+        except FlightCancelled:
+            raise TaskInterrupted()
+    if cache is not None:
+        # A consumed prefetch becomes a regular entry (instant replay next time)
+        cache.put(company, task["name"], fingerprint, result, task_cache_ttl(task))
+    return {**result, "cached": False, "shared": shared, "prefetched": prefetched is not None}
+
+
+async def run_enrichment_task_async(
+    task: Dict,
+    row: pd.Series,
+    company: str,
+    csafe: str,
+    engine,
+    cancel: threading.Event,
+    cache=None,
+) -> Dict:
+    """
+    Batch variant of run_enrichment_task for the asyncio engine: no live log
+    streaming, the provider call goes through engine.call (per-provider
+    limits + global in-flight cap) and SQLite cache access runs off the loop.
+    """
+    fingerprint = task_fingerprints(row)[task["name"]]
+    if cache is not None:
+        hit = await asyncio.to_thread(cache.get, company, task["name"], fingerprint)
+        if hit is not None:
+            # No live log in batches: a prefetched output is just a cache hit
+            return {**hit, "cached": True, "prefetched": False}
+
+    agent_steps = get_agentic_steps(task["name"], company)
+    if BATCH_STEP_DELAY:
+        await asyncio.sleep(BATCH_STEP_DELAY * len(agent_steps))
+    if cancel.is_set():
+        raise TaskInterrupted()
+
+    async def compute() -> Dict:
+        with get_tracer().span("provider", task["name"], cpu=False):
+            fields = await engine.call(get_provider(task["name"]), task["name"], company, task["cols"], row)
+        result = _task_result(task, row, company, csafe, agent_steps, fields)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, company, task["name"], fingerprint, result, task_cache_ttl(task))
+        return result
+
+    try:
+        result, shared = await get_single_flight().do_async(_flight_key(task, company, fingerprint), compute, cancel)
+    except FlightCancelled:
+        raise TaskInterrupted()
+    return {**result, "cached": False, "shared": shared}
+
+
+def _flight_key(task: Dict, company: str, fingerprint: str) -> tuple:
+    """Single-flight key: normalized company + task (+ inputs, so different data never shares)."""
+    return (normalize_company_name(company), task["name"], fingerprint)
+
+
+def _task_result(task: Dict, row: pd.Series, company: str, csafe: str, agent_steps: List[Dict], fields: Dict) -> Dict:
+    """Result HTML (Customer360 row overlaid with the provider's fields), detailed log and log lines."""
+    tracer = get_tracer()
+    source_row = pd.Series({**row.to_dict(), **fields})
+    original_raw = "\n".join([f"[{s['cls'].upper()}] {s['text']}" for s in agent_steps])
+    with tracer.span("format", task["name"]):
+        detailed_text = generate_detailed_log(
+            task_name_to_step_key(task["name"]),
+            company,
+            row.get("Official Domain", ""),
+            csafe,
+            original_raw,
+            datetime.datetime.now(),
+        )
+    with tracer.span("html", task["name"]):
+        result_html = build_task_result_html(task, source_row)
+    return {
+        "result_html": result_html,
+        "detailed_log": detailed_text,
+        "lines": [{"cls": s.get("cls", "info"), "text": s.get("text", "")} for s in agent_steps],
+    }
+
+
+# ---------------------------
+# Speculative prefetch
+# ---------------------------
+def resolve_company(df: pd.DataFrame, dataset_version: str, name: str, min_score: float | None = None):
+    """
+    (row positions, suggestions) for a typed company name: exact index hit,
+    else the trigram resolver's best match (at `min_score`, when given).
+    """
+    if "company_name" not in df.columns:
+        return (), []
+    # Prebuilt per dataset version; the lookup itself is a dict hit
+    company_index = get_company_index(df, dataset_version)
+    positions = lookup_company_positions(company_index, name)
+    if positions:
+        return positions, []
+
+    # No exact hit: fall back to the trigram resolver (typos, domains, aliases)
+    resolver = get_company_resolver(df, dataset_version)
+    match = resolver.best_match(name) if min_score is None else resolver.best_match(name, min_score)
+    if match:
+        return lookup_company_positions(company_index, match), []
+    return (), [n for n, _ in resolver.resolve(name, k=3, min_score=0.2)]
+
+
+def canonical_company_name(df: pd.DataFrame, positions, typed: str) -> str:
+    """
+    The matched row's company_name: what runs, caches, checkpoints and exports
+    are keyed on, however the name was typed (falls back to `typed`).
+    """
+    if positions and "company_name" in df.columns:
+        value = df["company_name"].iloc[positions[0]]
+        if pd.notna(value) and str(value).strip():
+            return str(value).strip()
+    return typed
+
+
+def prefetch_company(cancel: threading.Event, load_columns, positions: List[int], company: str, cache) -> None:
+    """
+    Prefetch body (runs on the prefetch pool): load the row, then compute
+    every task's output and park it in the enrichment cache flagged
+    "prefetched", so Run Process only pays for streaming the log. Stops at
+    the next task boundary once `cancel` is set.
+    """
+    row = load_columns(pipeline_columns()).iloc[positions[0]]
+    csafe = _safe_filename_component(company)
+    fingerprints = task_fingerprints(row)
+    for i in topological_order(TASKS):
+        if cancel.is_set():
+            return
+        task = TASKS[i]
+        fingerprint = fingerprints[task["name"]]
+        if cache.get(company, task["name"], fingerprint, record=False) is not None:
+            continue
+        agent_steps = get_agentic_steps(task["name"], company)
+
+        def compute() -> Dict:
+            fields = get_provider(task["name"]).fetch(task["name"], company, task["cols"], row)
+            return _task_result(task, row, company, csafe, agent_steps, fields)
+
+        try:
+            result, _ = get_single_flight().do(_flight_key(task, company, fingerprint), compute, cancel)
+        except FlightCancelled:
+            return  # company changed while another caller was computing this task
+        cache.put(company, task["name"], fingerprint, {**result, "prefetched": True}, task_cache_ttl(task))
+
+
+def _start_prefetch(df: pd.DataFrame, dataset_version: str, excel_path: str, name: str) -> None:
+    """Speculate on a confidently matched company name (one prefetch per session)."""
+    positions, _ = resolve_company(df, dataset_version, name, PREFETCH_MIN_SCORE)
+    if not positions:
+        return
+    name = canonical_company_name(df, positions, name)
+    key = (dataset_version, st.session_state.get("uploaded_digest"), normalize_company_name(name), positions[0])
+    current = st.session_state.get("prefetch")
+    if current is not None:
+        if current.key == key:
+            return
+        current.cancel()
+    # Same spelling the Run button will use, so cached entries line up
+    st.session_state["prefetch"] = get_prefetcher().start(
+        key, prefetch_company, _dataset_source(excel_path), list(positions), name, get_enrichment_cache()
+    )
+
+
+# ---------------------------
+# Background pipeline job
+# ---------------------------
+def run_pipeline_job(
+    job,
+    row: pd.Series,
+    company: str,
+    csafe: str,
+    positions: List[int],
+    load_columns,
+    step_delay: float,
+    cache=None,
+    checkpoint_run_id: str | None = None,
+) -> Dict | None:
+    """
+    Job body for one Company 360 run: forwards the task-graph events into the
+    job's event log and, when every task finished, builds the export.
+    Returns None when the run was interrupted or a task failed.
+
+    With `checkpoint_run_id`, every finished task is checkpointed as it
+    completes; tasks already checkpointed for that run (a resume) are
+    restored instead of re-run. Agent steps and detailed task logs go to
+    the run log store under the job's ID (not into the result).
+    """
+    store = get_checkpoint_store() if checkpoint_run_id else None
+    restored = store.load_tasks(checkpoint_run_id) if store else {}
+
+    tracer = get_tracer()
+
+    def run_task(i, task, emit, cancel):
+        # Spans recorded on this worker thread belong to the job's run
+        with tracer.run(job.id), tracer.span("task", task["name"]):
+            saved = restored.get(task["name"])
+            if saved is not None:
+                total_lines = len(saved["lines"])
+                for idx, line in enumerate(saved["lines"], start=1):
+                    emit("line", cls=line["cls"], text=line["text"], pct=int((idx / max(total_lines, 1)) * 100))
+                return {**saved, "restored": True}
+            result = run_enrichment_task(task, row, company, csafe, step_delay, emit, cancel, cache)
+            if store is not None:
+                store.save(checkpoint_run_id, task["name"], result)
+            return result
+
+    run_log = get_run_log_store()
+    finished = 0
+    for event in execute_dag(TASKS, run_task, cancel=job.cancel):
+        event_type = event.pop("type")
+        task_name = TASKS[event["index"]]["name"]
+        if event_type == "line":
+            run_log.append([log_record(job.id, company, task_name, event["index"], "step", event["text"], event["cls"])])
+        elif event_type == "finished":
+            finished += 1
+            run_log.append([log_record(job.id, company, task_name, event["index"], "detailed", event["result"]["detailed_log"])])
+        job.emit(event_type, **event)
+
+    if store is not None:
+        store.set_status(checkpoint_run_id, "complete" if finished == len(TASKS) else "interrupted")
+    if finished < len(TASKS):
+        return None
+
+    # The Customer360 export is built from these positions when downloaded
+    return {
+        "company": company,
+        "csafe": re.sub(r"[^a-z0-9]+", "_", company.lower()).strip("_") or "company",
+        "positions": list(positions),
+    }
+
+
+def customer360_export(load_columns, positions: List[int]) -> pd.DataFrame:
+    """Cleaned Customer360 rows for an export (every column: loaded only now), in dataset order."""
+    export = strip_derived_columns(load_columns(None)).iloc[sorted(positions)].copy()
+    export.rename(columns={"company_name": "Company Name"}, inplace=True)
+    export.drop(columns=["lead_priority_label"], errors="ignore", inplace=True)
+    return export
+
+
+def _set_task_header(i: int, color: str, label: str, label_style: str) -> None:
+    task = TASKS[i]
+    st.session_state.placeholders[i]["header_ph"].markdown(
+        f"<div class='task-card-header'><div class='task-name'>{task['icon']} {task['name']} "
+        f"{status_dot(color)} <span style='{label_style}'>— {label}</span></div></div>",
+        unsafe_allow_html=True,
+    )
+
+
+def _executing_progress_html(pct: int) -> str:
+    return (
+        f"<div style='width:100%'>"
+        f"<div style='margin-bottom:6px; font-weight:600; font-size: 13px; color: #333;'>Executing... {pct}%</div>"
+        f"<progress value='{pct}' max='100' class='progress-inline'></progress>"
+        f"</div>"
+    )
+
+
+def _end_task_stream(i: int, view: Dict) -> None:
+    """Send the task's last buffered lines and keep the rendered log for reruns."""
+    stream = view["streams"].pop(i, None)
+    if stream is not None:
+        stream.flush(force=True)
+        get_rendered_log_cache().put((view["run_id"], i), stream.box_html())
+
+
+def _completed_log_boxes(run_id: str | None, complete: bool) -> Dict[int, str]:
+    """
+    Rendered log box per task for a rerun. Boxes come from the render cache;
+    misses are rebuilt once from the run log store (one scan for the run)
+    and, when the run has ended, cached so later reruns do no work.
+    """
+    if not run_id:
+        return {}
+    cache = get_rendered_log_cache()
+    boxes = {i: cache.get((run_id, i)) for i in range(len(TASKS))}
+    missing = [i for i, box in boxes.items() if box is None]
+    if missing:
+        stored = get_run_log_store().task_lines(run_id)
+        for i in missing:
+            lines = stored.get(i)
+            boxes[i] = log_box_html((r["cls"], r["text"]) for r in lines) if lines else ""
+            if complete:
+                cache.put((run_id, i), boxes[i])
+    return boxes
+
+
+def _live_checkpoint_runs(kind: str, replaced_job_id: str | None) -> Set[str]:
+    """Checkpoint runs still executing in `kind` jobs, except the job this session is replacing."""
+    manager = get_job_manager()
+    replaced = manager.get(replaced_job_id)
+    return manager.active_keys(kind) - {replaced.key if replaced else None}
+
+
+def _show_queue_notice(job, placeholder, shown: str) -> str:
+    """Say a job is still waiting for a worker (so it doesn't look hung); returns the text now shown."""
+    text = queue_notice(job)
+    if text != shown:
+        if text:
+            placeholder.info(text)
+        else:
+            placeholder.empty()
+    return text
+
+
+def _render_pipeline_event(event: Dict, view: Dict) -> None:
+    """Apply one job event to the task cards and session_state (script thread only)."""
+    i = event["index"]
+    ph = st.session_state.placeholders.get(i)
+    if ph is None:
+        return
+
+    if event["type"] == "started":
+        # Clear previous logs/results, mark task = running in header
+        view["streams"][i] = LogStream(
+            ph["log_ph"], f"task{i}", progress_placeholder=ph["progress_ph"], progress_html=_executing_progress_html
+        )
+        st.session_state.pop(ph["cached_key"], None)
+        st.session_state[f"task_done_{i}"] = False
+        st.session_state[f"task_cached_{i}"] = False
+        _set_task_header(i, "#f0c040", "Running", "color:#888;")
+
+    elif event["type"] == "line":
+        # -------- Agentic Step Streaming --------
+        # Only new lines go to the browser, at most DEFAULT_MAX_HZ frames/s
+        view["streams"][i].append(event["cls"], event["text"], pct=event["pct"])
+
+    elif event["type"] in ("finished", "failed", "interrupted"):
+        # Buffered lines/progress go out before the final status replaces them
+        _end_task_stream(i, view)
+
+    if event["type"] == "finished":
+        # Mark task as finished (cache hits are labelled so users know nothing re-ran)
+        cached = event["result"].get("cached", False)
+        restored = event["result"].get("restored", False)
+        shared = event["result"].get("shared", False)
+        st.session_state[f"task_cached_{i}"] = cached or restored or shared
+        if restored:
+            note, label = "Restored from checkpoint.", "Complete (restored)"
+        elif cached:
+            note, label = "Inputs unchanged — reused the previous output.", "Complete (cached)"
+        elif shared:
+            note, label = "Joined an identical run already in progress.", "Complete (shared)"
+        else:
+            note, label = "Task Finished.", "Complete"
+        ph["progress_ph"].markdown(
+            f"<div style='padding:8px;'><strong>{note}</strong></div>",
+            unsafe_allow_html=True,
+        )
+        _set_task_header(i, "#10b981", label, "color:#10b981;")
+
+        # -------- Result HTML for Expander --------
+        result_html = event["result"]["result_html"]
+        st.session_state[ph["cached_key"]] = result_html
+        st.session_state[f"task_done_{i}"] = True
+        ph["results_ph"].markdown(result_html, unsafe_allow_html=True)
+        st.session_state[ph["expander_key"]] = False
+
+        # Update overall progress bar
+        view["completed"] += 1
+        view["overall_progress"].progress(
+            int((view["completed"] / len(TASKS)) * 100),
+            text=f"Overall Pipeline Progress — {view['completed']}/{len(TASKS)} tasks complete",
+        )
+
+    elif event["type"] == "failed":
+        ph["progress_ph"].markdown(
+            f"<div style='padding:8px;'><strong>Task failed:</strong> {html.escape(event['error'])}</div>",
+            unsafe_allow_html=True,
+        )
+        _set_task_header(i, "#ef4444", "Failed", "color:#ef4444;")
+
+    elif event["type"] in ("interrupted", "skipped"):
+        if event["type"] == "interrupted":
+            ph["progress_ph"].markdown(
+                "<div style='padding:8px;'><strong>Task interrupted by user.</strong></div>",
+                unsafe_allow_html=True,
+            )
+        _set_task_header(i, "#999999", event["type"].capitalize(), "color:#999;")
+
+
+def _follow_pipeline_job(job) -> None:
+    """
+    Replay a pipeline job's events from the start, then keep streaming until
+    it ends. Runs on every rerun while the session is attached to the job, so
+    reruns and reconnects pick the run back up where it is.
+    """
+    view = {
+        "streams": {},
+        "run_id": job.id,
+        "completed": 0,
+        "overall_progress": st.progress(0, text="Overall Pipeline Progress"),
+    }
+    tracer = get_tracer()
+    queued_ph, queued_text = st.empty(), ""
+    cursor = 0
+    while True:
+        done = job.done
+        queued_text = _show_queue_notice(job, queued_ph, queued_text)
+        events, cursor = job.events_since(cursor, timeout=1.0 / DEFAULT_MAX_HZ)
+        for event in events:
+            with tracer.span("render", f"pipeline {event['type']}", run_id=job.id):
+                _render_pipeline_event(event, view)
+        # Lines held back by the frame limit go out once their frame is due
+        for stream in view["streams"].values():
+            stream.flush()
+        if done:
+            break
+
+    # -------- All tasks finished --------
+    view["overall_progress"].empty()
+    st.session_state["pipeline_job_consumed"] = job.id
+    if job.status == "cancelled":
+        st.warning("Pipeline stopped by user.")
+    elif job.status == "failed" or job.result is None:
+        st.error("Pipeline did not complete; see the task cards above for details.")
+    else:
+        st.success("Pipeline finished successfully.")
+        st.session_state.pipeline_has_run = True
+        st.session_state.pipeline_company = job.result["company"]
+        st.session_state.pipeline_csafe = job.result["csafe"]
+        st.session_state.pipeline_positions = job.result["positions"]
+
+
+# ---------------------------
+# Batch enrichment
+# ---------------------------
+def enrich_company_batch(rows: pd.DataFrame, log_run_id: str | None, position: int, cancel: threading.Event) -> Dict:
+    """
+    Run the whole TASKS graph for one row (inline; the batch pool supplies
+    parallelism). Detailed task logs go to the run log store under `log_run_id`.
+    """
+    row = rows.iloc[position]
+    company = str(row.get("company_name", "") or "").strip()
+    csafe = _safe_filename_component(company)
+
+    def run_task(i, task, emit, cancel):
+        with get_tracer().run(log_run_id), get_tracer().span("task", task["name"]):
+            return run_enrichment_task(task, row, company, csafe, BATCH_STEP_DELAY, emit, cancel, get_enrichment_cache())
+
+    outcomes = run_dag_inline(TASKS, run_task, cancel)
+    _log_company_outcomes(log_run_id, company, outcomes)
+    return _company_outcome(outcomes)
+
+
+async def enrich_company_async(rows: pd.DataFrame, engine, log_run_id: str | None, position: int, cancel: threading.Event) -> Dict:
+    """enrich_company_batch for the asyncio engine (independent stages run concurrently)."""
+    row = rows.iloc[position]
+    company = str(row.get("company_name", "") or "").strip()
+    csafe = _safe_filename_component(company)
+
+    async def run_task(i, task, cancel):
+        # Each task is its own asyncio task, so the bound run stays per task
+        with get_tracer().run(log_run_id), get_tracer().span("task", task["name"], cpu=False):
+            return await run_enrichment_task_async(task, row, company, csafe, engine, cancel, get_enrichment_cache())
+
+    outcomes = await run_dag_async(TASKS, run_task, cancel)
+    await asyncio.to_thread(_log_company_outcomes, log_run_id, company, outcomes)
+    return _company_outcome(outcomes)
+
+
+def _log_company_outcomes(log_run_id: str | None, company: str, outcomes: Dict[int, Dict]) -> None:
+    """One append per company: the detailed log of every task that finished."""
+    if not log_run_id:
+        return
+    get_run_log_store().append([
+        log_record(log_run_id, company, TASKS[i]["name"], i, "detailed", o["result"]["detailed_log"])
+        for i, o in sorted(outcomes.items())
+        if o["type"] == "finished"
+    ])
+
+
+def _company_outcome(outcomes: Dict[int, Dict]) -> Dict:
+    """Batch outcome for one company from its per-task terminal events."""
+    failed = [TASKS[i]["name"] for i, o in outcomes.items() if o["type"] in ("failed", "skipped")]
+    finished = [o for o in outcomes.values() if o["type"] == "finished"]
+    reused = sum(1 for o in finished if o["result"].get("cached"))
+    return {
+        "ok": len(finished) == len(TASKS),
+        "failed_tasks": failed,
+        "tasks_reused": reused,
+        "tasks_run": len(finished) - reused,
+    }
+
+
+def run_batch_job(
+    job,
+    rows: pd.DataFrame,
+    positions: List[int],
+    restored_positions: List[int],
+    run_id: str,
+    engine_choice: str,
+    workers: int,
+) -> Dict:
+    """
+    Job body for Batch Enrichment: enriches `positions`, checkpointing every
+    company that succeeds, and emits a "progress" snapshot at most ~4x/s.
+    Returns {"summary", "positions", "run_id"} even when cancelled, so the
+    companies finished so far stay exportable and the run resumable.
+    """
+    store = get_checkpoint_store()
+    if engine_choice == "asyncio":
+        engine = get_async_engine()
+        batch_events = run_batch_async(
+            positions, partial(enrich_company_async, rows, engine, run_id), workers, cancel=job.cancel, engine=engine
+        )
+    else:
+        batch_events = run_batch(
+            positions, partial(enrich_company_batch, rows, run_id), max_workers=workers, cancel=job.cancel
+        )
+
+    succeeded_positions = list(restored_positions)
+    snapshot = None
+    last_emit = 0.0
+    with closing(batch_events) as events:
+        for event in events:
+            snapshot = event["progress"]
+            if event["outcome"]["ok"]:
+                succeeded_positions.append(event["position"])
+                store.save(run_id, "company", event["outcome"], item=str(event["position"]))
+            # Thousands of companies would flood the event log (and the websocket)
+            now = time.perf_counter()
+            if now - last_emit >= 0.25 or snapshot["done"] == snapshot["total"]:
+                last_emit = now
+                job.emit("progress", progress=snapshot)
+            if job.cancel.is_set():
+                break
+
+    if snapshot is None:
+        # Nothing left to run: every company was already checkpointed
+        snapshot = BatchProgress(0).snapshot()
+    # Failed (or not yet run) companies keep the run resumable so a Resume retries just those
+    complete = snapshot["succeeded"] == len(positions) and not job.cancel.is_set()
+    store.set_status(run_id, "complete" if complete else "interrupted")
+    snapshot["restored"] = len(restored_positions)
+    return {"summary": snapshot, "positions": sorted(succeeded_positions), "run_id": run_id}
+
+
+def _follow_batch_job(job) -> None:
+    """Paint a batch job's progress until it ends, then publish its summary and exports."""
+    progress_bar = st.progress(0, text="Batch progress")
+    stats_ph = st.empty()
+    queued_ph, queued_text = st.empty(), ""
+    cursor = 0
+    while True:
+        done = job.done
+        queued_text = _show_queue_notice(job, queued_ph, queued_text)
+        events, cursor = job.events_since(cursor, timeout=0.25)
+        if events:
+            # Only the latest snapshot matters
+            snapshot = events[-1]["progress"]
+            progress_bar.progress(
+                int(snapshot["done"] / max(snapshot["total"], 1) * 100),
+                text=f"Batch progress — {snapshot['done']:,}/{snapshot['total']:,} companies",
+            )
+            stats_ph.caption(
+                f"Throughput: {snapshot['companies_per_minute']:,.1f} companies/min · "
+                f"ETA: {format_eta(snapshot['eta_seconds'])} · "
+                f"failed companies: {snapshot['failed']:,}"
+            )
+        if done:
+            break
+
+    progress_bar.empty()
+    stats_ph.empty()
+    st.session_state["batch_job_consumed"] = job.id
+    if job.result is None:
+        st.error(f"Batch did not complete: {job.error or job.status}.")
+        return
+    if job.status == "cancelled":
+        st.warning("Batch stopped; Resume Batch continues from the last checkpoint.")
+    # One consolidated export, in dataset order, for every fully enriched company
+    st.session_state["batch_export_positions"] = job.result["positions"]
+    st.session_state["batch_summary"] = job.result["summary"]
+    # Logs of a resumed run accumulate under the same checkpoint run ID
+    st.session_state["batch_log_run"] = job.result["run_id"]
+
+
+def _render_batch_enrichment(excel_path: str, dataset_version: str) -> None:
+    """
+    Batch mode: every row of the active dataset (workbook or upload) through
+    TASKS, as a background job the page re-attaches to on every rerun. Each
+    fully enriched company is checkpointed, so an interrupted batch on the
+    same dataset version can resume where it stopped.
+    """
+    st.markdown("---")
+    with st.expander("📦 Batch Enrichment — run the pipeline across the whole lead list", expanded=False):
+        rows = _load_dataset_columns(excel_path, pipeline_columns())
+        st.caption(
+            f"{len(rows):,} companies in the active dataset "
+            f"({'uploaded list' if st.session_state.get('uploaded_digest') else 'Customer360'})."
+        )
+
+        b_cols = st.columns([0.3, 0.2, 0.3, 0.2])
+        with b_cols[0]:
+            limit = st.number_input(
+                "Companies to enrich", min_value=1, max_value=max(len(rows), 1),
+                value=max(len(rows), 1), step=1, key="batch_limit",
+            )
+        with b_cols[1]:
+            # asyncio: hundreds of provider calls in flight on one loop thread
+            engine_choice = st.radio("Engine", ["Threads", "asyncio"], key="batch_engine", horizontal=True)
+        with b_cols[2]:
+            if engine_choice == "asyncio":
+                workers = st.slider(
+                    "Companies in flight", 1, 512, min(ASYNC_COMPANIES_IN_FLIGHT, 512), key="batch_in_flight"
+                )
+            else:
+                workers = st.slider("Workers", 1, 32, min(BATCH_MAX_WORKERS, 32), key="batch_workers")
+
+        store = get_checkpoint_store()
+        batch_job = get_job_manager().get(st.session_state.get("batch_job_id"))
+        batch_running = batch_job is not None and not batch_job.done
+        # A batch some session is still executing is not resumable
+        resumable_batch = store.latest_resumable("batch", dataset_version, exclude=get_job_manager().active_keys("batch"))
+        run_cols = st.columns([0.2, 0.3, 0.2, 0.3])
+        with run_cols[0]:
+            run_batch_clicked = st.button(
+                "Run Batch", key="launch_batch", type="primary", disabled=rows.empty or batch_running
+            )
+        with run_cols[1]:
+            resume_batch_clicked = st.button(
+                f"Resume Batch ({resumable_batch['checkpoints']:,}/{resumable_batch['params']['limit']:,} done)"
+                if resumable_batch else "Resume Batch",
+                key="resume_batch",
+                disabled=resumable_batch is None or rows.empty or batch_running,
+            )
+        with run_cols[2]:
+            if st.button("Stop Batch", key="stop_batch", disabled=not batch_running):
+                get_job_manager().cancel(batch_job.id)
+
+        if run_batch_clicked or (resume_batch_clicked and resumable_batch is not None):
+            # Runs other sessions' batch jobs are executing must stay resumable
+            live = _live_checkpoint_runs("batch", st.session_state.get("batch_job_id"))
+            if resume_batch_clicked:
+                # Companies already checkpointed are restored, not re-enriched
+                run_id = store.start_run(
+                    "batch", dataset_version, resumable_batch["params"], resumable_batch["run_id"], live=live
+                )
+                limit = resumable_batch["params"]["limit"]
+                restored_positions = sorted(int(p) for p in store.completed_items(run_id, "company"))
+            else:
+                run_id = store.start_run("batch", dataset_version, {"limit": int(min(limit, len(rows)))}, live=live)
+                restored_positions = []
+            done = set(restored_positions)
+            positions = [p for p in range(int(min(limit, len(rows)))) if p not in done]
+
+            # Background job: reruns (any widget interaction) re-attach instead of cancelling it
+            manager = get_job_manager()
+            manager.cancel(st.session_state.get("batch_job_id"))
+            job = manager.submit(
+                "batch",
+                run_batch_job,
+                rows,
+                positions,
+                restored_positions,
+                run_id,
+                engine_choice,
+                workers,
+                label=f"batch {dataset_version}",
+                key=run_id,
+            )
+            st.session_state["batch_job_id"] = job.id
+            batch_job = job
+
+        if batch_job is not None and st.session_state.get("batch_job_consumed") != batch_job.id:
+            _follow_batch_job(batch_job)
+
+        summary = st.session_state.get("batch_summary")
+        if summary:
+            st.success(
+                f"Batch finished: {summary['succeeded'] + summary.get('restored', 0):,}/"
+                f"{summary['total'] + summary.get('restored', 0):,} companies enriched "
+                f"in {format_eta(summary['elapsed_seconds'])} "
+                f"({summary['companies_per_minute']:,.1f} companies/min"
+                f"{', ' + format(summary['restored'], ',') + ' restored from checkpoint' if summary.get('restored') else ''})."
+            )
+            failures = pd.DataFrame(
+                [{"Task": t["name"], "Failures": summary["task_failures"].get(t["name"], 0)} for t in TASKS]
+            )
+            st.caption(
+                f"Incremental re-enrichment: {summary.get('tasks_run', 0):,} task runs, "
+                f"{summary.get('tasks_reused', 0):,} reused (inputs unchanged)."
+            )
+            st.dataframe(failures, hide_index=True)
+            export_positions = st.session_state.get("batch_export_positions")
+            # Downloads are generated when clicked, not on every rerun
+            dl_cols = st.columns(2)
+            if export_positions is not None:
+                with dl_cols[0]:
+                    st.download_button(
+                        label="📥 Download Batch Customer 360",
+                        data=csv_export(partial(customer360_export, _dataset_source(excel_path), export_positions)),
+                        file_name="batch_customer360.csv",
+                        mime="text/csv",
+                        key="download_batch_customer360",
+                    )
+            if st.session_state.get("batch_log_run"):
+                with dl_cols[1]:
+                    st.download_button(
+                        label="🗜️ Download Batch Logs (.zip)",
+                        data=log_archive(get_run_log_store(), st.session_state["batch_log_run"]),
+                        file_name="batch_agentic_pipeline_logs.zip",
+                        mime="application/zip",
+                        key="download_batch_logs",
+                    )
+
+
+def _render_timing_panel() -> None:
+    """Admin view of the tracing ring buffer: p50/p95/p99 per stage (all runs, or the current one)."""
+    with st.expander("⏱️ Stage timings — where run time goes (p50 / p95 / p99)", expanded=False):
+        tracer = get_tracer()
+        run_id = st.session_state.get("pipeline_log_run")
+        scope = st.radio(
+            "Scope", ["All recent runs", "Current pipeline run"], key="timing_scope", horizontal=True,
+            disabled=not run_id,
+        )
+        rows = tracer.summary(run_id if scope == "Current pipeline run" and run_id else None)
+        stats = tracer.stats()
+        st.caption(
+            f"{stats['spans']:,} spans buffered (last {stats['capacity']:,} kept, in-process). "
+            "Step wall time includes the simulated agent delay; CPU time is the actual work."
+        )
+        if not rows:
+            st.info("No timings recorded yet: run the pipeline, a batch or lead scoring.")
+            return
+        table = pd.DataFrame(rows).sort_values(["kind", "stage"])
+        table.columns = [c.replace("_", " ") for c in table.columns]
+        st.dataframe(table, hide_index=True)
+
+
 # ---------------------------
 # Main page
 # ---------------------------
@@ -1401,24 +2220,50 @@ def data_engineer_page():
         pass
 
     st.markdown(_CSS, unsafe_allow_html=True)
+    st.markdown(f"<style>{LOG_STREAM_CSS}</style>", unsafe_allow_html=True)
     
     # ------------------------------------
     # Read Excel path from environment
     # ------------------------------------
 
-    BASE_DIR = os.getcwd()
-    excel_path = os.path.join(BASE_DIR,"Files","b2b_agentic_streamlit_demo_data.xlsx")
+    excel_path = default_excel_path()
 
     try:
-        df = pd.read_excel(excel_path, sheet_name="Customer360")
+        # Shared across sessions; only re-parsed when the workbook changes on disk.
+        # Only the key columns are materialized here; stages project what they need.
+        df = load_customer360(excel_path, columns=KEY_COLUMNS)
+        dataset_version = customer360_version(excel_path)
     except Exception as e:
         st.error(f"Failed to load Excel file from path: {excel_path}")
         st.error(str(e))
         df = pd.DataFrame()
+        dataset_version = "empty"
 
 
     if "uploaded_df" in st.session_state:
         df = st.session_state["uploaded_df"]
+        dataset_version = f"upload:{st.session_state.get('uploaded_digest')}"
+    elif st.session_state.get("uploaded_spill") is not None:
+        # Upload exceeded the per-session memory ceiling; it lives on disk
+        try:
+            df = st.session_state["uploaded_spill"](KEY_COLUMNS)
+            dataset_version = f"upload:{st.session_state.get('uploaded_digest')}"
+        except Exception:
+            # Spill files are gone (e.g. temp dir cleaned); re-ingest the upload on the next rerun
+            _set_upload_spill(None)
+            st.session_state.pop("uploaded_digest", None)
+            st.session_state.pop("uploaded_file_id", None)
+            st.warning("The uploaded file's spilled data is no longer available; it will be re-ingested.")
+    elif st.session_state.get("upload_overlay") is not None:
+        overlay = st.session_state["upload_overlay"]
+        if overlay["base_version"] != dataset_version:
+            # Workbook changed under the merge; positions no longer line up
+            st.session_state.pop("upload_overlay", None)
+            st.session_state.pop("uploaded_file_id", None)
+            st.warning("The base workbook changed since your merge upload; please re-upload to merge again.")
+        else:
+            df = apply_overlay(df, overlay, KEY_COLUMNS)
+            dataset_version = f"overlay:{dataset_version}:{st.session_state.get('uploaded_digest')}"
 
     simulate_time_per_step = 0.7  # seconds per log line
 
@@ -1441,8 +2286,6 @@ def data_engineer_page():
         st.session_state.insight_content_type = "Scouting Report"
     if "pipeline_has_run" not in st.session_state:
         st.session_state.pipeline_has_run = False
-    if "detailed_logs_list" not in st.session_state:
-        st.session_state.detailed_logs_list = []
     if "last_valid_scope" not in st.session_state:
         st.session_state.last_valid_scope = "ingest"
 
@@ -1546,17 +2389,97 @@ def data_engineer_page():
                     type=["xlsx", "xls", "csv"],
                     key="data_file_uploader"
                 )
+                upload_mode = st.radio(
+                    "Upload mode",
+                    ["Replace dataset", "Merge by unique_id"],
+                    key="upload_mode",
+                    horizontal=True,
+                )
+                upload_token = (
+                    f"{uploaded_file.file_id}:{upload_mode}" if uploaded_file is not None else None
+                )
+
+                # The uploader keeps its value across reruns: only ingest when the
+                # widget holds a different file, and let the content-hash cache
+                # skip the parse entirely for bytes any session has seen before.
+                if uploaded_file is not None and upload_token != st.session_state.get("uploaded_file_id"):
+                    upload_progress = st.progress(0.0, text="Ingesting upload...")
+
+                    def _on_upload_progress(rows: int, fraction: float):
+                        upload_progress.progress(fraction, text=f"Ingesting upload... {rows:,} rows")
 
-                if uploaded_file is not None:
                     try:
-                        if uploaded_file.name.lower().endswith((".xlsx", ".xls")):
-                            st.session_state["uploaded_df"] = pd.read_excel(
-                                uploaded_file, sheet_name="Customer360"
-                            )
-                        else:
-                            st.session_state["uploaded_df"] = pd.read_csv(uploaded_file)
+                        result = ingest_upload_cached(uploaded_file, on_progress=_on_upload_progress)
                     except Exception as e:
                         st.warning(f"Could not read uploaded file: {e}")
+                    else:
+                        st.session_state["uploaded_file_id"] = upload_token
+                        st.session_state["uploaded_digest"] = result["digest"]
+                        summary = (
+                            f"Ingested {result['rows']:,} rows "
+                            f"({result['nbytes'] / (1024 * 1024):.1f} MB"
+                            f"{', spilled to disk' if result['spilled'] else ''}"
+                            f"{', reused cached parse' if result['cached'] else ''})"
+                        )
+                        if upload_mode == "Merge by unique_id":
+                            # Upsert: keep only the changed cells / new rows for this session
+                            try:
+                                upload_df = result["df"] if not result["spilled"] else result["spill_lease"]()
+                                overlay = compute_overlay(
+                                    load_customer360(excel_path), upload_df, customer360_version(excel_path)
+                                )
+                            except Exception as e:
+                                st.warning(f"Could not merge uploaded file: {e}")
+                                st.session_state.pop("uploaded_file_id", None)
+                            else:
+                                st.session_state.pop("uploaded_df", None)
+                                _set_upload_spill(None)
+                                st.session_state["upload_overlay"] = overlay
+                                counts = overlay["counts"]
+                                summary += (
+                                    f" · merged: {counts['inserted']:,} inserted, "
+                                    f"{counts['updated']:,} updated, {counts['unchanged']:,} unchanged "
+                                    f"(delta {overlay_nbytes(overlay) / 1024:.0f} KB)"
+                                )
+                            if result["spill_lease"] is not None:
+                                result["spill_lease"].release()  # the overlay keeps only the delta
+                        else:
+                            st.session_state.pop("upload_overlay", None)
+                            if result["spilled"]:
+                                st.session_state.pop("uploaded_df", None)
+                                _set_upload_spill(result["spill_lease"])
+                            else:
+                                _set_upload_spill(None)
+                                st.session_state["uploaded_df"] = result["df"]
+                        st.session_state["uploaded_summary"] = summary
+                    finally:
+                        upload_progress.empty()
+
+                if uploaded_file is not None and st.session_state.get("uploaded_summary"):
+                    st.caption(st.session_state["uploaded_summary"])
+
+                stats = loader_stats()
+                st.caption(
+                    f"Customer360 load ({stats['last_source'] or 'n/a'}): "
+                    f"{stats['last_load_seconds'] * 1000:.0f} ms · "
+                    f"cache hit rate {stats['hit_rate']:.0%} "
+                    f"({int(stats['hits'])} hits / {int(stats['misses'])} loads)"
+                )
+                cache_stats = get_enrichment_cache().stats()
+                flight_stats = get_single_flight().stats()
+                st.caption(
+                    f"Enrichment cache: hit rate {cache_stats['hit_rate']:.0%} "
+                    f"({cache_stats['hits']} hits / {cache_stats['hits'] + cache_stats['misses']} lookups"
+                    f" · {cache_stats['entries']} stored results"
+                    f" · {flight_stats['shared']} deduplicated in flight)"
+                )
+                remote = sorted({name for name in provider_names([t["name"] for t in TASKS]).values() if name != "customer360"})
+                if remote:
+                    st.caption(f"Enrichment providers: {', '.join(remote)}")
+                mem_report = loader_memory_report(excel_path)
+                if mem_report is not None:
+                    with st.expander("Customer360 memory report"):
+                        st.dataframe(mem_report, hide_index=True, use_container_width=True)
 
                 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -1594,6 +2517,9 @@ def data_engineer_page():
                         placeholder="Type company name",
                         on_change=_clear_right_side,
                     )
+                    # Start the row lookup / task outputs before Run Process is clicked
+                    if selected_company and selected_company.strip() and not df.empty:
+                        _start_prefetch(df, dataset_version, excel_path, selected_company.strip())
 
             else:
                 _render_insight_sidebar_inputs()
@@ -1676,7 +2602,7 @@ def data_engineer_page():
         if st.session_state.scope == "score":
             # print(df)
             try:
-                lead_scoring_page(df)
+                lead_scoring_page(_load_dataset_columns(excel_path, LEAD_SCORING_COLUMNS))
             except Exception as e:
                 st.error(f"Failed to load Lead Scoring page: {e}")
             return
@@ -1707,7 +2633,22 @@ def data_engineer_page():
             unsafe_allow_html=True,
         )
 
-        top_cols = st.columns([0.1, 0.1, 0.8])
+        # An earlier run for this company that was stopped or died mid-pipeline
+        active_job = get_job_manager().get(
+            st.session_state.get("pipeline_job_id") or st.query_params.get("pipeline_job")
+        )
+        resumable_run = None
+        if selected_company and str(selected_company).strip() and (active_job is None or active_job.done):
+            resumed_positions, _ = resolve_company(df, dataset_version, str(selected_company).strip())
+            # Same dataset only, and never a run another session's job is still executing
+            resumable_run = get_checkpoint_store().latest_resumable(
+                "pipeline",
+                normalize_company_name(canonical_company_name(df, resumed_positions, str(selected_company).strip())),
+                params={"dataset_version": dataset_version},
+                exclude=get_job_manager().active_keys("pipeline"),
+            )
+
+        top_cols = st.columns([0.1, 0.1, 0.1, 0.7])
         with top_cols[0]:
             launch_clicked = st.button(
                 "Run Process", key="launch_pipeline", type="primary", use_container_width=True
@@ -1717,11 +2658,28 @@ def data_engineer_page():
                 "Stop Process", key="stop_pipeline",  type="secondary",  use_container_width=True
             ):
                 st.session_state.stop_requested = True
+                # Cooperative cancel: workers stop at their next log line
+                get_job_manager().cancel(
+                    st.session_state.get("pipeline_job_id") or st.query_params.get("pipeline_job")
+                )
+        with top_cols[2]:
+            resume_clicked = st.button(
+                "Resume", key="resume_pipeline", type="secondary", use_container_width=True,
+                disabled=resumable_run is None,
+                help=(
+                    f"Continue the interrupted run ({resumable_run['checkpoints']}/{len(TASKS)} tasks checkpointed)"
+                    if resumable_run else "No interrupted run for this company"
+                ),
+            )
 
         st.markdown("<br>", unsafe_allow_html=True)
 
         # --- Tasks Container ---
         tasks_container = st.container()
+        log_run_id = st.session_state.get("pipeline_log_run")
+        # Jobs are consumed once they end; only then are their logs final
+        with get_tracer().span("render", "completed task logs", run_id=log_run_id):
+            log_boxes = _completed_log_boxes(log_run_id, st.session_state.get("pipeline_job_consumed") == log_run_id)
         with tasks_container:
             for i, t in enumerate(TASKS):
                 expander_key = f"exp_{i}"
@@ -1744,7 +2702,8 @@ def data_engineer_page():
                     # task completed in a previous run
                     status_html = (
                         f"{status_dot('#10b981')}"
-                        f"<span style='color:#10b981;'>— Complete</span>"
+                        f"<span style='color:#10b981;'>— Complete"
+                        f"{' (cached)' if st.session_state.get(f'task_cached_{i}', False) else ''}</span>"
                     )
                 else:
                     # default = pending
@@ -1771,43 +2730,15 @@ def data_engineer_page():
                 st.markdown("<div class='task-card-body'>", unsafe_allow_html=True)
                 progress_ph = st.empty()
 
-                # Agentic log area
+                # Agentic log area (completed logs come pre-rendered from the render cache)
                 log_ph = st.empty()
-                if not st.session_state.get(f"log_{i}"):
+                if not log_boxes.get(i):
                     log_ph.markdown(
                         "<div class='agent-log-box agent-log-empty'>Background agent pipeline will appear here once the process starts.</div>",
                         unsafe_allow_html=True,
                     )
                 else:
-                    # Re-render existing log (so UI persists even on rerun)
-                    existing_log = st.session_state.get(f"log_{i}", "")
-
-                    if existing_log:
-                        # full HTML from stored classes
-                        formatted_html = ""
-                        for ln in existing_log.split("\n"):
-                            # expected format: "{timestamp} - {CLS} - {text}"
-                            try:
-                                _, cls, text = ln.split(" - ", 2)
-                                cls = cls.lower()
-                            except:
-                                cls = "info"
-                                text = ln
-
-                            formatted_html += f"<div class='agent-log-line {cls}'>{html.escape(text)}</div>"
-
-                        log_ph.markdown(f"<div class='agent-log-box'>{formatted_html}</div>", unsafe_allow_html=True)
-
-                    else:
-                        log_ph.markdown(
-                            "<div class='agent-log-box agent-log-empty'>Background agent pipeline will appear here once the process starts.</div>",
-                            unsafe_allow_html=True,
-                        )
-
-                    log_html = "".join(
-                        [f"<div class='agent-log-line'>{line}</div>" for line in existing_log.split("\n")]
-                    )
-                    log_ph.markdown(f"<div class='agent-log-box'>{log_html}</div>", unsafe_allow_html=True)
+                    log_ph.markdown(log_boxes[i], unsafe_allow_html=True)
 
 
                 # Enrichment details (collapsed until task finishes)
@@ -1846,7 +2777,7 @@ def data_engineer_page():
 
 
         # --- Pipeline Execution Logic ---
-        if launch_clicked:
+        if launch_clicked or (resume_clicked and resumable_run is not None):
             st.session_state.stop_requested = False
 
             if not selected_company or not str(selected_company).strip():
@@ -1859,210 +2790,71 @@ def data_engineer_page():
                 #     if "company_name" in df.columns
                 #     else pd.DataFrame()
                 # )
-                if "company_name" in df.columns:
-                    user_key = normalize_company_name(name_str)
-
-                    df["_company_key"] = (
-                        df["company_name"]
-                        .astype(str)
-                        .apply(normalize_company_name)
-                    )
-
-                    rows = df[df["_company_key"] == user_key]
-                    if "_company_key" in df.columns:
-                        df.drop(columns=["_company_key"], inplace=True)
+                positions, suggestions = resolve_company(df, dataset_version, name_str)
 
+                # Materialize only the columns the TASKS steps read, for the matched rows
+                if positions:
+                    rows = _load_dataset_columns(excel_path, pipeline_columns()).iloc[list(positions)]
                 else:
                     rows = pd.DataFrame()
 
 
                 if rows.empty:
                     st.error("Selected company not found in data source.")
+                    if suggestions:
+                        st.info("Did you mean: " + ", ".join(suggestions) + "?")
                 else:
                     row = rows.iloc[0]
+                    # Run under the matched company's own name, not the typed text
+                    name_str = canonical_company_name(df, positions, name_str)
 
                     # Reset run state
                     st.session_state.pipeline_has_run = False
-                    st.session_state.detailed_logs_list = []
-
-                    total_tasks = len(TASKS)
-                    overall_progress = st.progress(0, text="Overall Pipeline Progress")
 
                     # Safe filename
                     csafe_run = _safe_filename_component(name_str)
 
-                    # ----------- Execute each task -----------
-                    for i, task in enumerate(TASKS):
-                        if st.session_state.get("stop_requested", False):
-                            break
-
-                        ph = st.session_state.placeholders.get(i)
-                        if ph is None:
-                            continue
-
-                        dot_ph = ph["dot_ph"]
-                        header_ph = ph["header_ph"]
-                        progress_ph = ph["progress_ph"]
-                        log_ph = ph["log_ph"]
-                        results_ph = ph["results_ph"]
-                        expander_key = ph["expander_key"]
-                        cached_key = ph["cached_key"]
-
-                        # Clear previous logs/results
-                        st.session_state.pop(cached_key, None)
-                        st.session_state.pop(f"log_{i}", None)
-                        st.session_state.pop(f"detailed_log_{i}", None)
-                        st.session_state[f"task_done_{i}"] = False
-
-                        # Mark task = running in header
-                        header_ph.markdown(
-                            f"<div class='task-card-header'><div class='task-name'>{task['icon']} {task['name']} "
-                            f"{status_dot('#f0c040')} <span style='color:#888;'>— Running</span></div></div>",
-                            unsafe_allow_html=True,
-                        )
-
-                        # -------- Agentic Step Streaming --------
-                        agent_steps = get_agentic_steps(task["name"], name_str)
-
-                        log_html = ""
-                        plain_lines = []
-
-                        total_lines = len(agent_steps)
-
-                        for idx, step in enumerate(agent_steps, start=1):
-                            if st.session_state.get("stop_requested", False):
-                                break
-
-                            cls = step.get("cls", "info")
-                            text = step.get("text", "")
-                            escaped_text = html.escape(text)
-
-                            # Build HTML log stream
-                            log_html += f"<div class='agent-log-line {cls}'>{escaped_text}</div>"
-
-                            ts_line = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            plain_lines.append(f"{ts_line} - {cls} - {text}")
-                            st.session_state[f"log_{i}"] = "\n".join(plain_lines)
-
-                            log_ph.markdown(
-                                f"<div class='agent-log-box'>{log_html}</div>",
-                                unsafe_allow_html=True,
-                            )
-
-                            pct = int((idx / max(total_lines, 1)) * 100)
-                            progress_ph.markdown(
-                                f"<div style='width:100%'>"
-                                f"<div style='margin-bottom:6px; font-weight:600; font-size: 13px; color: #333;'>Executing... {pct}%</div>"
-                                f"<progress value='{pct}' max='100' class='progress-inline'></progress>"
-                                f"</div>",
-                                unsafe_allow_html=True,
-                            )
-
-                            time.sleep(simulate_time_per_step)
-
-                        if st.session_state.get("stop_requested", False):
-                            progress_ph.markdown(
-                                "<div style='padding:8px;'><strong>Task interrupted by user.</strong></div>",
-                                unsafe_allow_html=True,
-                            )
-                            header_ph.markdown(
-                                f"<div class='task-card-header'><div class='task-name'>{task['icon']} {task['name']} "
-                                f"{status_dot('#999999')} <span style='color:#999;'>— Interrupted</span></div></div>",
-                                unsafe_allow_html=True,
-                            )
-                            break
-
-                        # Mark task as finished
-                        progress_ph.markdown(
-                            "<div style='padding:8px;'><strong>Task Finished.</strong></div>",
-                            unsafe_allow_html=True,
-                        )
-                        header_ph.markdown(
-                            f"<div class='task-card-header'><div class='task-name'>{task['icon']} {task['name']} "
-                            f"{status_dot('#10b981')} <span style='color:#10b981;'>— Complete</span></div></div>",
-                            unsafe_allow_html=True,
-                        )
-
-                        # -------- Result HTML for Expander --------
-                        html_rows = []
-
-                        if task["name"] == "Growth Signals":
-                            details = row.get("Signal Details", "")
-                            links = row.get("Signal Links", "")
-                            formatted = format_growth_signals(details, links)
-                            html_rows.append(
-                                f"<div class='kv'><div class='label'>Growth Signals</div>{formatted}</div>"
-                            )
-                        else:
-                            for col in task["cols"]:
-                                raw_val = row.get(col, "(no value)")
-                                if isinstance(raw_val, str):
-                                    raw_val = raw_val.strip()
-
-                                if col.lower() in ["other locations", "locations", "hq locations"]:
-                                    raw_val = format_locations_to_bullets(raw_val)
-
-                                if col == "Tech Install":
-                                    raw_val = format_tech_install(raw_val)
-
-                                html_rows.append(
-                                    f"<div class='kv'><div class='label'>{pretty_label(col)}</div>{raw_val}</div>"
-                                )
-
-                        result_html = f"<div class='output-box'>{''.join(html_rows)}</div>"
-
-                        st.session_state[cached_key] = result_html
-                        st.session_state[f"task_done_{i}"] = True
-                        results_ph.markdown(result_html, unsafe_allow_html=True)
-                        st.session_state[expander_key] = False
-
-                        # -------- Detailed Log (downloadable template) --------
-                        step_key = task_name_to_step_key(task["name"])
-                        original_raw = "\n".join([f"[{s['cls'].upper()}] {s['text']}" for s in agent_steps])
-
-                        detailed_text = generate_detailed_log(
-                            step_key,
-                            name_str,
-                            row.get("Official Domain", ""),
-                            csafe_run,
-                            original_raw,
-                            datetime.datetime.now(),
-                        )
-
-                        st.session_state[f"detailed_log_{i}"] = detailed_text
-                        st.session_state.detailed_logs_list.append(detailed_text)
-
-                        # Update overall progress bar
-                        overall_pct = int(((i + 1) / total_tasks) * 100)
-                        overall_progress.progress(
-                            overall_pct,
-                            text=f"Overall Pipeline Progress — {i+1}/{total_tasks} tasks complete",
-                        )
-
-                    # -------- All tasks finished --------
-                    if st.session_state.get("stop_requested", False):
-                        st.warning("Pipeline stopped by user.")
-                        overall_progress.empty()
-                    else:
-                        st.success("Pipeline finished successfully.")
-                        overall_progress.empty()
-
-                        # Prepare cleaned Customer360 output
-                        csafe = re.sub(r"[^a-z0-9]+", "_", name_str.lower()).strip("_") or "company"
-
-                        customer360_filtered = rows.copy()
-                        customer360_filtered.rename(columns = {"company_name":"Company Name"}, inplace = True)
-                        customer360_filtered.drop(
-                            columns=["lead_priority_label"], errors="ignore", inplace=True
-                        )
-
-                        consolidated_log_text = "\n\n".join(st.session_state.detailed_logs_list or [])
+                    # ----------- Submit the task graph as a background job -----------
+                    # Website Extraction first, then the independent stages in parallel.
+                    # The job outlives reruns; the page below re-attaches and replays it.
+                    # Resume keeps the interrupted run's checkpoints; Run starts a fresh run
+                    checkpoint_run_id = get_checkpoint_store().start_run(
+                        "pipeline",
+                        normalize_company_name(name_str),
+                        {"company": name_str, "dataset_version": dataset_version},
+                        run_id=resumable_run["run_id"] if resume_clicked and resumable_run else None,
+                        live=_live_checkpoint_runs("pipeline", st.session_state.get("pipeline_job_id")),
+                    )
+                    manager = get_job_manager()
+                    manager.cancel(st.session_state.get("pipeline_job_id"))
+                    job = manager.submit(
+                        "pipeline",
+                        run_pipeline_job,
+                        row,
+                        name_str,
+                        csafe_run,
+                        list(positions),
+                        _dataset_source(excel_path),
+                        simulate_time_per_step,
+                        get_enrichment_cache(),
+                        checkpoint_run_id,
+                        label=name_str,
+                        key=checkpoint_run_id,
+                    )
+                    st.session_state["pipeline_job_id"] = job.id
+                    st.query_params["pipeline_job"] = job.id
+                    # Logs are read back from the run log store under this ID
+                    st.session_state["pipeline_log_run"] = job.id
 
-                        st.session_state.pipeline_has_run = True
-                        st.session_state.pipeline_company = name_str
-                        st.session_state.pipeline_csafe = csafe
-                        st.session_state.customer360_filtered = customer360_filtered
-                        st.session_state.consolidated_log_text = consolidated_log_text
+        # -------------------------------------------------
+        # ATTACHED JOB: replay + stream until it ends
+        # -------------------------------------------------
+        pipeline_job = get_job_manager().get(
+            st.session_state.get("pipeline_job_id") or st.query_params.get("pipeline_job")
+        )
+        if pipeline_job is not None and st.session_state.get("pipeline_job_consumed") != pipeline_job.id:
+            st.session_state["pipeline_job_id"] = pipeline_job.id
+            _follow_pipeline_job(pipeline_job)
 
 
         # -------------------------------------------------
@@ -2071,20 +2863,29 @@ def data_engineer_page():
         if st.session_state.get("pipeline_has_run", False):
             # Only show if we're still on the same company
             last_company = st.session_state.get("pipeline_company")
-            current_company = st.session_state.get("company_input")
-
-            if last_company and current_company and last_company == current_company:
+            current_company = str(st.session_state.get("company_input") or "").strip()
+            if current_company:
+                # The run is stored under the matched (canonical) name; resolve the input the same way
+                current_positions, _ = resolve_company(df, dataset_version, current_company)
+                current_company = canonical_company_name(df, current_positions, current_company)
+
+            if (
+                last_company
+                and current_company
+                and normalize_company_name(last_company) == normalize_company_name(current_company)
+            ):
                 csafe = st.session_state.get("pipeline_csafe", "company")
-                customer360_filtered = st.session_state.get("customer360_filtered")
-                consolidated_log_text = st.session_state.get("consolidated_log_text", "")
+                export_positions = st.session_state.get("pipeline_positions")
 
-                if customer360_filtered is not None:
-                    dl_col1, dl_col2 = st.columns(2)
+                if export_positions is not None:
+                    # Built only when a download or the DB preview needs it
+                    build_export = partial(customer360_export, _dataset_source(excel_path), export_positions)
+                    dl_col1, dl_col2, dl_col3 = st.columns(3)
 
                     with dl_col1:
                         st.download_button(
                             label="📥 Download Customer 360",
-                            data=customer360_filtered.to_csv(index=False).encode("utf-8"),
+                            data=csv_export(build_export),
                             file_name=f"{csafe}_customer360.csv",
                             mime="text/csv",
                             key="download_customer360",
@@ -2093,20 +2894,27 @@ def data_engineer_page():
                     with dl_col2:
                         st.download_button(
                             label="📄 Download Consolidated Logs",
-                            data=consolidated_log_text,
+                            data=consolidated_log(get_run_log_store(), st.session_state.get("pipeline_log_run", "")),
                             file_name=f"{csafe}_agentic_pipeline_logs.txt",
                             mime="text/plain",
                             key="download_consolidated_logs",
                         )
 
+                    with dl_col3:
+                        st.download_button(
+                            label="⏱️ Download Run Timings (JSON)",
+                            data=timings_json(
+                                get_tracer(), st.session_state.get("pipeline_log_run", ""), company=last_company
+                            ),
+                            file_name=f"{csafe}_run_timings.json",
+                            mime="application/json",
+                            key="download_run_timings",
+                        )
+
                     # ------------------------------------
                     # DB UPDATE PROMPT (USER INPUT)
                     # ------------------------------------
 
-                    customer360_filtered = customer360_filtered.drop(columns=["_company_key"], errors="ignore")
-                    customer360_filtered = customer360_filtered.rename(columns={"unique_id": "Unique ID"})
-                    customer360_filtered.reset_index(drop = True, inplace = True)
-
                     st.markdown("---")
                     st.subheader("Update Customer 360 table in your database?")
 
@@ -2134,12 +2942,18 @@ def data_engineer_page():
                                 f"Customer 360 updated successfully in `{db_name}.{table_name}`!"
                             )
                             st.markdown("#### Preview of updated records:")
+                            customer360_filtered = build_export().drop(columns=["_company_key"], errors="ignore")
+                            customer360_filtered = customer360_filtered.rename(columns={"unique_id": "Unique ID"})
+                            customer360_filtered.reset_index(drop = True, inplace = True)
                             st.dataframe(customer360_filtered)
 
                     elif user_reply:
                         st.info("Okay, the database will not be updated.")
 
 
+        _render_batch_enrichment(excel_path, dataset_version)
+        _render_timing_panel()
+
         # close main-panel
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -0,0 +1,286 @@
+# data_loader.py
+# Process-wide, change-aware loader for the Customer360 workbook
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from compaction import DERIVED_SUFFIX, add_report_total, compact_customer360, memory_report
+
+try:
+    import pyarrow  # noqa: F401  (parquet engine for the columnar snapshot)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+CUSTOMER360_SHEET = "Customer360"
+DEFAULT_EXCEL_RELPATH = os.path.join("Files", "b2b_agentic_streamlit_demo_data.xlsx")
+
+
+SNAPSHOT_SUFFIX = ".customer360.parquet"
+
+
+def default_excel_path() -> str:
+    """Absolute path of the bundled demo workbook (relative to the app's cwd)."""
+    return os.path.join(os.getcwd(), DEFAULT_EXCEL_RELPATH)
+
+
+def snapshot_path(excel_path: str) -> str:
+    """Sidecar snapshot path that lives next to the workbook."""
+    return os.path.splitext(excel_path)[0] + SNAPSHOT_SUFFIX
+
+
+# ---------------------------
+# Columnar snapshot
+# ---------------------------
+def _snapshot_is_fresh(excel_path: str, snap_path: str) -> bool:
+    """A snapshot is usable when it exists and is not older than the workbook."""
+    try:
+        return os.stat(snap_path).st_mtime_ns >= os.stat(excel_path).st_mtime_ns
+    except OSError:
+        return False
+
+
+def write_snapshot(df: pd.DataFrame, snap_path: str) -> None:
+    """Write the frame as Parquet, atomically (temp file + rename)."""
+    tmp_path = f"{snap_path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, snap_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def build_snapshot(excel_path: str | None = None) -> str:
+    """Build step: convert the Customer360 sheet into its Parquet sidecar."""
+    excel_path = os.path.abspath(excel_path or default_excel_path())
+    snap_path = snapshot_path(excel_path)
+    df = pd.read_excel(excel_path, sheet_name=CUSTOMER360_SHEET)
+    write_snapshot(df, snap_path)
+    return snap_path
+
+
+def _source_header(excel_path: str, use_snapshot: bool) -> List[str]:
+    """Column names of the Customer360 sheet, read without loading any rows."""
+    snap_path = snapshot_path(excel_path)
+    if use_snapshot and HAS_PYARROW and _snapshot_is_fresh(excel_path, snap_path):
+        try:
+            import pyarrow.parquet as pq
+            return list(pq.read_schema(snap_path).names)
+        except Exception:
+            pass
+    return [str(c) for c in pd.read_excel(excel_path, sheet_name=CUSTOMER360_SHEET, nrows=0).columns]
+
+
+def _read_source(
+    excel_path: str, use_snapshot: bool, columns: List[str] | None = None
+) -> Tuple[pd.DataFrame, str]:
+    """
+    Read Customer360 (only `columns`, or all when None) from the snapshot when
+    it is fresh, otherwise from the workbook, regenerating the snapshot on the
+    way. Returns (df, source).
+    """
+    if not (use_snapshot and HAS_PYARROW):
+        return pd.read_excel(excel_path, sheet_name=CUSTOMER360_SHEET, usecols=columns), "workbook"
+
+    snap_path = snapshot_path(excel_path)
+    if _snapshot_is_fresh(excel_path, snap_path):
+        try:
+            return pd.read_parquet(snap_path, columns=columns), "snapshot"
+        except Exception:
+            pass  # corrupt / partial snapshot: fall back to the workbook
+
+    # Stale snapshot: the rebuild needs every column once; later projections read Parquet
+    df = pd.read_excel(excel_path, sheet_name=CUSTOMER360_SHEET)
+    try:
+        write_snapshot(df, snap_path)
+    except Exception:
+        pass  # read-only directory etc. — the workbook frame is still good
+    return (df[columns] if columns is not None else df), "workbook"
+
+
+# ---------------------------
+# Shared cache + stats
+# ---------------------------
+# One entry per workbook path. Columns are cached individually so each caller
+# only materializes the projection it asks for:
+#   {"signature": (mtime_ns, size), "header": [names], "columns": {name: Series},
+#    "report": {name: memory-report row}}
+_CACHE: Dict[str, Dict] = {}
+# _LOCK guards the cache and stats and is never held while parsing; a
+# per-path lock makes concurrent misses on one workbook parse it once.
+_LOCK = threading.Lock()
+_LOAD_LOCKS: Dict[str, threading.Lock] = {}
+_STATS: Dict[str, float] = {
+    "hits": 0,
+    "misses": 0,
+    "reloads": 0,
+    "last_load_seconds": 0.0,
+    "total_load_seconds": 0.0,
+    "last_source": "",
+}
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """Return (mtime_ns, size) for a file; raises OSError if it does not exist."""
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+
+def customer360_version(path: str | None = None) -> str:
+    """Version tag for the workbook contents: changes whenever the file does."""
+    path = os.path.abspath(path or default_excel_path())
+    mtime_ns, size = _file_signature(path)
+    return f"workbook:{path}:{mtime_ns}:{size}"
+
+
+def load_customer360(
+    path: str | None = None, use_snapshot: bool = True, columns: List[str] | None = None
+) -> pd.DataFrame:
+    """
+    Return the Customer360 sheet projected to `columns` (all when None).
+    Each column is parsed at most once per (path, mtime, size) and shared
+    process-wide; columns nobody asked for are never read. Callers get a new
+    frame, so adding or dropping columns never leaks into the shared cache.
+    With use_snapshot, the Parquet sidecar is preferred over the workbook.
+    Cached columns are compacted (see compaction.COMPACT_SCHEMA); compacted
+    money/percent columns bring their "<col>__value" companion along.
+    """
+    path = os.path.abspath(path or default_excel_path())
+    signature = _file_signature(path)
+
+    with _LOCK:
+        entry = _current_entry(path, signature)
+        wanted, missing = _projection(entry, columns)
+        if missing == []:
+            _STATS["hits"] += 1
+            cached = dict(entry["columns"])
+    if missing == []:
+        return _assemble(cached, wanted)
+
+    # Parse outside _LOCK so other sessions (and other workbooks) are not blocked
+    with _load_lock(path):
+        with _LOCK:
+            entry = _current_entry(path, signature)
+            header = entry["header"]
+        if header is None:
+            header = _source_header(path, use_snapshot)
+            with _LOCK:
+                entry["header"] = header
+
+        with _LOCK:
+            # Another caller may have loaded these columns while we waited
+            wanted, missing = _projection(entry, columns)
+            if not missing:
+                _STATS["hits"] += 1
+                cached = dict(entry["columns"])
+        if not missing:
+            return _assemble(cached, wanted)
+
+        started = time.perf_counter()
+        raw, source = _read_source(path, use_snapshot, missing)
+        compacted = compact_customer360(raw)
+        report = memory_report(raw, compacted, include_total=False).to_dict("records")
+        del raw
+        elapsed = time.perf_counter() - started
+
+        with _LOCK:
+            for row in report:
+                entry["report"][row["column"]] = row
+            for col in compacted.columns:
+                entry["columns"][col] = compacted[col]
+            _STATS["misses"] += 1
+            _STATS["last_load_seconds"] = elapsed
+            _STATS["total_load_seconds"] += elapsed
+            _STATS["last_source"] = source
+            cached = dict(entry["columns"])
+    return _assemble(cached, wanted)
+
+
+def _load_lock(path: str) -> threading.Lock:
+    with _LOCK:
+        return _LOAD_LOCKS.setdefault(path, threading.Lock())
+
+
+def _current_entry(path: str, signature: Tuple[int, int]) -> Dict:
+    """Cache entry for the file as it is now, replacing a stale one (caller holds _LOCK)."""
+    entry = _CACHE.get(path)
+    if entry is None or entry["signature"] != signature:
+        if entry is not None:
+            _STATS["reloads"] += 1
+        entry = {"signature": signature, "header": None, "columns": {}, "report": {}}
+        _CACHE[path] = entry
+    return entry
+
+
+def _projection(entry: Dict, columns: List[str] | None) -> Tuple[List[str] | None, List[str] | None]:
+    """(wanted, missing) source columns; (None, None) while the header is unknown (caller holds _LOCK)."""
+    header = entry["header"]
+    if header is None:
+        return None, None
+    wanted = list(header) if columns is None else [c for c in columns if c in header]
+    return wanted, [c for c in wanted if c not in entry["columns"]]
+
+
+def _assemble(cached: Dict[str, pd.Series], wanted: List[str]) -> pd.DataFrame:
+    """Build a frame from cached columns (plus derived companions) in sheet order."""
+    data = {}
+    for col in wanted:
+        data[col] = cached[col]
+        derived = col + DERIVED_SUFFIX
+        if derived in cached:
+            data[derived] = cached[derived]
+    return pd.DataFrame(data)
+
+
+def cached_columns(path: str | None = None) -> List[str]:
+    """Source columns currently materialized for a workbook (for diagnostics)."""
+    path = os.path.abspath(path or default_excel_path())
+    with _LOCK:
+        entry = _CACHE.get(path)
+        if entry is None:
+            return []
+        return [c for c in (entry["header"] or []) if c in entry["columns"]]
+
+
+def loader_stats() -> Dict:
+    """Snapshot of loader counters plus the derived cache hit rate (0..1)."""
+    with _LOCK:
+        stats = dict(_STATS)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = (stats["hits"] / lookups) if lookups else 0.0
+    return stats
+
+
+def loader_memory_report(path: str | None = None) -> pd.DataFrame | None:
+    """Bytes per column before/after compaction for the columns loaded so far."""
+    path = os.path.abspath(path or default_excel_path())
+    with _LOCK:
+        entry = _CACHE.get(path)
+        if entry is None or not entry["report"]:
+            return None
+        rows = list(entry["report"].values())
+    return add_report_total(pd.DataFrame(rows))
+
+
+def clear_customer360_cache() -> None:
+    """Drop every cached frame (stats are kept)."""
+    with _LOCK:
+        _CACHE.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Customer360 Parquet snapshot.")
+    parser.add_argument("excel_path", nargs="?", default=None, help="workbook path (default: bundled demo data)")
+    parser.add_argument("--memory-report", action="store_true", help="print bytes per column before/after compaction")
+    args = parser.parse_args()
+    print(f"Snapshot written to {build_snapshot(args.excel_path)}")
+    if args.memory_report:
+        load_customer360(args.excel_path)
+        print(loader_memory_report(args.excel_path).to_string(index=False))
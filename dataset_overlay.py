@@ -0,0 +1,126 @@
+# dataset_overlay.py
+# Keyed incremental merge (upsert) of uploaded rows into the base Customer360 dataset
+
+from typing import Dict, List
+
+import pandas as pd
+
+from compaction import DERIVED_SUFFIX, compact_customer360, strip_derived_columns
+
+
+MERGE_KEY = "unique_id"
+
+
+def _as_text(s: pd.Series) -> pd.Series:
+    """
+    Comparable text form of a column (categoricals / Int16 / str alike).
+    Blank cells are None: CSV uploads read them as "" where the workbook has NaN.
+    """
+    return s.astype(object).where(s.notna(), None).map(lambda v: None if v is None else (str(v).strip() or None))
+
+
+# ---------------------------
+# Delta computation
+# ---------------------------
+def compute_overlay(base: pd.DataFrame, upload: pd.DataFrame, base_version: str, key: str = MERGE_KEY) -> Dict:
+    """
+    Hash-join `upload` against `base` on `key` and keep only what differs:
+
+      {"base_version", "base_rows",
+       "updates": {column: Series(new values, index = base row position)},
+       "inserts": DataFrame of rows whose key is not in base,
+       "counts": {"inserted", "updated", "unchanged"}}
+
+    Base columns missing from the upload are left untouched; upload-only
+    columns are ignored for updates (inserts keep the base column set).
+    """
+    if key not in base.columns or key not in upload.columns:
+        raise ValueError(f"Both datasets need a '{key}' column to merge.")
+
+    base = strip_derived_columns(base)
+    upload = strip_derived_columns(upload).drop_duplicates(subset=[key], keep="last")
+
+    base_keys = _as_text(base[key])
+    key_to_pos = pd.Series(range(len(base)), index=base_keys.values)
+    key_to_pos = key_to_pos[~key_to_pos.index.duplicated(keep="first")]
+
+    up_keys = _as_text(upload[key])
+    positions = up_keys.map(key_to_pos)
+    matched = positions.notna().to_numpy()
+
+    inserts = upload.loc[~matched, [c for c in base.columns if c in upload.columns]].reset_index(drop=True)
+
+    matched_up = upload.loc[matched]
+    matched_pos = positions[matched].astype(int).to_numpy()
+    updates: Dict[str, pd.Series] = {}
+    changed_rows = pd.Series(False, index=range(len(matched_pos)))
+    for col in base.columns:
+        if col == key or col not in upload.columns or not len(matched_pos):
+            continue
+        old = _as_text(base[col].iloc[matched_pos]).reset_index(drop=True)
+        new = _as_text(matched_up[col]).reset_index(drop=True)
+        diff = ~((old == new) | (old.isna() & new.isna()))
+        if diff.any():
+            # Cleared cells are written as missing, not as ""
+            values = matched_up[col].astype(object).to_numpy().copy()
+            values[new.isna().to_numpy()] = None
+            updates[col] = pd.Series(values[diff.to_numpy()], index=matched_pos[diff.to_numpy()])
+            changed_rows |= diff
+
+    updated = int(changed_rows.sum())
+    return {
+        "base_version": base_version,
+        "base_rows": len(base),
+        "updates": updates,
+        "inserts": inserts,
+        "counts": {
+            "inserted": len(inserts),
+            "updated": updated,
+            "unchanged": len(matched_pos) - updated,
+        },
+    }
+
+
+# ---------------------------
+# Applying the overlay
+# ---------------------------
+def apply_overlay(base: pd.DataFrame, overlay: Dict, columns: List[str] | None = None) -> pd.DataFrame:
+    """
+    Materialize base + overlay for the projected `columns` (None = base's).
+    Only columns that actually carry updates are copied; inserted rows are
+    appended after the base rows, so base positions stay valid.
+    """
+    if len(base) != overlay["base_rows"]:
+        raise ValueError("Overlay was computed against a different base dataset.")
+
+    out = base.copy(deep=False)
+    if columns is not None:
+        out = out[[c for c in out.columns if c in columns or c.removesuffix(DERIVED_SUFFIX) in columns]]
+
+    touched = [c for c in overlay["updates"] if c in out.columns]
+    for col in touched:
+        values = out[col].astype(object)
+        patch = overlay["updates"][col]
+        values.iloc[patch.index.to_numpy()] = patch.to_numpy()
+        out[col] = values
+    if touched:
+        # Re-derive categoricals and "<col>__value" companions for patched columns
+        recompacted = compact_customer360(out[touched])
+        for col in recompacted.columns:
+            out[col] = recompacted[col]
+
+    inserts = overlay["inserts"]
+    if len(inserts):
+        extra = compact_customer360(inserts[[c for c in inserts.columns if c in out.columns]])
+        categorical = [c for c in out.columns if isinstance(out[c].dtype, pd.CategoricalDtype)]
+        out = pd.concat([out, extra], ignore_index=True)
+        # concat of differing categoricals falls back to object; restore them
+        for col in categorical:
+            out[col] = out[col].astype("category")
+    return out
+
+
+def overlay_nbytes(overlay: Dict) -> int:
+    """Approximate memory held by an overlay (changed cells + inserted rows)."""
+    cells = sum(int(s.memory_usage(deep=True)) for s in overlay["updates"].values())
+    return cells + int(overlay["inserts"].memory_usage(deep=True).sum())
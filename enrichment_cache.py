@@ -0,0 +1,164 @@
+# enrichment_cache.py
+# Persistent SQLite cache of per-company, per-task enrichment outputs with per-task TTL
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+
+from company_index import normalize_company_name
+
+DAY = 24 * 60 * 60
+
+DEFAULT_CACHE_RELPATH = os.path.join("Files", "enrichment_cache.sqlite3")
+# Used for tasks that do not declare "cache_ttl_days" in TASKS
+DEFAULT_TTL_SECONDS = int(os.environ.get("C360_CACHE_DEFAULT_TTL_SECONDS", str(7 * DAY)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_results (
+    company_key  TEXT NOT NULL,
+    task         TEXT NOT NULL,
+    fingerprint  TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    created_at   REAL NOT NULL,
+    expires_at   REAL NOT NULL,
+    PRIMARY KEY (company_key, task, fingerprint)
+)
+"""
+
+
+def default_cache_path() -> str:
+    """Cache file next to the bundled workbook (overridable with C360_ENRICHMENT_CACHE)."""
+    return os.environ.get("C360_ENRICHMENT_CACHE") or os.path.join(os.getcwd(), DEFAULT_CACHE_RELPATH)
+
+
+def source_fingerprint(values: Iterable) -> str:
+    """Stable short hash of the source values a task result was built from."""
+    digest = hashlib.sha256()
+    for value in values:
+        digest.update(b"\x1f")
+        digest.update(("" if value is None else str(value)).encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()[:32]
+
+
+# ---------------------------
+# Cache
+# ---------------------------
+class EnrichmentCache:
+    """
+    (normalized company, task name, source fingerprint) -> JSON payload.
+    Safe to share between threads: every call opens its own short-lived
+    connection; hit/miss counters are process-local.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = os.path.abspath(path or default_cache_path())
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0}
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection: commits on success, always closes."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def get(self, company: str, task: str, fingerprint: str, record: bool = True) -> Dict | None:
+        """Cached payload, or None on a miss / an expired entry (record=False: not counted in stats)."""
+        company_key = normalize_company_name(company)
+        with self._connect() as conn:
+            found = conn.execute(
+                "SELECT payload, expires_at FROM task_results "
+                "WHERE company_key = ? AND task = ? AND fingerprint = ?",
+                (company_key, task, fingerprint),
+            ).fetchone()
+        if found is None:
+            if record:
+                self._count("misses")
+            return None
+        if found[1] < time.time():
+            if record:
+                self._count("expired")
+                self._count("misses")
+            return None
+        if record:
+            self._count("hits")
+        return json.loads(found[0])
+
+    def put(self, company: str, task: str, fingerprint: str, payload: Dict, ttl_seconds: float) -> None:
+        """Store a task output; older fingerprints of the same company/task are replaced."""
+        company_key = normalize_company_name(company)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM task_results WHERE company_key = ? AND task = ?", (company_key, task)
+            )
+            conn.execute(
+                "INSERT INTO task_results VALUES (?, ?, ?, ?, ?, ?)",
+                (company_key, task, fingerprint, json.dumps(payload), now, now + ttl_seconds),
+            )
+        self._count("writes")
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns how many were removed."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM task_results WHERE expires_at < ?", (time.time(),)).rowcount
+
+    def clear(self, company: str | None = None) -> None:
+        """Forget everything (or one company's results)."""
+        with self._connect() as conn:
+            if company is None:
+                conn.execute("DELETE FROM task_results")
+            else:
+                conn.execute(
+                    "DELETE FROM task_results WHERE company_key = ?", (normalize_company_name(company),)
+                )
+
+    def stats(self) -> Dict:
+        """Process-local counters plus the derived hit rate (0..1) and stored row count."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] / lookups) if lookups else 0.0
+        with self._connect() as conn:
+            stats["entries"] = conn.execute("SELECT COUNT(*) FROM task_results").fetchone()[0]
+        return stats
+
+    def tasks_for(self, company: str) -> List[str]:
+        """Task names with a live cached result for a company (for diagnostics)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT task FROM task_results WHERE company_key = ? AND expires_at >= ?",
+                (normalize_company_name(company), time.time()),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+
+_CACHES: Dict[str, EnrichmentCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_enrichment_cache(path: str | None = None) -> EnrichmentCache:
+    """Process-wide cache instance per database file."""
+    path = os.path.abspath(path or default_cache_path())
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = EnrichmentCache(path)
+            _CACHES[path] = cache
+        return cache
@@ -0,0 +1,228 @@
+# enrichment_providers.py
+# Pluggable data sources for the enrichment stages (TASKS) + shared pooled HTTP client
+
+import asyncio
+import os
+import re
+import threading
+import weakref
+from typing import Any, Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from async_http import AsyncHttpClient, AsyncHttpError
+
+# Shared HTTP client settings (all providers reuse one connection pool)
+HTTP_POOL_SIZE = int(os.environ.get("C360_HTTP_POOL_SIZE", "32"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("C360_HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("C360_HTTP_READ_TIMEOUT", "10"))
+HTTP_RETRIES = int(os.environ.get("C360_HTTP_RETRIES", "3"))
+HTTP_BACKOFF = float(os.environ.get("C360_HTTP_BACKOFF", "0.2"))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Idle keep-alive connections per host for the asyncio client: one per call
+# the engine may have in flight, so bursts do not reconnect
+ASYNC_HTTP_POOL_SIZE = int(os.environ.get("C360_ASYNC_HTTP_POOL_SIZE", "256"))
+
+# Per-provider limits applied by the asyncio engine (async_enrichment.py);
+# a rate of 0 means no token-bucket limit
+PROVIDER_CONCURRENCY = int(os.environ.get("C360_PROVIDER_CONCURRENCY", "64"))
+PROVIDER_RATE = float(os.environ.get("C360_PROVIDER_RATE", "0"))
+PROVIDER_BURST = int(os.environ.get("C360_PROVIDER_BURST", "0")) or PROVIDER_CONCURRENCY
+
+# Base URL used for every stage (e.g. a stand-in from provider_standins.py);
+# C360_PROVIDER_URL_<STAGE_SLUG> overrides it for one stage
+PROVIDER_URL = os.environ.get("C360_PROVIDER_URL", "")
+
+
+class ProviderError(Exception):
+    """A provider could not return data for a stage (after retries)."""
+
+
+def stage_slug(stage: str) -> str:
+    """'Website Extraction' -> 'website_extraction' (URL path / env var suffix)."""
+    return re.sub(r"[^a-z0-9]+", "_", stage.lower()).strip("_")
+
+
+# ---------------------------
+# Shared HTTP session
+# ---------------------------
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def build_http_session(pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES, backoff: float = HTTP_BACKOFF) -> requests.Session:
+    """Session with a keep-alive pool of `pool_size` connections per host and GET retries with backoff."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Process-wide pooled session shared by every HTTP provider."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = build_http_session()
+        return _SESSION
+
+
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """Pooled asyncio client for the running event loop (same settings as the requests session)."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = AsyncHttpClient(ASYNC_HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF, RETRY_STATUSES)
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+# ---------------------------
+# Providers
+# ---------------------------
+class EnrichmentProvider:
+    """
+    Source of the field values one enrichment stage reports. fetch() runs on
+    a worker thread and returns {column: value} for (a subset of) `cols`;
+    columns it leaves out keep their Customer360 value. `name` is part of
+    the task's cache fingerprint, so switching providers re-runs the stage.
+
+    afetch() is the asyncio variant used by the batch engine; by default it
+    runs fetch() on a worker thread. max_concurrency / rate_per_second /
+    burst are the limits the engine applies per provider (None / 0: none).
+    """
+
+    name = "provider"
+    max_concurrency: int | None = None
+    rate_per_second: float = 0.0
+    burst: int = 1
+
+    def fetch(self, stage: str, company: str, cols: List[str], row) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def afetch(self, stage: str, company: str, cols: List[str], row) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.fetch, stage, company, cols, row)
+
+
+class Customer360Provider(EnrichmentProvider):
+    """Default: the pre-filled Customer360 columns (no I/O)."""
+
+    name = "customer360"
+
+    def fetch(self, stage: str, company: str, cols: List[str], row) -> Dict[str, Any]:
+        return {c: row.get(c) for c in cols}
+
+    async def afetch(self, stage: str, company: str, cols: List[str], row) -> Dict[str, Any]:
+        return self.fetch(stage, company, cols, row)
+
+
+class HttpProvider(EnrichmentProvider):
+    """
+    GET {base_url}/v1/enrich/{stage_slug}?company=...&domain=... returning
+    {"fields": {column: value}}. A 404 means the source has nothing on the
+    company (empty result); other failures raise ProviderError once the
+    shared session's retries are used up.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session: requests.Session | None = None,
+        timeout: tuple | None = None,
+        max_concurrency: int = PROVIDER_CONCURRENCY,
+        rate_per_second: float = PROVIDER_RATE,
+        burst: int = PROVIDER_BURST,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.name = self.base_url
+        self._session = session
+        self.timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+
+    def _request(self, stage: str, company: str, row):
+        url = f"{self.base_url}/v1/enrich/{stage_slug(stage)}"
+        return url, {"company": company, "domain": str(row.get("Official Domain", "") or "")}
+
+    @staticmethod
+    def _fields(stage: str, url: str, status: int, payload, cols: List[str]) -> Dict[str, Any]:
+        if status == 404:
+            return {}
+        if status >= 400:
+            raise ProviderError(f"{stage}: HTTP {status} from {url}")
+        if not isinstance(payload, dict):
+            raise ProviderError(f"{stage}: invalid JSON from {url}")
+        fields = payload.get("fields", {})
+        return {c: fields[c] for c in cols if c in fields}
+
+    def fetch(self, stage: str, company: str, cols: List[str], row) -> Dict[str, Any]:
+        session = self._session or get_http_session()
+        url, params = self._request(stage, company, row)
+        try:
+            response = session.get(url, params=params, timeout=self.timeout)
+        except requests.RequestException as exc:
+            raise ProviderError(f"{stage}: {type(exc).__name__} calling {url}") from exc
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        return self._fields(stage, url, response.status_code, payload, cols)
+
+    async def afetch(self, stage: str, company: str, cols: List[str], row) -> Dict[str, Any]:
+        url, params = self._request(stage, company, row)
+        try:
+            status, payload = await get_async_http_client().get_json(url, params)
+        except AsyncHttpError as exc:
+            raise ProviderError(f"{stage}: {exc}") from exc
+        return self._fields(stage, url, status, payload, cols)
+
+
+# ---------------------------
+# Registry
+# ---------------------------
+_DEFAULT_PROVIDER = Customer360Provider()
+_PROVIDERS: Dict[str, EnrichmentProvider] = {}
+_PROVIDERS_LOCK = threading.Lock()
+
+
+def register_provider(stage: str, provider: EnrichmentProvider | None) -> None:
+    """Use `provider` for a stage (None restores the environment / default choice)."""
+    with _PROVIDERS_LOCK:
+        if provider is None:
+            _PROVIDERS.pop(stage, None)
+        else:
+            _PROVIDERS[stage] = provider
+
+
+def get_provider(stage: str) -> EnrichmentProvider:
+    """Registered provider, else an HttpProvider from the environment, else Customer360."""
+    with _PROVIDERS_LOCK:
+        provider = _PROVIDERS.get(stage)
+        if provider is not None:
+            return provider
+        url = os.environ.get(f"C360_PROVIDER_URL_{stage_slug(stage).upper()}") or PROVIDER_URL
+        if not url:
+            return _DEFAULT_PROVIDER
+        provider = HttpProvider(url)
+        _PROVIDERS[stage] = provider
+        return provider
+
+
+def provider_names(stages: List[str]) -> Dict[str, str]:
+    """stage -> provider name (for the sidebar / diagnostics)."""
+    return {stage: get_provider(stage).name for stage in stages}
@@ -10,6 +10,8 @@ from difflib import SequenceMatcher
 import time
 import textwrap
 
+from company_resolver import COMPANY_ALIASES, get_default_resolver
+
 
 
 # -----------------------------
@@ -1167,6 +1169,23 @@ A-Mark has officially transitioned to its new corporate identity, <b>Gold.com (N
 #  MAIN PAGE
 # ================================================================
 
+# Companies this page has content for (canonical Customer360 names)
+CONTENT_COMPANIES = ("Wolfspeed", "A-Mark")
+
+
+def resolve_insight_company(company_name: str) -> str:
+    """Canonical Customer360 company_name for the typed target ("" if unknown)."""
+    try:
+        return get_default_resolver().best_match(company_name) or ""
+    except Exception:
+        # Workbook unavailable: canonical names and registered aliases, any case
+        typed = company_name.strip().lower()
+        for canonical in CONTENT_COMPANIES:
+            if typed in {n.lower() for n in (canonical, *COMPANY_ALIASES.get(canonical, []))}:
+                return canonical
+        return company_name.strip()
+
+
 def insight_studio_page():
 
     # Load global CSS
@@ -1312,15 +1331,15 @@ def insight_studio_page():
     # --- Scouting Report ---
     
     if content_type == "Scouting Report":
-        company = company_name.lower().strip()
+        company = resolve_insight_company(company_name)
 
-        if company == "wolfspeed":
+        if company == "Wolfspeed":
             with st.spinner("⚙️ Generating Wolfspeed scouting report..."):
                 time.sleep(6)
             st.success("Showing scouting report for Wolfspeed")
             render_sales_report(WOLFSPEED_SCOUTING_REPORT)
 
-        elif company in ["a-mark", "amark", "a-mark precious metals", "a mark", "a mark precious metals"]:
+        elif company == "A-Mark":
             with st.spinner("⚙️ Generating A-Mark Precious Metals scouting report..."):
                 time.sleep(6)
             st.success("Showing scouting report for A-Mark Precious Metals")
@@ -1339,15 +1358,15 @@ def insight_studio_page():
    
     # --- Seller Pitch  ---
     if content_type == "Seller Pitch":
-        company = company_name.lower().strip()
+        company = resolve_insight_company(company_name)
 
-        if company in ["a-mark", "amark", "a-mark precious metals", "a mark", "a mark precious metals"]:
+        if company == "A-Mark":
             with st.spinner("⚙️ Building seller pitch for A-Mark Precious Metals..."):
                 time.sleep(6)
             st.success("Showing Seller Pitch for A-Mark Precious Metals")
             render_seller_pitch_amark()
 
-        elif company in ["wolfspeed"]:
+        elif company == "Wolfspeed":
             with st.spinner("⚙️ Building seller pitch for Wolfspeed..."):
                 time.sleep(6)
             st.success("Showing Seller Pitch for Wolfspeed")
@@ -1362,13 +1381,15 @@ def insight_studio_page():
 
     # --- Marketing Campaign / Marketing Email ---
     if content_type == "Personalized Email":
-        if company_name.lower() == "wolfspeed":
+        company = resolve_insight_company(company_name)
+
+        if company == "Wolfspeed":
             with st.spinner("⚙️ Generating personalized email for Wolfspeed..."):
                 time.sleep(6)
             st.success(f"Showing marketing email for Wolfspeed")
             render_marketing_email_wolfspeed()
         
-        elif company_name.lower() in ["a-mark", "amark", "a-mark precious metals", "a mark", "a mark precious metals"]:  # Changed if to elif
+        elif company == "A-Mark":
             with st.spinner("⚙️ Generating personalized email for A-Mark Precious Metals..."):
                 time.sleep(6)
             st.success("Showing marketing email for A-Mark Precious Metals")
@@ -0,0 +1,193 @@
+# job_runner.py
+# Process-local background job manager: pipeline runs outlive Streamlit reruns
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Set, Tuple
+
+# Interactive jobs (pipeline / lead runs) and long batch jobs get separate pools,
+# so a few batches over the whole dataset can never starve the interactive ones
+JOB_MAX_WORKERS = int(os.environ.get("C360_JOB_WORKERS", "4"))
+BATCH_JOB_MAX_WORKERS = int(os.environ.get("C360_BATCH_JOB_WORKERS", "2"))
+# Job kind -> worker count of its own pool; other kinds share the interactive pool
+JOB_KIND_WORKERS: Dict[str, int] = {"batch": BATCH_JOB_MAX_WORKERS}
+# Finished jobs stay attachable this long (seconds), and at most MAX_FINISHED_JOBS of them
+JOB_RETENTION_SECONDS = int(os.environ.get("C360_JOB_RETENTION_SECONDS", "3600"))
+MAX_FINISHED_JOBS = 200
+
+JOB_STATUSES = ("queued", "running", "finished", "cancelled", "failed")
+TERMINAL_STATUSES = ("finished", "cancelled", "failed")
+
+
+# ---------------------------
+# Job
+# ---------------------------
+class Job:
+    """
+    One background run. The body appends progress events with emit(); any
+    number of page runs can replay them from a cursor with events_since().
+    `cancel` is the cooperative cancellation token the body checks between steps.
+    `key` names what the job works on (e.g. its checkpoint run), if anything.
+    """
+
+    def __init__(self, kind: str, label: str = "", key: str | None = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label
+        self.key = key
+        self.status = "queued"
+        self.result = None
+        self.error: str | None = None
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self.cancel = threading.Event()
+        self._events: List[Dict] = []
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def emit(self, event_type: str, **payload) -> None:
+        """Append a progress event (called from the job's worker thread)."""
+        with self._cond:
+            self._events.append({"type": event_type, **payload})
+            self._cond.notify_all()
+
+    def events_since(self, cursor: int = 0, timeout: float = 0.0) -> Tuple[List[Dict], int]:
+        """
+        Events after position `cursor` and the new cursor. Waits up to
+        `timeout` seconds for something new while the job is still running.
+        """
+        with self._cond:
+            if timeout and cursor >= len(self._events) and not self.done:
+                self._cond.wait(timeout)
+            return self._events[cursor:], len(self._events)
+
+    def _set_status(self, status: str) -> None:
+        with self._cond:
+            self.status = status
+            if status in TERMINAL_STATUSES:
+                self.finished_at = time.time()
+            self._cond.notify_all()
+
+
+# ---------------------------
+# Manager
+# ---------------------------
+class JobManager:
+    """
+    Runs job bodies on thread pools and keeps them addressable by id. Kinds in
+    `kind_workers` get a pool of their own; every other kind shares the main one.
+    """
+
+    def __init__(self, max_workers: int = JOB_MAX_WORKERS, kind_workers: Dict[str, int] | None = None):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="c360-job")
+        self._kind_pools = {
+            kind: ThreadPoolExecutor(max_workers=max(1, n), thread_name_prefix=f"c360-job-{kind}")
+            for kind, n in (JOB_KIND_WORKERS if kind_workers is None else kind_workers).items()
+        }
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, kind: str, fn: Callable[..., object], *args, label: str = "", key: str | None = None, **kwargs
+    ) -> Job:
+        """
+        Run fn(job, *args, **kwargs) in the background; its return value becomes
+        job.result. A job whose cancel token is set when fn returns (or that
+        raises after cancellation) ends as "cancelled".
+        """
+        job = Job(kind, label, key)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+
+        def run() -> None:
+            if job.cancel.is_set():
+                job._set_status("cancelled")
+                return
+            job._set_status("running")
+            try:
+                job.result = fn(job, *args, **kwargs)
+            except Exception as e:
+                job.error = str(e)
+                job._set_status("cancelled" if job.cancel.is_set() else "failed")
+            else:
+                job._set_status("cancelled" if job.cancel.is_set() else "finished")
+
+        self._pool_for(kind).submit(run)
+        return job
+
+    def _pool_for(self, kind: str) -> ThreadPoolExecutor:
+        return self._kind_pools.get(kind, self._pool)
+
+    def get(self, job_id: str | None) -> Job | None:
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str | None) -> bool:
+        """Request cancellation; True if the job exists and was still active."""
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel.set()
+        return True
+
+    def jobs(self, kind: str | None = None) -> List[Job]:
+        with self._lock:
+            return [j for j in self._jobs.values() if kind is None or j.kind == kind]
+
+    def active_keys(self, kind: str | None = None) -> Set[str]:
+        """Keys of queued / running jobs (e.g. checkpoint runs some session is executing)."""
+        with self._lock:
+            return {
+                j.key for j in self._jobs.values()
+                if j.key is not None and not j.done and (kind is None or j.kind == kind)
+            }
+
+    def queued_ahead(self, job: Job) -> int:
+        """How many queued jobs on the same pool were submitted before `job`."""
+        pool = self._pool_for(job.kind)
+        with self._lock:
+            return sum(
+                1 for j in self._jobs.values()
+                if j.status == "queued" and j.created_at < job.created_at and self._pool_for(j.kind) is pool
+            )
+
+    def _prune(self) -> None:
+        """Forget finished jobs past retention (caller holds the lock)."""
+        now = time.time()
+        finished = sorted(
+            (j for j in self._jobs.values() if j.done), key=lambda j: j.finished_at or 0.0
+        )
+        expired = [j for j in finished if now - (j.finished_at or now) > JOB_RETENTION_SECONDS]
+        expired += finished[len(expired):max(len(expired), len(finished) - MAX_FINISHED_JOBS)]
+        for job in expired:
+            self._jobs.pop(job.id, None)
+
+
+def queue_notice(job: Job) -> str:
+    """What a follow view shows while `job` waits for a worker ("" once it has one)."""
+    if job.status != "queued":
+        return ""
+    ahead = get_job_manager().queued_ahead(job)
+    return "⏳ Queued — waiting for a free worker" + (f" ({ahead} earlier job(s) ahead)." if ahead else ".")
+
+
+_MANAGER: JobManager | None = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """The process-wide job manager (shared by every session)."""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = JobManager()
+        return _MANAGER
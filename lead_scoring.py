@@ -5,6 +5,10 @@ import html
 import time
 from typing import List, Dict
 
+from job_runner import get_job_manager, queue_notice
+from log_stream import DEFAULT_MAX_HZ, LOG_STREAM_CSS, LogStream, log_line_html
+from tracing import get_tracer
+
 # -------------------------------------------------------------------
 # Global CSS Injection (aligned with data_engineer style)
 # -------------------------------------------------------------------
@@ -275,6 +279,9 @@ LEAD_TASKS: List[Dict] = [
 
 SIMULATE_TIME_PER_STEP = 0.6  # seconds per log line
 
+# Customer360 columns this page reads (data_engineer projects the frame to these)
+LEAD_SCORING_COLUMNS: List[str] = ["unique_id", "company_name", "lead_priority_label"]
+
 # -------------------------------------------------------------------
 # Agentic steps for each task (logs)
 # -------------------------------------------------------------------
@@ -614,9 +621,276 @@ def _format_prioritization_table_html(df: pd.DataFrame) -> str:
 # -------------------------------------------------------------------
 # Main page
 # -------------------------------------------------------------------
+# -------------------------------------------------------------------
+# Background run (job body + script-thread rendering)
+# -------------------------------------------------------------------
+def _build_task_output_html(key: str, ctx_text: str) -> str:
+    """Cached expander HTML for a finished lead-scoring task."""
+    if key == "business_context":
+        return _business_context_html_from_text(ctx_text)
+    if key == "category_weights":
+        return _format_weights_to_html()
+    if key == "prioritization_table":
+        # The summary header HTML + the main table HTML, combined for caching
+        return _format_prioritization_html_summary() + _format_prioritization_table_html(
+            st.session_state["lead_prioritization_df"]
+        )
+    return "<div class='output-box'>(no output)</div>"
+
+
+def run_lead_scoring_job(job, row_count: int, lead_list_label: str, ctx_text: str) -> Dict | None:
+    """
+    Job body for one lead-scoring run (no Streamlit calls). Emits
+    "step1_line", "task_started", "task_line", "task_done" and
+    "task_interrupted" events; returns None if cancelled.
+    """
+    # --- STEP 1 global log (uses mock df metrics) ---
+    unique_ids = row_count  # simple = number of rows
+    step1_steps = [
+        {
+            "cls": "title",
+            "text": "STEP 1 — Lead Scoring Phase",
+        },
+        {
+            "cls": "info",
+            "text": f"Initializing Lead Scoring Super Agent to prioritize leads for \"{lead_list_label}\"…",
+        },
+        {
+            "cls": "info",
+            "text": "📥 Reading Customer 360° signals in-memory…",
+        },
+        {
+            "cls": "info",
+            "text": f"🔍 Extracted {unique_ids} unique account IDs.",
+        },
+        {
+            "cls": "info",
+            "text": "🚀 Invoking Prioritization Super Agent...",
+        },
+
+        {
+            "cls": "info",
+            "text": f"✓ C360 data loaded: {row_count} companies.",
+        },
+        {
+            "cls": "success",
+            "text": "✓ Passing enriched dataset to Business Context Analyzer Agent…",
+        },
+    ]
+
+    tracer = get_tracer()
+    for step in step1_steps:
+        if job.cancel.is_set():
+            return None
+        with tracer.span("step", "Lead Scoring Phase", run_id=job.id):
+            job.emit("step1_line", cls=step.get("cls", "info"), text=step.get("text", ""))
+            job.cancel.wait(SIMULATE_TIME_PER_STEP)
+
+    # --- normal pipeline ---
+    for idx, task in enumerate(LEAD_TASKS):
+        if job.cancel.is_set():
+            return None
+
+        key = task["key"]
+        job.emit("task_started", key=key, idx=idx)
+        # Recorded only when the task completes (interrupted tasks would skew it)
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+
+        # --- Agentic log streaming + per-task progress ---
+        agent_steps = get_lead_scoring_steps(key)
+        total_lines = len(agent_steps)
+        for s_idx, step in enumerate(agent_steps, start=1):
+            if job.cancel.is_set():
+                job.emit("task_interrupted", key=key, idx=idx)
+                return None
+            with tracer.span("step", task["name"], run_id=job.id):
+                job.emit(
+                    "task_line",
+                    key=key,
+                    cls=step.get("cls", "info"),
+                    text=step.get("text", ""),
+                    pct=int((s_idx / max(total_lines, 1)) * 100),
+                )
+                job.cancel.wait(SIMULATE_TIME_PER_STEP)
+
+        if job.cancel.is_set():
+            job.emit("task_interrupted", key=key, idx=idx)
+            return None
+        tracer.record("task", task["name"], (time.perf_counter() - wall0) * 1000, (time.thread_time() - cpu0) * 1000, job.id)
+        job.emit("task_done", key=key, idx=idx, ctx_text=ctx_text)
+
+    return {"tasks": len(LEAD_TASKS)}
+
+
+def _task_header_html(name: str, color: str, label: str, label_color: str) -> str:
+    return (
+        f"<div class='task-card-header'><div class='task-name'>"
+        f"{html.escape(name)} "
+        f"{status_dot(color, 12)}"
+        f"<span style='color:{label_color};'>— {label}</span></div></div>"
+    )
+
+
+def _executing_progress_html(pct: int) -> str:
+    return (
+        f"<div style='width:100%'>"
+        f"<div style='margin-bottom:6px; font-weight:600; font-size: 13px; color: #333;'>"
+        f"Executing... {pct}%"
+        f"</div>"
+        f"<progress value='{pct}' max='100' class='progress-inline'></progress>"
+        f"</div>"
+    )
+
+
+def _end_lead_stream(name: str, streams: Dict[str, LogStream], lines: Dict[str, List[str]]) -> None:
+    """Flush a stream's buffered lines and keep the full log HTML for reruns."""
+    stream = streams.pop(name, None)
+    if stream is not None:
+        stream.flush(force=True)
+    if name == "step1":
+        st.session_state["lead_step1_log_html"] = (
+            f"<div class='agent-log-box' style='margin-top: 15px;'>{''.join(lines[name])}</div>"
+        )
+    else:
+        st.session_state[f"lead_log_html_{name}"] = f"<div class='agent-log-box'>{''.join(lines.get(name, []))}</div>"
+
+
+def _follow_lead_job(job, step1_log_ph, overall_progress_ph) -> None:
+    """
+    Replay a lead-scoring job's events, then stream it live until it ends.
+    Logs are sent incrementally through LogStream (new lines only, frame-rate
+    limited); the full HTML is kept in session_state once a log is complete.
+    """
+    names = {t["key"]: t["name"] for t in LEAD_TASKS}
+    total = len(LEAD_TASKS)
+    run_id = st.session_state.lead_run_id
+    streams: Dict[str, LogStream] = {}
+    lines: Dict[str, List[str]] = {"step1": []}
+    overall_progress_ph.progress(0, text="Overall Pipeline Progress")
+    tracer = get_tracer()
+    queued_ph, queued_text = st.empty(), ""
+
+    cursor = 0
+    while True:
+        done = job.done
+        # Say so while the job waits for a worker, so the page doesn't look hung
+        text = queue_notice(job)
+        if text != queued_text:
+            if text:
+                queued_ph.info(text)
+            else:
+                queued_ph.empty()
+            queued_text = text
+        events, cursor = job.events_since(cursor, timeout=1.0 / DEFAULT_MAX_HZ)
+        for event in events:
+            with tracer.span("render", f"lead {event['type']}", run_id=job.id):
+                if event["type"] == "step1_line":
+                    if "step1" not in streams:
+                        streams["step1"] = LogStream(step1_log_ph, "lead-step1")
+                    lines["step1"].append(log_line_html(event["cls"], event["text"]))
+                    streams["step1"].append(event["cls"], event["text"])
+                    continue
+                # STEP 1 is over once the first task starts
+                if "step1" in streams:
+                    _end_lead_stream("step1", streams, lines)
+
+                key = event["key"]
+                ph = st.session_state.lead_placeholders.get(key, {})
+                header_ph = ph.get("header_ph")
+                log_ph = ph.get("log_ph")
+                results_ph = ph.get("results_ph")
+                progress_ph = ph.get("progress_ph")
+
+                if event["type"] == "task_started":
+                    # header -> running
+                    lines[key] = []
+                    if log_ph is not None:
+                        streams[key] = LogStream(
+                            log_ph, f"lead-{key}", progress_placeholder=progress_ph, progress_html=_executing_progress_html
+                        )
+                    if header_ph is not None:
+                        header_ph.markdown(_task_header_html(names[key], "#f0c040", "Running", "#888"), unsafe_allow_html=True)
+
+                elif event["type"] == "task_line":
+                    lines[key].append(log_line_html(event["cls"], event["text"]))
+                    if key in streams:
+                        streams[key].append(event["cls"], event["text"], pct=event["pct"])
+
+                elif event["type"] == "task_interrupted":
+                    _end_lead_stream(key, streams, lines)
+                    if progress_ph is not None:
+                        progress_ph.markdown(
+                            "<div style='padding:8px;'><strong>Task interrupted by user.</strong></div>",
+                            unsafe_allow_html=True,
+                        )
+                    if header_ph is not None:
+                        header_ph.markdown(_task_header_html(names[key], "#999999", "Interrupted", "#999"), unsafe_allow_html=True)
+
+                elif event["type"] == "task_done":
+                    _end_lead_stream(key, streams, lines)
+                    # cache & render
+                    out_html = _build_task_output_html(key, event["ctx_text"])
+                    st.session_state.lead_cached[key] = out_html
+
+                    if header_ph is not None:
+                        header_ph.markdown(_task_header_html(names[key], "#2db24a", "Done", "#2db24a"), unsafe_allow_html=True)
+                    if progress_ph is not None:
+                        progress_ph.empty()
+
+                    if results_ph is not None:
+                        with results_ph.container():
+                            # Handle prioritization_table output rendering (header and table/download separately)
+                            if key == "prioritization_table" and "lead_prioritization_df" in st.session_state:
+
+                                # 1. Render Summary Header
+                                st.markdown(_format_prioritization_html_summary(), unsafe_allow_html=True)
+
+                                # 2. Render Custom Table HTML
+                                display_df = st.session_state["lead_prioritization_df"]
+                                st.markdown(_format_prioritization_table_html(display_df), unsafe_allow_html=True)
+
+                                # 3. Render Download Button
+                                csv = display_df.to_csv(index=False).encode("utf-8")
+                                st.download_button(
+                                    "Download Prioritization CSV",
+                                    data=csv,
+                                    file_name=f"prioritization_run{run_id}.csv",
+                                    mime="text/csv",
+                                    key=f"lead_download_{key}_{run_id}",
+                                )
+                            else:
+                                # Render other outputs (Business Context, Weights) directly from cached HTML
+                                st.markdown(out_html, unsafe_allow_html=True)
+
+                    overall_progress_ph.progress(
+                        int(((event["idx"] + 1) / total) * 100),
+                        text="Overall Pipeline Progress",
+                    )
+        # Lines held back by the frame limit go out once their frame is due
+        for stream in streams.values():
+            stream.flush()
+        if done:
+            break
+
+    # Cancelled during STEP 1 (or between tasks): send what is buffered
+    for name in list(streams):
+        _end_lead_stream(name, streams, lines)
+
+    overall_progress_ph.empty()
+    st.session_state["lead_job_consumed"] = job.id
+    if job.status == "cancelled":
+        st.session_state.lead_stop_requested = True
+        st.warning("Lead scoring pipeline stopped by user.")
+    elif job.status == "failed":
+        st.error(f"Lead scoring run failed: {job.error}")
+    else:
+        st.success("Lead scoring & prioritization run finished.")
+
+
 def lead_scoring_page(df=None):
     # --- CSS ---
     st.markdown(_get_global_css(), unsafe_allow_html=True)
+    st.markdown(f"<style>{LOG_STREAM_CSS}</style>", unsafe_allow_html=True)
 
     # --- ALWAYS use mock DataFrame (ignore df passed from data_engineer) ---
     mock_data = {
@@ -825,204 +1099,34 @@ def lead_scoring_page(df=None):
     overall_progress_ph = st.empty()
 
     # -------------------- active run --------------------
+    manager = get_job_manager()
+    if stop_clicked:
+        # Cooperative cancel: the job stops before its next log line
+        manager.cancel(st.session_state.get("lead_job_id") or st.query_params.get("lead_job"))
+
     if run_clicked:
         st.session_state.lead_stop_requested = False
         st.session_state.lead_run_id += 1
-        run_id = st.session_state.lead_run_id
 
         # reset cache
         st.session_state.lead_cached = {}
-
-        # --- STEP 1 global log (uses mock df metrics) ---
-        row_count = len(df_for_status.index)
-        metadata_fields = len(df_for_status.columns)
-        unique_ids = row_count  # simple = number of rows
-        lead_list_label = st.session_state.get("lead_list_name", "Selected Lead List")
-
-        step1_steps = [
-            {
-                "cls": "title",
-                "text": "STEP 1 — Lead Scoring Phase",
-            },
-            {
-                "cls": "info",
-                "text": f"Initializing Lead Scoring Super Agent to prioritize leads for \"{lead_list_label}\"…",
-            },
-            {
-                "cls": "info",
-                "text": "📥 Reading Customer 360° signals in-memory…",
-            },
-            {
-                "cls": "info",
-                "text": f"🔍 Extracted {unique_ids} unique account IDs.",
-            },
-            {
-                "cls": "info",
-                "text": "🚀 Invoking Prioritization Super Agent...",
-            },
-
-            {
-                "cls": "info",
-                "text": f"✓ C360 data loaded: {row_count} companies.",
-            },
-            {
-                "cls": "success",
-                "text": "✓ Passing enriched dataset to Business Context Analyzer Agent…",
-            },
-        ]
-
-        log_html = "<div class='agent-log-box' style='margin-top: 15px;'>"
-
-        for step in step1_steps:
-            if st.session_state.lead_stop_requested:
-                break
-
-            cls = step.get("cls", "info")
-            text = html.escape(step.get("text", ""))
-            log_html += f"<div class='agent-log-line {cls}'>{text}</div>"
-
-            box_html = log_html + "</div>"
-            step1_log_ph.markdown(box_html, unsafe_allow_html=True)
-            st.session_state["lead_step1_log_html"] = box_html
-
-            time.sleep(SIMULATE_TIME_PER_STEP)
-
-
-        # --- normal pipeline ---
-        total = len(LEAD_TASKS)
-        overall_progress_ph.progress(0, text="Overall Pipeline Progress")
-
-
-        for idx, task in enumerate(LEAD_TASKS):
-            if st.session_state.lead_stop_requested:
-                st.warning("Lead scoring pipeline stopped by user.")
-                break
-
-            key = task["key"]
-            ph = st.session_state.lead_placeholders.get(key, {})
-            header_ph = ph.get("header_ph")
-            log_ph = ph.get("log_ph")
-            results_ph = ph.get("results_ph")
-            progress_ph = ph.get("progress_ph")
-
-            # header -> running
-            if header_ph is not None:
-                header_ph.markdown(
-                    f"<div class='task-card-header'><div class='task-name'>"
-                    f"{html.escape(task['name'])} "
-                    f"{status_dot('#f0c040', 12)}"
-                    f"<span style='color:#888;'>— Running</span></div></div>",
-                    unsafe_allow_html=True,
-                )
-
-            # --- Agentic log streaming + per-task progress ---
-            agent_steps = get_lead_scoring_steps(key)
-            log_html = ""
-            total_lines = len(agent_steps)
-
-            for s_idx, step in enumerate(agent_steps, start=1):
-                if st.session_state.lead_stop_requested:
-                    break
-
-                cls = step.get("cls", "info")
-                text = html.escape(step.get("text", ""))
-                log_html += f"<div class='agent-log-line {cls}'>{text}</div>"
-
-                box_html = f"<div class='agent-log-box'>{log_html}</div>"
-                log_ph.markdown(box_html, unsafe_allow_html=True)
-                st.session_state[f"lead_log_html_{key}"] = box_html
-
-                pct = int((s_idx / max(total_lines, 1)) * 100)
-                if progress_ph is not None:
-                    progress_ph.markdown(
-                        f"<div style='width:100%'>"
-                        f"<div style='margin-bottom:6px; font-weight:600; font-size: 13px; color: #333;'>"
-                        f"Executing... {pct}%"
-                        f"</div>"
-                        f"<progress value='{pct}' max='100' class='progress-inline'></progress>"
-                        f"</div>",
-                        unsafe_allow_html=True,
-                    )
-
-                time.sleep(SIMULATE_TIME_PER_STEP)
-
-            if st.session_state.lead_stop_requested:
-                if progress_ph is not None:
-                    progress_ph.markdown(
-                        "<div style='padding:8px;'><strong>Task interrupted by user.</strong></div>",
-                        unsafe_allow_html=True,
-                    )
-                if header_ph is not None:
-                    header_ph.markdown(
-                        f"<div class='task-card-header'><div class='task-name'>"
-                        f"{html.escape(task['name'])} "
-                        f"{status_dot('#999999', 12)}"
-                        f"<span style='color:#999;'>— Interrupted</span></div></div>",
-                        unsafe_allow_html=True,
-                    )
-                break
-
-            # build outputs
-            if key == "business_context":
-                out_html = _business_context_html_from_text(st.session_state.lead_ctx_text)
-            elif key == "category_weights":
-                out_html = _format_weights_to_html()
-            elif key == "prioritization_table":
-                # The summary header HTML
-                header_html = _format_prioritization_html_summary()
-                # The main table HTML
-                table_html = _format_prioritization_table_html(st.session_state["lead_prioritization_df"])
-                # Combine them
-                out_html = header_html + table_html # Combine them for caching
-            else:
-                out_html = "<div class='output-box'>(no output)</div>"
-
-            # cache & render
-            st.session_state.lead_cached[key] = out_html
-
-            if header_ph is not None:
-                header_ph.markdown(
-                    f"<div class='task-card-header'><div class='task-name'>"
-                    f"{html.escape(task['name'])} "
-                    f"{status_dot('#2db24a', 12)}"
-                    f"<span style='color:#2db24a;'>— Done</span></div></div>",
-                    unsafe_allow_html=True,
-                )
-
-            if progress_ph is not None:
-                progress_ph.empty()
-
-            if results_ph is not None:
-                with results_ph.container():
-                    # Handle prioritization_table output rendering (header and table/download separately)
-                    if key == "prioritization_table" and "lead_prioritization_df" in st.session_state:
-                        
-                        # 1. Render Summary Header
-                        header_html = _format_prioritization_html_summary()
-                        st.markdown(header_html, unsafe_allow_html=True)
-
-                        # 2. Render Custom Table HTML
-                        display_df = st.session_state["lead_prioritization_df"]
-                        st.markdown(_format_prioritization_table_html(display_df), unsafe_allow_html=True)
-                        
-                        # 3. Render Download Button
-                        csv = display_df.to_csv(index=False).encode("utf-8")
-                        st.download_button(
-                            "Download Prioritization CSV",
-                            data=csv,
-                            file_name=f"prioritization_run{run_id}.csv",
-                            mime="text/csv",
-                            key=f"lead_download_{key}_{run_id}",
-                        )
-                    else:
-                        # Render other outputs (Business Context, Weights) directly from cached HTML
-                        st.markdown(out_html, unsafe_allow_html=True)
-
-            overall_progress_ph.progress(
-                int(((idx + 1) / total) * 100),
-                text="Overall Pipeline Progress",
-            )
-
-        overall_progress_ph.empty()
-        if not st.session_state.lead_stop_requested:
-            st.success("Lead scoring & prioritization run finished.")
\ No newline at end of file
+        st.session_state.pop("lead_step1_log_html", None)
+
+        # Inputs are captured now: the job runs off the script thread
+        manager.cancel(st.session_state.get("lead_job_id"))
+        job = manager.submit(
+            "lead_scoring",
+            run_lead_scoring_job,
+            len(df_for_status.index),
+            st.session_state.get("lead_list_name", "Selected Lead List"),
+            st.session_state.lead_ctx_text,
+            label=lead_list_name,
+        )
+        st.session_state["lead_job_id"] = job.id
+        st.query_params["lead_job"] = job.id
+
+    # Re-attach to a running (or not yet displayed) job after reruns / reconnects
+    lead_job = manager.get(st.session_state.get("lead_job_id") or st.query_params.get("lead_job"))
+    if lead_job is not None and st.session_state.get("lead_job_consumed") != lead_job.id:
+        st.session_state["lead_job_id"] = lead_job.id
+        _follow_lead_job(lead_job, step1_log_ph, overall_progress_ph)
@@ -0,0 +1,90 @@
+# log_exports.py
+# Downloads built only when clicked: consolidated run logs, CSV exports, zipped batch logs, run timings
+
+import io
+import json
+import re
+import tempfile
+import zipfile
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from run_log_store import RunLogStore
+from tracing import Tracer
+
+LOG_SEPARATOR = "\n\n"
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(text).lower()).strip("_") or "company"
+
+
+def iter_consolidated_log(store: RunLogStore, run_id: str) -> Iterator[str]:
+    """A run's detailed task logs in task order, separated by a blank line."""
+    for n, text in enumerate(store.detailed_logs(run_id)):
+        yield (LOG_SEPARATOR if n else "") + text
+
+
+def consolidated_log(store: RunLogStore, run_id: str) -> Callable[[], bytes]:
+    """Deferred st.download_button data for one run's consolidated log."""
+    return lambda: "".join(iter_consolidated_log(store, run_id)).encode("utf-8")
+
+
+def csv_export(build_frame: Callable[[], pd.DataFrame]) -> Callable[[], bytes]:
+    """Deferred st.download_button data: the DataFrame is only built (and encoded) on click."""
+    return lambda: build_frame().to_csv(index=False).encode("utf-8")
+
+
+def write_log_archive(store: RunLogStore, run_id: str, fileobj) -> int:
+    """
+    Stream a run's detailed logs into a zip (one entry per company and task,
+    <company>/<NN>_<task>.log) in a single pass over the store, so a large
+    batch never sits whole in memory. Returns the number of entries.
+    """
+    entries = 0
+    seen = set()
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for record in store.records(run_id, "detailed"):
+            name = f"{_slug(record['company'])}/{record['task_index'] + 1:02d}_{_slug(record['task'])}.log"
+            if name in seen:
+                # Same company name on several rows (or a task re-run on resume)
+                name = f"{name[:-4]}_{entries}.log"
+            seen.add(name)
+            with archive.open(name, "w") as entry:
+                entry.write(record["text"].encode("utf-8"))
+            entries += 1
+    return entries
+
+
+def log_archive(store: RunLogStore, run_id: str) -> Callable[[], io.RawIOBase]:
+    """
+    Deferred st.download_button data: the run's zipped logs, built in an
+    anonymous temp file and handed over as that (unbuffered) file, so the
+    only in-memory copy is the one Streamlit serves.
+    """
+
+    def build() -> io.RawIOBase:
+        archive = tempfile.TemporaryFile(buffering=0)
+        try:
+            write_log_archive(store, run_id, archive)
+        except Exception:
+            archive.close()
+            raise
+        archive.seek(0)
+        return archive
+
+    return build
+
+
+def timings_json(tracer: Tracer, run_id: str, **meta) -> Callable[[], bytes]:
+    """Deferred st.download_button data: a run's per-stage p50/p95/p99 and its raw spans."""
+
+    def build() -> bytes:
+        return json.dumps(
+            {"run_id": run_id, **meta, "summary": tracer.summary(run_id), "spans": tracer.spans(run_id)},
+            indent=2,
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+    return build
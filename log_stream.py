@@ -0,0 +1,202 @@
+# log_stream.py
+# Append-only, frame-rate-limited agent log view for Streamlit placeholders
+
+import html
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+# Coalesce appended lines into at most this many UI updates per second
+DEFAULT_MAX_HZ = 10.0
+# Lines kept on screen; older ones drop out when the view is rebuilt
+DEFAULT_WINDOW = 200
+# Scrollback box height (px); the box auto-scrolls to the newest line
+DEFAULT_HEIGHT = 260
+
+# Rendered log boxes of completed tasks kept for reruns (process-wide LRU)
+RENDER_CACHE_ENTRIES = int(os.environ.get("C360_LOG_RENDER_CACHE_ENTRIES", "1024"))
+
+# Keyed containers get the CSS class "st-key-<key>"; pages style this prefix
+# like .agent-log-box (see LOG_STREAM_CSS)
+KEY_PREFIX = "agentlog-"
+
+LOG_STREAM_CSS = f"""
+div[class*="st-key-{KEY_PREFIX}"] {{
+    background: #faf4ff;
+    border-radius: 8px;
+    border: 1px dashed #d7c6ff;
+    padding: 10px 12px;
+    font-size: 13px;
+    color: #3b2a6f;
+    margin-bottom: 10px;
+    gap: 0;
+}}
+"""
+
+
+def log_line_html(cls: str, text: str) -> str:
+    return f"<div class='agent-log-line {cls}'>{html.escape(text)}</div>"
+
+
+def log_box_html(lines: Iterable[Tuple[str, str]]) -> str:
+    """Static log box (every line) for a task that is no longer streaming."""
+    return f"<div class='agent-log-box'>{''.join(log_line_html(cls, text) for cls, text in lines)}</div>"
+
+
+class LogStream:
+    """
+    Streams log lines into `placeholder` without re-sending what is already
+    on screen: each frame appends one markdown element holding only the new
+    lines to a scrollable container. Frames are limited to `max_hz`;
+    call flush(force=True) at the end of a task. Once more than
+    2 x `window` lines are on screen the container is rebuilt with the last
+    `window` lines, so both the DOM and every frame stay bounded.
+
+    `placeholder` only needs .container(...) returning something with
+    .markdown(...), which keeps the class usable outside a script run.
+    """
+
+    def __init__(
+        self,
+        placeholder,
+        name: str,
+        progress_placeholder=None,
+        progress_html: Callable[[int], str] | None = None,
+        max_hz: float = DEFAULT_MAX_HZ,
+        window: int = DEFAULT_WINDOW,
+        height: int = DEFAULT_HEIGHT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._placeholder = placeholder
+        self._name = name
+        self._progress_placeholder = progress_placeholder
+        self._progress_html = progress_html
+        self._min_interval = 1.0 / max_hz if max_hz > 0 else 0.0
+        self._window = window
+        self._height = height
+        self._clock = clock
+
+        self._lines: List[str] = []          # every line's HTML (server side only)
+        self._pending: List[str] = []        # appended but not yet sent
+        self._container = None
+        self._on_screen = 0
+        self._rebuilds = 0
+        self._last_frame = float("-inf")
+        self._pct: int | None = None
+        self._sent_pct: int | None = None
+
+        self.frames = 0
+        self.bytes_sent = 0
+
+    def append(self, cls: str, text: str, pct: int | None = None) -> None:
+        line = log_line_html(cls, text)
+        self._lines.append(line)
+        self._pending.append(line)
+        if pct is not None:
+            self._pct = pct
+        self.flush()
+
+    def extend(self, lines: List[Tuple[str, str]]) -> None:
+        """Append several (cls, text) lines as one frame (e.g. a rerun restoring a log)."""
+        for cls, text in lines:
+            line = log_line_html(cls, text)
+            self._lines.append(line)
+            self._pending.append(line)
+        self.flush(force=True)
+
+    def box_html(self) -> str:
+        """Every line streamed so far as a static log box (see log_box_html)."""
+        return f"<div class='agent-log-box'>{''.join(self._lines)}</div>"
+
+    def flush(self, force: bool = False) -> None:
+        """Send pending lines / progress if a frame is due (or `force`)."""
+        if not self._pending and self._pct == self._sent_pct:
+            return
+        now = self._clock()
+        if not force and now - self._last_frame < self._min_interval:
+            return
+        self._last_frame = now
+        self.frames += 1
+
+        if self._pending:
+            if self._container is None or self._on_screen + len(self._pending) > 2 * self._window:
+                self._rebuild()
+            else:
+                self._send("".join(self._pending))
+                self._on_screen += len(self._pending)
+            self._pending = []
+
+        if self._pct != self._sent_pct and self._progress_placeholder is not None and self._progress_html:
+            body = self._progress_html(self._pct)
+            self._progress_placeholder.markdown(body, unsafe_allow_html=True)
+            self.bytes_sent += len(body.encode("utf-8"))
+            self._sent_pct = self._pct
+
+    def _rebuild(self) -> None:
+        """New container holding only the last `window` lines."""
+        self._rebuilds += 1
+        self._container = self._placeholder.container(
+            key=f"{KEY_PREFIX}{self._name}-{self._rebuilds}",
+            height=self._height,
+            autoscroll=True,
+        )
+        visible = self._lines[-self._window:]
+        self._send("".join(visible))
+        self._on_screen = len(visible)
+
+    def _send(self, body: str) -> None:
+        self._container.markdown(body, unsafe_allow_html=True)
+        self.bytes_sent += len(body.encode("utf-8"))
+
+
+# ---------------------------
+# Rendered log cache
+# ---------------------------
+class RenderedLogCache:
+    """
+    LRU of rendered log boxes keyed by (run ID, task). A completed task's log
+    never changes, so entries are only ever evicted, never invalidated.
+    "" records a task that finished without a log (nothing to rebuild).
+    """
+
+    def __init__(self, max_entries: int = RENDER_CACHE_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Hashable) -> str | None:
+        with self._lock:
+            box = self._entries.get(key)
+            if box is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return box
+
+    def put(self, key: Hashable, box: str) -> None:
+        with self._lock:
+            self._entries[key] = box
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+_RENDER_CACHE: RenderedLogCache | None = None
+_RENDER_CACHE_LOCK = threading.Lock()
+
+
+def get_rendered_log_cache() -> RenderedLogCache:
+    """Process-wide cache shared by every session."""
+    global _RENDER_CACHE
+    with _RENDER_CACHE_LOCK:
+        if _RENDER_CACHE is None:
+            _RENDER_CACHE = RenderedLogCache()
+        return _RENDER_CACHE
@@ -0,0 +1,238 @@
+# log_templates.py
+# Registry of pre-compiled detailed-log templates per pipeline step, with batch rendering
+
+import datetime
+import string
+from operator import itemgetter
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+# Fields a template line may use ({{ / }} for literal braces, as in an f-string)
+LOG_FIELDS = ("ts", "company", "website", "csafe", "csafe_lower")
+# Fields a compiled template can hold (header / footer fields included)
+_RENDER_FIELDS = ("run_iso", "ts", "company", "company_header", "website", "csafe", "csafe_lower")
+
+S3_OUTPUT = "s3://b2b-growth-agent/data_ingestion/Output"
+_WEBSITE_EVENT = (
+    '{{"Records": [{{"s3": {{"bucket": {{"name": "b2b-growth-agent"}}, '
+    '"object": {{"key": "data_ingestion/Output/website/{csafe}.json"}}}}}}], "%s": true}}'
+)
+
+
+def _run_times(run_ts: datetime.datetime | None) -> Tuple[str, str]:
+    """(ISO run timestamp, short per-line timestamp); now, local with offset, by default."""
+    if run_ts is None:
+        run_ts = datetime.datetime.now(datetime.timezone.utc).astimezone()
+    # Sliced from one isoformat() call: strftime("%f") costs more than the template
+    full = run_ts.isoformat(timespec="microseconds")
+    return (full if run_ts.microsecond else run_ts.isoformat()), f"{full[:10]} {full[11:19]},{full[20:23]}"
+
+
+class LogTemplate:
+    """
+    One step's detailed log (header, step lines, footer) parsed once into
+    (literal, field) parts and flattened to a %-format plus the field order,
+    so rendering is one C-level % with no brace parsing per call. Unknown
+    fields are rejected at registration, not at render time.
+    """
+
+    def __init__(self, step_key: str, lines: List[str]):
+        self.step_key = step_key
+        literal_key = step_key.replace("{", "{{").replace("}", "}}")
+        header = "\n".join([
+            "=== AGENTIC PIPELINE DETAILED LOG ===",
+            "Run Timestamp: {run_iso}",
+            "Company: {company_header}",
+            f"Task: {literal_key}",
+            "-" * 39,
+            "",
+        ])
+        body = "\n".join("{ts} - INFO - " + line for line in lines) + "\n\n"
+        footer = "\n--- Generated by Agentic Lead Intelligence on {run_iso} ---\n"
+        self.source = header + body + footer
+        self.parts = self._parse(self.source)
+        # "%" in the text is escaped; each field becomes a %s slot
+        self._format = "".join(
+            literal.replace("%", "%%") + ("%s" if field is not None else "") for literal, field in self.parts
+        )
+        slots = [_RENDER_FIELDS.index(field) for _, field in self.parts if field is not None]
+        pick = itemgetter(*slots) if slots else (lambda values: ())
+        self._pick = pick if len(slots) != 1 else (lambda values: (pick(values),))
+
+    def _parse(self, source: str) -> List[Tuple[str, str | None]]:
+        """(literal text, field or None) pairs; {{ / }} already unescaped in the literals."""
+        try:
+            parsed = list(string.Formatter().parse(source))
+        except ValueError as e:
+            raise ValueError(f"Invalid log template for {self.step_key!r}: {e}") from e
+        parts = []
+        for literal, field, spec, conversion in parsed:
+            if field is not None and (field not in _RENDER_FIELDS or spec or conversion):
+                raise ValueError(
+                    f"Invalid log template for {self.step_key!r}: {{{field}}} (fields: {', '.join(LOG_FIELDS)})"
+                )
+            parts.append((literal, field))
+        return parts
+
+    def render(self, company: str, website="", csafe: str = "", run_ts: datetime.datetime | None = None) -> str:
+        run_iso, ts = _run_times(run_ts)
+        # Same order as _RENDER_FIELDS
+        values = (run_iso, ts, company, company or "UNKNOWN", website, csafe, csafe.lower())
+        return self._format % self._pick(values)
+
+    def render_many(self, targets: Iterable[Tuple[str, str, str]], run_ts: datetime.datetime | None = None) -> Iterator[str]:
+        """Logs for (company, website, csafe) targets sharing one run timestamp."""
+        run_iso, ts = _run_times(run_ts)
+        fmt, pick = self._format, self._pick
+        for company, website, csafe in targets:
+            yield fmt % pick((run_iso, ts, company, company or "UNKNOWN", website, csafe, csafe.lower()))
+
+
+# ---------------------------
+# Registry
+# ---------------------------
+_TEMPLATES: Dict[str, LogTemplate] = {}
+_FALLBACKS: Dict[str, LogTemplate] = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def register_log_template(step_key: str, lines: List[str]) -> LogTemplate:
+    """Compile and register (or replace) the template for a step key."""
+    template = LogTemplate(step_key, lines)
+    with _TEMPLATES_LOCK:
+        _TEMPLATES[step_key] = template
+        _FALLBACKS.pop(step_key, None)
+    return template
+
+
+def get_log_template(step_key: str) -> LogTemplate:
+    """Registered template, else a generic one for the step (compiled once)."""
+    template = _TEMPLATES.get(step_key)
+    if template is not None:
+        return template
+    with _TEMPLATES_LOCK:
+        template = _FALLBACKS.get(step_key)
+        if template is None:
+            literal_key = step_key.replace("{", "{{").replace("}", "}}")
+            template = LogTemplate(step_key, [
+                f"Starting {literal_key}",
+                "No specific template found; logging basic step info",
+                f"Completed {literal_key}",
+            ])
+            _FALLBACKS[step_key] = template
+        return template
+
+
+def log_template_keys() -> List[str]:
+    with _TEMPLATES_LOCK:
+        return list(_TEMPLATES)
+
+
+def write_detailed_logs(
+    step_key: str,
+    targets: Iterable[Tuple[str, str, str]],
+    sink: Callable[[str], object],
+    run_ts: datetime.datetime | None = None,
+) -> int:
+    """
+    Render one step's log for many (company, website, csafe) targets in a
+    single pass and hand each to `sink` (e.g. file.write) as it is made;
+    nothing is accumulated. Returns the number of logs written.
+    """
+    written = 0
+    for text in get_log_template(step_key).render_many(targets, run_ts):
+        sink(text)
+        written += 1
+    return written
+
+
+# ---------------------------
+# Built-in pipeline steps
+# ---------------------------
+register_log_template("website", [
+    "Starting Website Extraction Pipeline",
+    'Input: Company Name = "{company}"',
+    "Searching Google for official website (region = USA)",
+    "Applying LLM-based ranking to find the most authoritative domain",
+    "Extracted Website: {website}",
+    "Performing entity resolution",
+    "- Normalizing entity name variants",
+    "- Deduping against existing entity registry (S3 master list)",
+    "Canonical Company Profile created",
+    "Storing extracted website record",
+    f"Saved to: {S3_OUTPUT}/website/{{csafe}}.json",
+    "Website extraction completed successfully",
+])
+
+register_log_template("firmo", [
+    "Starting Firmographic Enrichment",
+    f"Reading input file from {S3_OUTPUT}/website/{{csafe}}.json",
+    'Input: Company = "{company}", Website = {website}',
+    "[LAMBDA] Event received: " + _WEBSITE_EVENT % "run_firmo_lambda",
+    "Pulling data from firmographic sources (LLM-enriched + multi-source lookup)",
+    "Extracting legal name, HQ, founding year, addresses, and entity hierarchy",
+    "Enriching revenue, employee range, industry classification",
+    "Fetching social links (LinkedIn, Facebook, Instagram)",
+    "Lambda completed successfully",
+    "🌐 Crawling company homepages and classifying links by theme...",
+    "Scraping {csafe_lower} - {website} ...",
+    "🤖 Extracting structured info using Gemini URL Context + Google Search fallback...",
+    "🔎 URL-context retrieved About Us / Company Info for {company}",
+    "🔎 URL-context retrieved Leadership & Governance for {company}",
+    "🔎 URL-context retrieved Products / Services / Solutions for {company}",
+    "🔎 URL-context retrieved Subsidiaries / Brands for {company}",
+    "🔎 URL-context retrieved Headquarters / Locations for {company}",
+    "🔎 URL-context retrieved Contact Us for {company}",
+    "🔎 URL-context retrieved Social Media for {company}",
+    "Running website content extraction (About, Products, Contact, Newsroom)",
+    "Generating company overview summary using LLM",
+    "Performing final entity dedupe and consistency checks",
+    "Writing enriched firmographic profile to S3",
+    f"Saved to: {S3_OUTPUT}/firmo/{{csafe}}.json",
+    "Firmographic enrichment completed successfully",
+])
+
+register_log_template("techno", [
+    "Starting Technographic Profiling",
+    'Input Entity = "{company}"',
+    "[LAMBDA] Event received: " + _WEBSITE_EVENT % "run_techno_lambda",
+    "Hitting technographic vendor APIs and public fingerprints for the detected domains",
+    "Mapping identified products to normalized product categories (CRM, Marketing Automation, Cloud, Data, Security, etc.)",
+    "Computing tech maturity level based on stack depth, cloud adoption and modern tool usage",
+    "Writing technographic profile to S3",
+    f"Saved to: {S3_OUTPUT}/techno/{{csafe}}.json",
+    "Lambda completed successfully",
+    "Technographic profiling completed successfully",
+])
+
+register_log_template("financials", [
+    "Starting Financial Insights Pipeline",
+    'Input Entity = "{company}"',
+    "[LAMBDA] Event received: " + _WEBSITE_EVENT % "run_finance_lambda",
+    'Gathering available financial data for "{company}"',
+    "Extracting last 3 years (and latest quarters where available) of revenue, EBITDA, net income and operating cash flow",
+    "Computing YoY and QoQ percentage changes",
+    "Deriving financial health & momentum indicators (growth, profitability, leverage and liquidity)",
+    "Preparing financial summary for downstream 360 view",
+    f"Saved to: {S3_OUTPUT}/financials/{{csafe}}.json",
+    "Lambda completed successfully",
+    "Financial insights generated successfully",
+])
+
+register_log_template("growth", [
+    "Starting Growth Signal Extraction",
+    'Input Entity = "{company}"',
+    "[LAMBDA] Event received: " + _WEBSITE_EVENT % "run_growth_signals_lambda",
+    'Fetching last 12 months of news, blogs, and press releases for "{company}"',
+    "Deduping articles and filtering high-quality signals",
+    "Running LLM-based theme classification using the GTM taxonomy (Growth Signals, Financials, Risk, Strategic Outlook, Customer & Market, Competitor, ESG, Challenges)",
+    "Highlighting Growth Signal sub-themes: Acquisition & Mergers, Awards & Industry Recognition, Business Expansion, Leadership Changes, New Product/Technology Launches, Fundings & Capital Raises.",
+    "Capturing Risk-oriented themes: Regulatory/Legal/Compliance, ESG & Sustainability, Bankruptcy & Financial Distress.",
+    "Enriching Financials-related news: Revenue & Earnings, Profitability & Dividends, Debt & Liquidity.",
+    "Adding context from Strategic Outlook, Customer/Market focus, Competitor actions and Business Pain Points.",
+    "Tagging sentiment, timestamps, and source URLs",
+    "Exporting structured signal dataset",
+    f"Saved to: {S3_OUTPUT}/growth/{{csafe}}.json",
+    "Lambda completed successfully",
+    "Growth signal extraction completed successfully",
+])
@@ -0,0 +1,170 @@
+# pipeline_executor.py
+# Small dependency-aware task-graph executor for the Company 360 pipeline
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List
+
+# Event types yielded by execute_dag (worker code may emit any other type too):
+#   {"type": "started",     "index": i}
+#   {"type": "finished",    "index": i, "result": <run_task return value>}
+#   {"type": "failed",      "index": i, "error": "message"}
+#   {"type": "interrupted", "index": i}
+#   {"type": "skipped",     "index": i, "reason": "message"}
+TERMINAL_EVENTS = ("finished", "failed", "interrupted", "skipped")
+
+DEFAULT_MAX_WORKERS = 4
+POLL_SECONDS = 0.05
+
+
+class TaskInterrupted(Exception):
+    """Raised by a task body when it notices the cancel token."""
+
+
+def dependency_indices(tasks: List[Dict]) -> Dict[int, List[int]]:
+    """
+    Map task position -> positions it depends on, from each task's optional
+    "depends_on" list of task names. Unknown names raise ValueError.
+    """
+    by_name = {t["name"]: i for i, t in enumerate(tasks)}
+    deps: Dict[int, List[int]] = {}
+    for i, task in enumerate(tasks):
+        deps[i] = []
+        for name in task.get("depends_on", []):
+            if name not in by_name:
+                raise ValueError(f"Task '{task['name']}' depends on unknown task '{name}'.")
+            deps[i].append(by_name[name])
+    return deps
+
+
+def execute_dag(
+    tasks: List[Dict],
+    run_task: Callable[[int, Dict, Callable[..., None], threading.Event], object],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cancel: threading.Event | None = None,
+) -> Iterator[Dict]:
+    """
+    Run `tasks` on a thread pool, starting each one as soon as every task in
+    its "depends_on" list has finished, and yield progress events on the
+    caller's thread (so the caller can safely touch UI / session state).
+
+    run_task(index, task, emit, cancel) runs on a worker thread; it may call
+    emit(event_type, **payload) to stream progress and should raise
+    TaskInterrupted (or return early) once `cancel` is set. Its return value
+    is delivered in the "finished" event. Dependents of a failed or
+    interrupted task are skipped. Closing the generator cancels pending work.
+    """
+    deps = dependency_indices(tasks)
+    cancel = cancel or threading.Event()
+    events: "queue.Queue[Dict]" = queue.Queue()
+
+    def emit_for(index: int) -> Callable[..., None]:
+        def emit(event_type: str, **payload) -> None:
+            events.put({"type": event_type, "index": index, **payload})
+        return emit
+
+    def worker(index: int) -> None:
+        emit = emit_for(index)
+        emit("started")
+        try:
+            result = run_task(index, tasks[index], emit, cancel)
+        except TaskInterrupted:
+            emit("interrupted")
+        except Exception as e:
+            emit("failed", error=str(e))
+        else:
+            if cancel.is_set():
+                emit("interrupted")
+            else:
+                emit("finished", result=result)
+
+    pending = set(range(len(tasks)))
+    succeeded: set = set()
+    ended: set = set()
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="c360-task")
+    try:
+        while len(ended) < len(tasks):
+            # Submit every task whose dependencies are satisfied; skip ones that can never run
+            for index in sorted(pending):
+                blocked = [d for d in deps[index] if d not in succeeded]
+                if not blocked:
+                    pending.discard(index)
+                    if cancel.is_set():
+                        events.put({"type": "interrupted", "index": index})
+                    else:
+                        pool.submit(worker, index)
+                elif any(d in ended for d in blocked):
+                    pending.discard(index)
+                    events.put({"type": "skipped", "index": index, "reason": "upstream task did not complete"})
+
+            try:
+                event = events.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if event["type"] in TERMINAL_EVENTS:
+                ended.add(event["index"])
+                if event["type"] == "finished":
+                    succeeded.add(event["index"])
+            yield event
+    finally:
+        if len(ended) < len(tasks):
+            cancel.set()  # closed early: stop workers still streaming
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def topological_order(tasks: List[Dict]) -> List[int]:
+    """Task positions ordered so every task comes after its "depends_on" tasks."""
+    deps = dependency_indices(tasks)
+    order: List[int] = []
+    state: Dict[int, str] = {}
+
+    def visit(index: int) -> None:
+        if state.get(index) == "done":
+            return
+        if state.get(index) == "visiting":
+            raise ValueError(f"Dependency cycle at task '{tasks[index]['name']}'.")
+        state[index] = "visiting"
+        for d in deps[index]:
+            visit(d)
+        state[index] = "done"
+        order.append(index)
+
+    for index in range(len(tasks)):
+        visit(index)
+    return order
+
+
+def run_dag_inline(
+    tasks: List[Dict],
+    run_task: Callable[[int, Dict, Callable[..., None], threading.Event], object],
+    cancel: threading.Event | None = None,
+) -> Dict[int, Dict]:
+    """
+    Run the graph on the calling thread in dependency order and return the
+    terminal event per task position. Used where parallelism comes from an
+    outer pool (e.g. batch enrichment runs one company per worker).
+    """
+    deps = dependency_indices(tasks)
+    cancel = cancel or threading.Event()
+    outcomes: Dict[int, Dict] = {}
+
+    def emit(event_type: str, **payload) -> None:
+        pass  # no live streaming when running inline
+
+    for index in topological_order(tasks):
+        if any(outcomes[d]["type"] != "finished" for d in deps[index]):
+            outcomes[index] = {"type": "skipped", "index": index, "reason": "upstream task did not complete"}
+            continue
+        if cancel.is_set():
+            outcomes[index] = {"type": "interrupted", "index": index}
+            continue
+        try:
+            result = run_task(index, tasks[index], emit, cancel)
+        except TaskInterrupted:
+            outcomes[index] = {"type": "interrupted", "index": index}
+        except Exception as e:
+            outcomes[index] = {"type": "failed", "index": index, "error": str(e)}
+        else:
+            outcomes[index] = {"type": "finished", "index": index, "result": result}
+    return outcomes
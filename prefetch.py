@@ -0,0 +1,81 @@
+# prefetch.py
+# Speculative background work (e.g. enriching the company being typed) that is cheap to abandon
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable
+
+PREFETCH_WORKERS = int(os.environ.get("C360_PREFETCH_WORKERS", "2"))
+# Fuzzy matches below this resolver score are not worth speculating on
+PREFETCH_MIN_SCORE = float(os.environ.get("C360_PREFETCH_MIN_SCORE", "0.6"))
+
+
+class Prefetch:
+    """Handle for one speculative run; cancel() never blocks."""
+
+    def __init__(self, key: Hashable, future: Future, cancel_event: threading.Event):
+        self.key = key
+        self.future = future
+        self.cancel_event = cancel_event
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self) -> None:
+        # Queued work is dropped outright; running work stops at its next check
+        self.cancel_event.set()
+        self.future.cancel()
+
+
+class Prefetcher:
+    """
+    Small dedicated pool so speculation never competes with pipeline jobs
+    for workers. fn(cancel, *args) should check `cancel` between units of
+    work; its exceptions are swallowed (and counted) since nobody waits on it.
+    """
+
+    def __init__(self, max_workers: int = PREFETCH_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="c360-prefetch")
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "completed": 0, "cancelled": 0, "failed": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def start(self, key: Hashable, fn: Callable[..., None], *args) -> Prefetch:
+        cancel = threading.Event()
+        self._count("started")
+        future = self._pool.submit(self._run, fn, cancel, *args)
+        future.add_done_callback(lambda f: f.cancelled() and self._count("cancelled"))
+        return Prefetch(key, future, cancel)
+
+    def _run(self, fn: Callable[..., None], cancel: threading.Event, *args) -> None:
+        if cancel.is_set():
+            self._count("cancelled")
+            return
+        try:
+            fn(cancel, *args)
+        except Exception:
+            self._count("failed")
+            return
+        self._count("cancelled" if cancel.is_set() else "completed")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+_PREFETCHER: Prefetcher | None = None
+_PREFETCHER_LOCK = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """Process-wide prefetch pool."""
+    global _PREFETCHER
+    with _PREFETCHER_LOCK:
+        if _PREFETCHER is None:
+            _PREFETCHER = Prefetcher()
+        return _PREFETCHER
@@ -0,0 +1,180 @@
+# provider_standins.py
+# Local stand-in enrichment provider: serves fixture responses over HTTP with injected latency
+#
+# Usage:
+#   python provider_standins.py --port 8765 --latency 0.2 --jitter 0.05
+#   C360_PROVIDER_URL=http://127.0.0.1:8765 streamlit run app.py
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from company_index import normalize_company_name
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Default listen backlog is 5: bursts of new connections would hit SYN retransmits
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # Clients that give up (cancelled / timed-out calls) just drop the socket
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def fixtures_from_frame(df: pd.DataFrame) -> Dict[str, Dict]:
+    """normalized company name -> JSON-safe row dict (every stage is served from the same row)."""
+    rows = df.astype(object).where(df.notna(), None)
+    fixtures = {}
+    for record in rows.to_dict("records"):
+        key = normalize_company_name(str(record.get("company_name") or ""))
+        if key:
+            fixtures[key] = {k: (v if isinstance(v, (str, int, float, bool)) or v is None else str(v)) for k, v in record.items()}
+    return fixtures
+
+
+class StandInProvider:
+    """
+    Threaded HTTP/1.1 (keep-alive) server answering
+    GET /v1/enrich/<stage>?company=... with {"stage", "company", "fields"}.
+    Unknown companies get 404. Each request sleeps `latency` (+ uniform
+    `jitter`) seconds; `error_rate` of requests answer 503 so client retries
+    are exercised. `stats()` counts requests and TCP connections, which
+    shows whether clients reuse pooled connections.
+    """
+
+    def __init__(
+        self,
+        fixtures: Dict[str, Dict],
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "connections": 0, "errors_injected": 0, "not_found": 0}
+        self._server = _StandInServer((host, port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; with Nagle on, keep-alive
+            # replies would wait for the client's delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                standin._count("connections")
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, payload: Dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                standin._count("requests")
+                parsed = urlparse(self.path)
+                parts = parsed.path.strip("/").split("/")
+                if len(parts) != 3 or parts[:2] != ["v1", "enrich"]:
+                    self._reply(404, {"error": "unknown endpoint"})
+                    return
+                time.sleep(standin.latency + (random.uniform(0, standin.jitter) if standin.jitter else 0.0))
+                if standin.error_rate and random.random() < standin.error_rate:
+                    standin._count("errors_injected")
+                    self._reply(503, {"error": "injected failure"})
+                    return
+                company = parse_qs(parsed.query).get("company", [""])[0]
+                fields = standin.fixtures.get(normalize_company_name(company))
+                if fields is None:
+                    standin._count("not_found")
+                    self._reply(404, {"error": "company not found"})
+                    return
+                self._reply(200, {"stage": parts[2], "company": company, "fields": fields})
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread (CLI)."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> "StandInProvider":
+        """Serve on a daemon thread (tests, benchmarks)."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="provider-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInProvider":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    from compaction import strip_derived_columns
+    from data_loader import default_excel_path, load_customer360
+
+    parser = argparse.ArgumentParser(description="Serve Customer360 rows as a stand-in enrichment provider")
+    parser.add_argument("excel_path", nargs="?", default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    frame = strip_derived_columns(load_customer360(args.excel_path or default_excel_path()))
+    server = StandInProvider(
+        fixtures_from_frame(frame), args.latency, args.jitter, args.error_rate, args.host, args.port
+    )
+    print(f"Stand-in provider for {len(server.fixtures)} companies on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
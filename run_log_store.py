@@ -0,0 +1,155 @@
+# run_log_store.py
+# Append-only JSONL store of pipeline run logs (agent steps + detailed task logs), rotated by size
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Set
+
+DEFAULT_RUN_LOG_RELDIR = os.path.join("Files", "run_logs")
+# A segment file rotates once it would grow past this; the oldest segments
+# beyond RUN_LOG_MAX_FILES are deleted (retention is a disk budget, not an age)
+RUN_LOG_MAX_BYTES = int(os.environ.get("C360_RUN_LOG_MAX_BYTES", str(8 * 1024 * 1024)))
+RUN_LOG_MAX_FILES = int(os.environ.get("C360_RUN_LOG_MAX_FILES", "16"))
+
+SEGMENT_PATTERN = re.compile(r"^runlog-(\d{6})\.jsonl$")
+
+# Record kinds: one "step" per agent log line, one "detailed" per finished task
+RECORD_KINDS = ("step", "detailed")
+
+
+def default_run_log_dir() -> str:
+    """Log directory next to the bundled workbook (overridable with C360_RUN_LOGS)."""
+    return os.environ.get("C360_RUN_LOGS") or os.path.join(os.getcwd(), DEFAULT_RUN_LOG_RELDIR)
+
+
+def log_record(run_id: str, company: str, task: str, task_index: int, kind: str, text: str, cls: str = "info") -> Dict:
+    """One record, stamped now (epoch seconds + a readable local time)."""
+    now = time.time()
+    return {
+        "run_id": run_id,
+        "company": company,
+        "task": task,
+        "task_index": task_index,
+        "kind": kind,
+        "cls": cls,
+        "text": text,
+        "ts": round(now, 3),
+        "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+    }
+
+
+class RunLogStore:
+    """
+    Records live in runlog-NNNNNN.jsonl segments, one JSON object per line,
+    only ever appended to. Reads for a run scan the segments this process
+    wrote it to (or every segment, for runs from before a restart) and
+    only parse lines that mention the run ID. A torn last line from a crash
+    is skipped.
+    """
+
+    def __init__(self, directory: str | None = None, max_bytes: int = RUN_LOG_MAX_BYTES, max_files: int = RUN_LOG_MAX_FILES):
+        self.directory = os.path.abspath(directory or default_run_log_dir())
+        self.max_bytes = max_bytes
+        self.max_files = max(1, max_files)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # run_id -> segments holding its records (runs written by this process)
+        self._index: Dict[str, Set[int]] = {}
+        segments = self._segments()
+        self._active = segments[-1] if segments else 1
+
+    def _segments(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"runlog-{segment:06d}.jsonl")
+
+    def _rotate(self) -> None:
+        self._active += 1
+        segments = self._segments()
+        for segment in segments[: max(0, len(segments) + 1 - self.max_files)]:
+            try:
+                os.remove(self._path(segment))
+            except FileNotFoundError:
+                pass
+            for held in self._index.values():
+                held.discard(segment)
+
+    # ---------------------------
+    # Writes
+    # ---------------------------
+    def append(self, records: List[Dict]) -> None:
+        """Append records (one write; a batch never straddles two segments)."""
+        if not records:
+            return
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+        with self._lock:
+            try:
+                size = os.path.getsize(self._path(self._active))
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self._path(self._active), "ab") as f:
+                f.write(data)
+            for r in records:
+                self._index.setdefault(r["run_id"], set()).add(self._active)
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def records(self, run_id: str, kind: str | None = None) -> Iterator[Dict]:
+        """A run's records in write order (optionally only one kind)."""
+        with self._lock:
+            segments = sorted(self._index[run_id]) if run_id in self._index else self._segments()
+        needle = f'"run_id":"{run_id}"'.encode("utf-8")
+        for segment in segments:
+            try:
+                f = open(self._path(segment), "rb")
+            except FileNotFoundError:
+                continue  # rotated away
+            with f:
+                for raw in f:
+                    if needle not in raw:
+                        continue
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if record.get("run_id") == run_id and (kind is None or record.get("kind") == kind):
+                        yield record
+
+    def task_lines(self, run_id: str) -> Dict[int, List[Dict]]:
+        """task_index -> its agent step records."""
+        lines: Dict[int, List[Dict]] = {}
+        for record in self.records(run_id, "step"):
+            lines.setdefault(record["task_index"], []).append(record)
+        return lines
+
+    def detailed_logs(self, run_id: str) -> List[str]:
+        """Detailed task logs in task order (the last one per task, for re-runs)."""
+        logs = {record["task_index"]: record["text"] for record in self.records(run_id, "detailed")}
+        return [logs[i] for i in sorted(logs)]
+
+
+_STORES: Dict[str, RunLogStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_run_log_store(directory: str | None = None) -> RunLogStore:
+    """Process-wide store instance per log directory."""
+    directory = os.path.abspath(directory or default_run_log_dir())
+    with _STORES_LOCK:
+        store = _STORES.get(directory)
+        if store is None:
+            store = RunLogStore(directory)
+            _STORES[directory] = store
+        return store
@@ -0,0 +1,136 @@
+# single_flight.py
+# Process-wide single-flight: concurrent identical enrichment work runs once and is shared
+
+import asyncio
+import threading
+from concurrent.futures import Future, wait
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# How often a waiter with a cancel token checks it
+WAIT_POLL_SECONDS = 0.05
+
+
+class _LeaderGone(Exception):
+    """The caller doing the work was cancelled / interrupted; a waiter takes over."""
+
+
+class FlightCancelled(Exception):
+    """A waiting caller's cancel token was set before the shared flight landed."""
+
+
+class SingleFlight:
+    """
+    do(key, fn) runs fn() unless a call with the same key is already in
+    flight, in which case it waits for that call and returns its result (or
+    raises its exception). Works across threads and the asyncio engine:
+    each flight is a concurrent.futures.Future that thread callers block on
+    and coroutines await. Results are not kept once the flight lands (the
+    enrichment cache does that); this only closes the window in which
+    several callers would all miss the cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+        self._stats = {"executions": 0, "shared": 0}
+
+    def _join_or_lead(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats["shared"] += 1
+                return flight, False
+            flight = Future()
+            self._flights[key] = flight
+            self._stats["executions"] += 1
+            return flight, True
+
+    def _land(self, key: Hashable, flight: Future, result: Any = None, error: BaseException | None = None) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+        if error is None:
+            flight.set_result(result)
+        elif isinstance(error, Exception):
+            flight.set_exception(error)
+        else:
+            # Cancellation / interrupt belongs to the leader only: waiters retry
+            flight.set_exception(_LeaderGone())
+
+    def do(self, key: Hashable, fn: Callable[[], Any], cancel: threading.Event | None = None) -> Tuple[Any, bool]:
+        """
+        (result, shared) — shared is True when another caller did the work.
+        While waiting on someone else's flight, raises FlightCancelled once
+        `cancel` is set (the flight itself carries on for its other callers).
+        """
+        while True:
+            flight, leader = self._join_or_lead(key)
+            if leader:
+                try:
+                    result = fn()
+                except BaseException as e:
+                    self._land(key, flight, error=e)
+                    raise
+                self._land(key, flight, result)
+                return result, False
+            try:
+                return self._wait(flight, cancel), True
+            except _LeaderGone:
+                continue
+
+    @staticmethod
+    def _wait(flight: Future, cancel: threading.Event | None) -> Any:
+        if cancel is not None:
+            while not wait([flight], timeout=WAIT_POLL_SECONDS).done:
+                if cancel.is_set():
+                    raise FlightCancelled()
+        return flight.result()
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], Awaitable], cancel: threading.Event | None = None
+    ) -> Tuple[Any, bool]:
+        """Coroutine version of do() (same `cancel` handling); shares flights with thread callers."""
+        while True:
+            flight, leader = self._join_or_lead(key)
+            if leader:
+                try:
+                    result = await fn()
+                except BaseException as e:
+                    self._land(key, flight, error=e)
+                    raise
+                self._land(key, flight, result)
+                return result, False
+            try:
+                return await self._wait_async(flight, cancel), True
+            except _LeaderGone:
+                continue
+
+    @staticmethod
+    async def _wait_async(flight: Future, cancel: threading.Event | None) -> Any:
+        # shield: a cancelled waiter must not cancel the shared flight
+        waiter = asyncio.shield(asyncio.wrap_future(flight))
+        if cancel is not None:
+            while not (await asyncio.wait({waiter}, timeout=WAIT_POLL_SECONDS))[0]:
+                if cancel.is_set():
+                    waiter.cancel()
+                    raise FlightCancelled()
+        return await waiter
+
+    def stats(self) -> Dict:
+        """executions (work actually run), shared (dedup hits) and flights in progress."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._flights)
+        return stats
+
+
+_SINGLE_FLIGHT: SingleFlight | None = None
+_SINGLE_FLIGHT_LOCK = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide instance shared by interactive runs, batch threads and the asyncio engine."""
+    global _SINGLE_FLIGHT
+    with _SINGLE_FLIGHT_LOCK:
+        if _SINGLE_FLIGHT is None:
+            _SINGLE_FLIGHT = SingleFlight()
+        return _SINGLE_FLIGHT
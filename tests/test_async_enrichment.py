@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+from async_enrichment import AsyncEnrichmentEngine
+
+
+class _Provider:
+    def __init__(self, name, max_concurrency=None, latency=0.0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = 0
+        self.burst = 0
+        self.latency = latency
+
+    async def afetch(self, stage, company, cols, row):
+        await asyncio.sleep(self.latency)
+        return {"provider": self.name}
+
+
+def test_throttled_provider_does_not_starve_others():
+    engine = AsyncEnrichmentEngine(max_in_flight=2)
+    slow = _Provider("slow", max_concurrency=1, latency=0.5)
+    free = _Provider("free")
+    try:
+        queued = [engine.submit(engine.call(slow, "stage", "Acme", [], None)) for _ in range(4)]
+        time.sleep(0.05)  # the slow calls are queued on their provider's semaphore
+        started = time.perf_counter()
+        result = engine.submit(engine.call(free, "stage", "Acme", [], None)).result(timeout=5)
+        assert result == {"provider": "free"}
+        # Would wait for the slow provider if its queued calls held the global slots
+        assert time.perf_counter() - started < 0.3
+        for future in queued:
+            future.result(timeout=5)
+        assert engine.stats()["peak_in_flight"] <= 2
+    finally:
+        engine.close()
@@ -0,0 +1,32 @@
+from checkpoints import CheckpointStore
+
+
+def _store(tmp_path) -> CheckpointStore:
+    return CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+
+
+def test_new_run_supersedes_older_resumable_runs(tmp_path):
+    store = _store(tmp_path)
+    old = store.start_run("pipeline", "acme", {})
+    store.set_status(old, "interrupted")
+    new = store.start_run("pipeline", "acme", {})
+    assert store.get_run(old)["status"] == "superseded"
+    assert store.latest_resumable("pipeline", "acme")["run_id"] == new
+
+
+def test_live_runs_are_not_superseded(tmp_path):
+    store = _store(tmp_path)
+    live = store.start_run("pipeline", "acme", {})
+    store.start_run("pipeline", "acme", {}, live={live})
+    assert store.get_run(live)["status"] == "running"
+    store.set_status(live, "complete")
+    assert store.get_run(live)["status"] == "complete"
+
+
+def test_superseded_run_stays_superseded_when_its_job_winds_down(tmp_path):
+    store = _store(tmp_path)
+    old = store.start_run("batch", "v1", {"limit": 10})
+    new = store.start_run("batch", "v1", {"limit": 10})
+    store.set_status(old, "interrupted")
+    assert store.get_run(old)["status"] == "superseded"
+    assert store.latest_resumable("batch", "v1")["run_id"] == new
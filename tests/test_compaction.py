@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from compaction import DERIVED_SUFFIX, compact_customer360, memory_report
+
+
+def test_unique_money_text_is_not_categorised():
+    raw = pd.DataFrame({"Funding Amount($)": [f"${i}M" for i in range(1, 9)]})
+    out = compact_customer360(raw)
+    assert not isinstance(out["Funding Amount($)"].dtype, pd.CategoricalDtype)
+    assert out["Funding Amount($)" + DERIVED_SUFFIX].tolist() == [float(i * 1e6) for i in range(1, 9)]
+
+
+def test_repeated_percent_text_is_categorised():
+    raw = pd.DataFrame({"Revenue Growth": ["+4.3% (2024 vs 2023)", "-", "+4.3% (2024 vs 2023)", "-"]})
+    out = compact_customer360(raw)
+    assert isinstance(out["Revenue Growth"].dtype, pd.CategoricalDtype)
+    values = out["Revenue Growth" + DERIVED_SUFFIX]
+    assert values.dtype == np.float32
+    assert np.isclose(values.iloc[0], 4.3) and np.isnan(values.iloc[1])
+
+
+def test_memory_report_counts_derived_values_with_their_column():
+    raw = pd.DataFrame({"Funding Amount($)": [f"${i}M" for i in range(1, 9)], "Company Overview": ["x"] * 8})
+    out = compact_customer360(raw)
+    report = memory_report(raw, out).set_index("column")
+    assert "Funding Amount($)" + DERIVED_SUFFIX not in report.index
+    after = out.memory_usage(index=False, deep=True)
+    assert report.loc["Funding Amount($)", "bytes_after"] == after["Funding Amount($)"] + after["Funding Amount($)" + DERIVED_SUFFIX]
+    assert report.loc["TOTAL", "bytes_after"] == after.sum()
+    assert report.loc["TOTAL", "bytes_before"] == raw.memory_usage(index=False, deep=True).sum()
@@ -0,0 +1,37 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from dataset_overlay import apply_overlay, compute_overlay
+from upload_ingest import ingest_upload
+
+
+def _csv_upload(text: str) -> pd.DataFrame:
+    fh = io.BytesIO(text.encode("utf-8"))
+    fh.name = "upload.csv"
+    return ingest_upload(fh)["df"]
+
+
+def _base() -> pd.DataFrame:
+    return pd.DataFrame({
+        "unique_id": ["1", "2"],
+        "company_name": ["Acme", "Globex"],
+        "Tech Install": [np.nan, "Salesforce"],
+    })
+
+
+def test_blank_csv_cell_matches_missing_base_value():
+    upload = _csv_upload("unique_id,company_name,Tech Install\n1,Acme,\n2,Globex,  \n")
+    overlay = compute_overlay(_base().iloc[:1], upload.iloc[:1], "v1")
+    assert overlay["counts"] == {"inserted": 0, "updated": 0, "unchanged": 1}
+    assert overlay["updates"] == {}
+
+
+def test_cleared_cell_is_written_as_missing():
+    upload = _csv_upload("unique_id,company_name,Tech Install\n1,Acme,\n2,Globex,\n")
+    overlay = compute_overlay(_base(), upload, "v1")
+    assert overlay["counts"] == {"inserted": 0, "updated": 1, "unchanged": 1}
+    assert list(overlay["updates"]) == ["Tech Install"]
+    merged = apply_overlay(_base(), overlay)
+    assert merged["Tech Install"].isna().all()
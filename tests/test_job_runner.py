@@ -0,0 +1,104 @@
+import threading
+import time
+
+import job_runner
+from job_runner import JobManager
+
+
+def _wait_done(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+    return job.done
+
+
+def test_job_result_and_events():
+    manager = JobManager(max_workers=1)
+
+    def body(job, n):
+        for i in range(n):
+            job.emit("step", i=i)
+        return n
+
+    job = manager.submit("pipeline", body, 3, label="demo", key="run-1")
+    assert _wait_done(job)
+    assert (job.status, job.result) == ("finished", 3)
+    events, cursor = job.events_since(0)
+    assert [e["i"] for e in events] == [0, 1, 2] and cursor == 3
+    assert job.events_since(2)[0] == [{"type": "step", "i": 2}]
+    assert manager.get(job.id) is job
+
+
+def test_cancel_running_job():
+    manager = JobManager(max_workers=1)
+
+    def body(job):
+        job.cancel.wait(5)
+        return "stopped"
+
+    job = manager.submit("pipeline", body)
+    while job.status == "queued":
+        time.sleep(0.01)
+    assert manager.cancel(job.id)
+    assert _wait_done(job)
+    assert job.status == "cancelled"
+    assert not manager.cancel(job.id)  # already ended
+
+
+def test_cancelled_before_start_never_runs():
+    manager = JobManager(max_workers=1)
+    gate = threading.Event()
+    blocker = manager.submit("pipeline", lambda job: gate.wait(5))
+    ran = []
+    queued = manager.submit("pipeline", lambda job: ran.append(1), key="run-2")
+    assert queued.status == "queued" and manager.active_keys("pipeline") == {"run-2"}
+    manager.cancel(queued.id)
+    gate.set()
+    assert _wait_done(blocker) and _wait_done(queued)
+    assert queued.status == "cancelled" and ran == []
+    assert manager.active_keys() == set()
+
+
+def test_failed_job_keeps_its_error():
+    manager = JobManager(max_workers=1)
+
+    def body(job):
+        raise RuntimeError("boom")
+
+    job = manager.submit("lead", body)
+    assert _wait_done(job)
+    assert (job.status, job.error) == ("failed", "boom")
+
+
+def test_batch_jobs_do_not_block_interactive_jobs():
+    manager = JobManager(max_workers=1, kind_workers={"batch": 1})
+    gate = threading.Event()
+    batch = manager.submit("batch", lambda job: gate.wait(5))
+    pipeline = manager.submit("pipeline", lambda job: "ok")
+    assert _wait_done(pipeline) and pipeline.result == "ok"
+    second = manager.submit("batch", lambda job: None)
+    assert second.status == "queued" and manager.queued_ahead(second) == 0
+    gate.set()
+    assert _wait_done(batch) and _wait_done(second)
+
+
+def test_finished_jobs_are_pruned(monkeypatch):
+    monkeypatch.setattr(job_runner, "MAX_FINISHED_JOBS", 2)
+    manager = JobManager(max_workers=1)
+    jobs = [manager.submit("pipeline", lambda job: None) for _ in range(4)]
+    for job in jobs:
+        assert _wait_done(job)
+        time.sleep(0.01)  # distinct finish times
+    manager.submit("pipeline", lambda job: None)  # pruning runs on submit
+    assert [manager.get(j.id) for j in jobs[:2]] == [None, None]
+    assert all(manager.get(j.id) is j for j in jobs[2:])
+
+
+def test_expired_jobs_are_pruned(monkeypatch):
+    manager = JobManager(max_workers=1)
+    old = manager.submit("pipeline", lambda job: None)
+    assert _wait_done(old)
+    monkeypatch.setattr(job_runner, "JOB_RETENTION_SECONDS", 0)
+    time.sleep(0.01)
+    manager.submit("pipeline", lambda job: None)
+    assert manager.get(old.id) is None
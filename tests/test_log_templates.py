@@ -0,0 +1,34 @@
+import datetime
+import json
+import os
+
+import pytest
+
+from data_engineer import generate_detailed_log
+from log_templates import LogTemplate, get_log_template
+
+BASELINE = os.path.join(os.path.dirname(__file__), "data", "detailed_log_baseline.json")
+
+
+def _cases():
+    with open(BASELINE, encoding="utf-8") as fh:
+        return json.load(fh)["cases"]
+
+
+@pytest.mark.parametrize("case", _cases(), ids=lambda c: f"{c['step']}-{c['company'] or 'blank'}")
+def test_detailed_log_matches_baseline(case):
+    website = float("nan") if case["website"] is None else case["website"]
+    run_ts = datetime.datetime.fromisoformat(case["run_ts"])
+    assert generate_detailed_log(case["step"], case["company"], website, case["csafe"], None, run_ts) == case["expected"]
+
+
+def test_render_many_matches_render():
+    run_ts = datetime.datetime(2026, 3, 4, 5, 6, 7, 890000)
+    targets = [("Acme", "acme.example", "Acme"), ("Globex", "globex.example", "Globex")]
+    template = get_log_template("firmo")
+    assert list(template.render_many(targets, run_ts)) == [template.render(*t, run_ts=run_ts) for t in targets]
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        LogTemplate("broken", ["Company {name}"])
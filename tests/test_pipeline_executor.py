@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from pipeline_executor import TaskInterrupted, execute_dag, run_dag_inline, topological_order
+
+TASKS = [
+    {"name": "website"},
+    {"name": "firmographic", "depends_on": ["website"]},
+    {"name": "technographic", "depends_on": ["website"]},
+    {"name": "summary", "depends_on": ["firmographic", "technographic"]},
+]
+
+
+def _terminal(events):
+    return {e["index"]: e for e in events if e["type"] in ("finished", "failed", "interrupted", "skipped")}
+
+
+def test_tasks_start_after_their_dependencies_finish():
+    def run_task(index, task, emit, cancel):
+        time.sleep(0.02)
+        return task["name"]
+
+    events = list(execute_dag(TASKS, run_task))
+    started = {e["index"]: n for n, e in enumerate(events) if e["type"] == "started"}
+    ended = {e["index"]: n for n, e in enumerate(events) if e["type"] == "finished"}
+    assert ended[0] < started[1] and ended[0] < started[2]
+    assert max(ended[1], ended[2]) < started[3]
+    assert {i: e["result"] for i, e in _terminal(events).items()} == {i: t["name"] for i, t in enumerate(TASKS)}
+
+
+def test_emitted_events_are_tagged_with_their_task():
+    def run_task(index, task, emit, cancel):
+        emit("line", text=task["name"])
+
+    lines = [e for e in execute_dag(TASKS, run_task) if e["type"] == "line"]
+    assert sorted((e["index"], e["text"]) for e in lines) == [(i, t["name"]) for i, t in enumerate(TASKS)]
+
+
+def test_failure_skips_dependents_only():
+    def run_task(index, task, emit, cancel):
+        if task["name"] == "firmographic":
+            raise RuntimeError("provider down")
+        return task["name"]
+
+    outcome = _terminal(execute_dag(TASKS, run_task))
+    assert outcome[1] == {"type": "failed", "index": 1, "error": "provider down"}
+    assert outcome[2]["type"] == "finished"
+    assert outcome[3]["type"] == "skipped"
+    assert outcome[0]["type"] == "finished"
+
+
+def test_cancel_interrupts_running_and_pending_tasks():
+    cancel = threading.Event()
+
+    def run_task(index, task, emit, cancel_token):
+        if index == 0:
+            cancel.set()
+            raise TaskInterrupted()
+        return task["name"]
+
+    outcome = _terminal(execute_dag(TASKS, run_task, cancel=cancel))
+    assert outcome[0]["type"] == "interrupted"
+    assert {outcome[i]["type"] for i in (1, 2, 3)} == {"skipped"}
+
+
+def test_closing_the_generator_cancels_workers():
+    seen = threading.Event()
+
+    def run_task(index, task, emit, cancel):
+        emit("line")
+        cancel.wait(5)
+        seen.set()
+        raise TaskInterrupted()
+
+    events = execute_dag(TASKS, run_task)
+    next(e for e in events if e["type"] == "line")
+    events.close()
+    assert seen.wait(2)
+
+
+def test_inline_run_matches_dag_outcomes():
+    def run_task(index, task, emit, cancel):
+        if task["name"] == "technographic":
+            raise RuntimeError("boom")
+        return task["name"]
+
+    outcome = run_dag_inline(TASKS, run_task)
+    assert [outcome[i]["type"] for i in range(4)] == ["finished", "finished", "failed", "skipped"]
+
+
+def test_unknown_dependency_and_cycles_are_rejected():
+    with pytest.raises(ValueError):
+        list(execute_dag([{"name": "a", "depends_on": ["missing"]}], lambda *a: None))
+    with pytest.raises(ValueError):
+        topological_order([{"name": "a", "depends_on": ["b"]}, {"name": "b", "depends_on": ["a"]}])
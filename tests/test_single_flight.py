@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from single_flight import FlightCancelled, SingleFlight
+
+
+def test_async_waiter_gives_up_when_cancelled():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    async def slow():
+        await asyncio.to_thread(release.wait, 5)
+        return "done"
+
+    async def scenario():
+        cancel = threading.Event()
+        leader = asyncio.ensure_future(flight.do_async("k", slow))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.ensure_future(flight.do_async("k", slow, cancel))
+        await asyncio.sleep(0.05)
+        cancel.set()
+        with pytest.raises(FlightCancelled):
+            await asyncio.wait_for(waiter, timeout=1)
+        # The shared flight carries on for its leader
+        assert not leader.done()
+        release.set()
+        return await leader
+
+    assert asyncio.run(scenario()) == ("done", False)
+    assert flight.stats() == {"executions": 1, "shared": 1, "in_flight": 0}
+
+
+def _start_leader(flight, release):
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", lambda: release.wait(5) and "done")))
+    leader.start()
+    while flight.stats()["in_flight"] == 0:
+        time.sleep(0.01)
+    return leader, results
+
+
+def test_thread_waiter_gives_up_when_cancelled():
+    flight = SingleFlight()
+    release, cancel = threading.Event(), threading.Event()
+    leader, results = _start_leader(flight, release)
+    threading.Timer(0.05, cancel.set).start()
+    with pytest.raises(FlightCancelled):
+        flight.do("k", lambda: "never", cancel)
+    assert leader.is_alive()
+    release.set()
+    leader.join(5)
+    assert results == [("done", False)]
+
+
+def test_thread_waiter_shares_the_leaders_result():
+    flight = SingleFlight()
+    release, cancel = threading.Event(), threading.Event()
+    leader, _ = _start_leader(flight, release)
+    threading.Timer(0.05, release.set).start()
+    assert flight.do("k", lambda: "never", cancel) == ("done", True)
+    leader.join(5)
+    assert flight.stats() == {"executions": 1, "shared": 1, "in_flight": 0}
+
+
+def test_waiter_takes_over_when_the_leader_is_interrupted():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def leader_body():
+        started.set()
+        time.sleep(0.1)
+        raise KeyboardInterrupt()  # not an Exception: the work belongs to the leader only
+
+    def leader():
+        try:
+            flight.do("k", leader_body)
+        except KeyboardInterrupt:
+            pass
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    started.wait(5)
+    assert flight.do("k", lambda: "retried") == ("retried", False)
+    thread.join(5)
@@ -0,0 +1,71 @@
+import gc
+import io
+import os
+from collections import OrderedDict
+
+import pytest
+
+import upload_ingest
+from upload_ingest import ingest_upload_cached
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_ingest, "SPILL_ROOT", str(tmp_path))
+    monkeypatch.setattr(upload_ingest, "_UPLOAD_CACHE", OrderedDict())
+    monkeypatch.setattr(upload_ingest, "_SPILL_REFS", {})
+
+
+def _csv(tag: str, rows: int = 200):
+    data = ("unique_id,company_name,Tech Install\n" + "".join(f"{i},{tag}{i},x\n" for i in range(rows))).encode()
+    fh = io.BytesIO(data)
+    fh.name = "upload.csv"
+    fh.size = len(data)
+    return fh
+
+
+def _spilled(tag: str) -> dict:
+    # A tiny ceiling forces the upload to spill to Parquet
+    return ingest_upload_cached(_csv(tag), max_entries=1, memory_ceiling_mb=1e-6)
+
+
+def test_eviction_keeps_leased_spill_until_released():
+    lease = _spilled("a")["spill_lease"]
+    spill_dir = lease.spill_dir
+    assert upload_ingest._SPILL_REFS[spill_dir] == 2  # cache entry + lease
+    _spilled("b")  # evicts "a" from the cache
+    assert os.path.isdir(spill_dir) and upload_ingest._SPILL_REFS[spill_dir] == 1
+    assert len(lease(["company_name"])) == 200
+    lease.release()
+    lease.release()  # idempotent
+    assert not os.path.isdir(spill_dir) and spill_dir not in upload_ingest._SPILL_REFS
+
+
+def test_shared_lease_outlives_the_original():
+    lease = _spilled("a")["spill_lease"]
+    spill_dir = lease.spill_dir
+    job_loader = lease.share()
+    _spilled("b")
+    lease.release()
+    assert os.path.isdir(spill_dir)
+    del job_loader
+    gc.collect()
+    assert not os.path.isdir(spill_dir)
+
+
+def test_cache_hit_hands_out_a_new_lease():
+    first = _spilled("a")
+    second = _spilled("a")
+    assert second["cached"] and second["spill_lease"] is not first["spill_lease"]
+    spill_dir = first["spill_dir"]
+    assert upload_ingest._SPILL_REFS[spill_dir] == 3
+    first["spill_lease"].release()
+    second["spill_lease"].release()
+    assert os.path.isdir(spill_dir)  # still held by the cache entry
+    _spilled("b")
+    assert not os.path.isdir(spill_dir)
+
+
+def test_in_memory_upload_has_no_lease():
+    result = ingest_upload_cached(_csv("a"), max_entries=1)
+    assert result["spill_lease"] is None and len(result["df"]) == 200
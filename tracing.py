@@ -0,0 +1,128 @@
+# tracing.py
+# Lightweight timing spans (wall + CPU) for pipeline / lead-scoring stages, kept in an in-process ring buffer
+
+import contextvars
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# Spans kept (oldest dropped first); ~200 bytes each
+TRACE_BUFFER_SIZE = int(os.environ.get("C360_TRACE_BUFFER", "50000"))
+PERCENTILES = (50, 95, 99)
+
+# Span kinds used by the pages: "task" (one enrichment / scoring task),
+# "step" (one agent log step, fixed delay included), "lookup" (cache /
+# row lookups), "provider" (provider call), "format" (detailed log text),
+# "html" (result HTML) and "render" (UI updates on the script thread)
+
+_current_run: contextvars.ContextVar[str | None] = contextvars.ContextVar("c360_trace_run", default=None)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Tracer:
+    """
+    Records spans as {"kind", "stage", "run_id", "wall_ms", "cpu_ms", "ok",
+    "ts"}. CPU time is the recording thread's (time.thread_time), so it
+    shows the work hidden behind sleeps and I/O waits; spans timed on an
+    event loop pass cpu=False since other coroutines share that thread.
+    Spans belong to the run bound with run() unless given a run_id.
+    """
+
+    def __init__(self, capacity: int = TRACE_BUFFER_SIZE):
+        self._spans: deque = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def run(self, run_id: str | None) -> Iterator[None]:
+        """Attribute spans recorded in this context (thread / task) to `run_id`."""
+        token = _current_run.set(run_id)
+        try:
+            yield
+        finally:
+            _current_run.reset(token)
+
+    @contextmanager
+    def span(self, kind: str, stage: str, run_id: str | None = None, cpu: bool = True) -> Iterator[None]:
+        wall0 = time.perf_counter()
+        cpu0 = time.thread_time() if cpu else 0.0
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(
+                kind,
+                stage,
+                (time.perf_counter() - wall0) * 1000,
+                (time.thread_time() - cpu0) * 1000 if cpu else None,
+                run_id or _current_run.get(),
+                ok,
+            )
+
+    def record(self, kind: str, stage: str, wall_ms: float, cpu_ms: float | None, run_id: str | None = None, ok: bool = True) -> None:
+        span = {
+            "kind": kind,
+            "stage": stage,
+            "run_id": run_id,
+            "wall_ms": round(wall_ms, 3),
+            "cpu_ms": None if cpu_ms is None else round(cpu_ms, 3),
+            "ok": ok,
+            "ts": time.time(),
+        }
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, run_id: str | None = None) -> List[Dict]:
+        """Buffered spans, oldest first (optionally one run's)."""
+        with self._lock:
+            spans = list(self._spans)
+        return spans if run_id is None else [s for s in spans if s["run_id"] == run_id]
+
+    def summary(self, run_id: str | None = None) -> List[Dict]:
+        """
+        Per (kind, stage): count and wall / CPU p50, p95, p99 in ms over
+        spans that completed (interrupted or failed spans are left out).
+        """
+        groups: Dict[tuple, List[Dict]] = {}
+        for s in self.spans(run_id):
+            if s["ok"]:
+                groups.setdefault((s["kind"], s["stage"]), []).append(s)
+        rows = []
+        for (kind, stage), spans in groups.items():
+            row = {"kind": kind, "stage": stage, "count": len(spans)}
+            for metric in ("wall_ms", "cpu_ms"):
+                values = sorted(s[metric] for s in spans if s[metric] is not None)
+                for q in PERCENTILES:
+                    row[f"{metric[:-3]}_p{q}_ms"] = round(percentile(values, q), 3) if values else None
+            rows.append(row)
+        return rows
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"spans": len(self._spans), "capacity": self._spans.maxlen}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+_TRACER: Tracer | None = None
+_TRACER_LOCK = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer shared by every session and background job."""
+    global _TRACER
+    with _TRACER_LOCK:
+        if _TRACER is None:
+            _TRACER = Tracer()
+        return _TRACER
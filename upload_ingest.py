@@ -0,0 +1,332 @@
+# upload_ingest.py
+# Chunked, memory-bounded ingestion of sidebar uploads into Customer360 frames
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from compaction import compact_customer360
+from data_loader import CUSTOMER360_SHEET
+
+
+# ---------------------------
+# Customer360 schema
+# ---------------------------
+# Column -> pandas dtype applied to every ingested chunk. Fixed per column so
+# in-memory chunks and spilled Parquet parts always share one schema.
+CUSTOMER360_SCHEMA: Dict[str, str] = {
+    "unique_id": "string",
+    "company_name": "string",
+    "Official Domain": "string",
+    "Company Overview": "string",
+    "Company Founding Year": "Int16",
+    "Headquarter Location": "string",
+    "Employee Range": "string",
+    "Company Revenue($)": "string",
+    "Company Industry": "string",
+    "Other Locations": "string",
+    "Tech Install": "string",
+    "Funding Amount($)": "string",
+    "Financial Summary": "string",
+    "Revenue Growth": "string",
+    "Net Income Change": "string",
+    "Operating Cash Flow Change": "string",
+    "CapEx Change": "string",
+    "EPS Change": "string",
+    "Signal Type": "string",
+    "Signal Details": "string",
+    "Signal Links": "string",
+    "Facebook URL": "string",
+    "LinkedIn URL": "string",
+    "Instagram URL": "string",
+    "Company Board Line Number": "string",
+    "lead_priority_label": "string",
+}
+REQUIRED_COLUMNS = ["unique_id", "company_name"]
+
+# Per-session ceiling for an upload held in memory; beyond it chunks spill to disk.
+UPLOAD_MEMORY_CEILING_MB = int(os.environ.get("C360_UPLOAD_MEMORY_MB", "256"))
+UPLOAD_CHUNK_ROWS = int(os.environ.get("C360_UPLOAD_CHUNK_ROWS", "50000"))
+SPILL_ROOT = os.path.join(tempfile.gettempdir(), "c360_uploads")
+# Parsed uploads kept per process, keyed by content hash (shared by all sessions).
+UPLOAD_CACHE_ENTRIES = int(os.environ.get("C360_UPLOAD_CACHE_ENTRIES", "8"))
+
+
+class UploadValidationError(ValueError):
+    """Raised when an uploaded file does not match the Customer360 schema."""
+
+
+# ---------------------------
+# Chunk validation + downcasting
+# ---------------------------
+def validate_columns(columns: List[str]) -> None:
+    """Fail fast if the upload is missing the columns the pipeline keys on."""
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise UploadValidationError(f"Missing required Customer360 column(s): {', '.join(missing)}")
+
+
+def coerce_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Apply the Customer360 schema to one chunk (in place) and return it."""
+    for col, dtype in CUSTOMER360_SCHEMA.items():
+        if col not in chunk.columns:
+            continue
+        if dtype.startswith("Int"):
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce").astype(dtype)
+        else:
+            chunk[col] = chunk[col].astype(dtype)
+    return chunk
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Deep memory footprint of a frame, in bytes."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+# ---------------------------
+# Ingestion
+# ---------------------------
+def _new_spill_dir() -> str:
+    path = os.path.join(SPILL_ROOT, uuid.uuid4().hex)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _spill(chunk: pd.DataFrame, spill_dir: str, part: int) -> None:
+    chunk.to_parquet(os.path.join(spill_dir, f"part-{part:05d}.parquet"), index=False)
+
+
+def ingest_upload(
+    uploaded_file,
+    memory_ceiling_mb: int | None = None,
+    chunk_rows: int | None = None,
+    on_progress: Callable[[int, float], None] | None = None,
+) -> Dict:
+    """
+    Read an uploaded CSV/XLSX into Customer360 form without holding more than
+    `memory_ceiling_mb` in memory. CSVs are streamed in `chunk_rows` chunks;
+    once the ceiling is passed, everything read so far (and every later chunk)
+    is written as Parquet parts to a per-upload spill directory.
+
+    Returns {"df", "spill_dir", "rows", "nbytes", "spilled"}: exactly one of
+    df / spill_dir is set. on_progress(rows_read, fraction_done) is called
+    after each chunk.
+    """
+    ceiling = (memory_ceiling_mb or UPLOAD_MEMORY_CEILING_MB) * 1024 * 1024
+    chunk_rows = chunk_rows or UPLOAD_CHUNK_ROWS
+    total_bytes = getattr(uploaded_file, "size", None) or 0
+
+    if uploaded_file.name.lower().endswith((".xlsx", ".xls")):
+        # Workbooks cannot be streamed; read once, then apply the same schema + ceiling
+        chunks = iter([pd.read_excel(uploaded_file, sheet_name=CUSTOMER360_SHEET)])
+    else:
+        chunks = pd.read_csv(uploaded_file, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+
+    held: List[pd.DataFrame] = []
+    held_bytes = 0
+    spill_dir = None
+    rows = 0
+    part = 0
+
+    try:
+        for chunk in chunks:
+            if rows == 0:
+                validate_columns(list(chunk.columns))
+            chunk = coerce_chunk(chunk)
+            rows += len(chunk)
+            held_bytes += frame_nbytes(chunk)
+
+            if spill_dir is None and held_bytes > ceiling:
+                spill_dir = _new_spill_dir()
+                for prev in held:
+                    _spill(prev, spill_dir, part)
+                    part += 1
+                held = []
+
+            if spill_dir is not None:
+                _spill(chunk, spill_dir, part)
+                part += 1
+            else:
+                held.append(chunk)
+
+            if on_progress is not None:
+                pos = _stream_position(uploaded_file)
+                fraction = min(pos / total_bytes, 1.0) if total_bytes and pos else 0.0
+                on_progress(rows, fraction)
+    except Exception:
+        if spill_dir is not None:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+        raise
+
+    if on_progress is not None:
+        on_progress(rows, 1.0)
+
+    df = None
+    if spill_dir is None:
+        df = pd.concat(held, ignore_index=True) if held else pd.DataFrame(columns=list(CUSTOMER360_SCHEMA))
+        df = compact_customer360(df)
+    return {
+        "df": df,
+        "spill_dir": spill_dir,
+        "rows": rows,
+        "nbytes": held_bytes,
+        "spilled": spill_dir is not None,
+    }
+
+
+def _stream_position(fh) -> int:
+    try:
+        return fh.tell()
+    except Exception:
+        return 0
+
+
+def spilled_columns(spill_dir: str) -> List[str]:
+    """Column names of a spilled upload (read from the first part's schema)."""
+    import pyarrow.parquet as pq
+    parts = sorted(f for f in os.listdir(spill_dir) if f.endswith(".parquet"))
+    return list(pq.read_schema(os.path.join(spill_dir, parts[0])).names) if parts else []
+
+
+def read_spilled(spill_dir: str, columns: List[str] | None = None) -> pd.DataFrame:
+    """Load a spilled upload back (optionally only the `columns` it has), compacted."""
+    if columns is not None:
+        available = set(spilled_columns(spill_dir))
+        columns = [c for c in columns if c in available]
+    return compact_customer360(pd.read_parquet(spill_dir, columns=columns))
+
+
+def discard_spill(spill_dir: str | None) -> None:
+    """Remove a spill directory created by ingest_upload (no-op for None)."""
+    if spill_dir and os.path.abspath(spill_dir).startswith(os.path.abspath(SPILL_ROOT)):
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+# ---------------------------
+# Content-hash upload cache
+# ---------------------------
+# digest -> ingest result. Spill directories are reference counted: the cache
+# entry holds one reference and every SpillLease (a session's upload, a job's
+# loader) another; the directory is removed when the last one is released.
+_UPLOAD_CACHE: "OrderedDict[str, Dict]" = OrderedDict()
+_UPLOAD_LOCK = threading.RLock()
+_UPLOAD_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+_SPILL_REFS: Dict[str, int] = {}
+
+
+def _retain_spill(spill_dir: str) -> None:
+    with _UPLOAD_LOCK:
+        _SPILL_REFS[spill_dir] = _SPILL_REFS.get(spill_dir, 0) + 1
+
+
+def _release_spill(spill_dir: str) -> None:
+    with _UPLOAD_LOCK:
+        refs = _SPILL_REFS.get(spill_dir, 0) - 1
+        if refs > 0:
+            _SPILL_REFS[spill_dir] = refs
+            return
+        _SPILL_REFS.pop(spill_dir, None)
+    discard_spill(spill_dir)
+
+
+class SpillLease:
+    """
+    A reference keeping a spilled upload on disk; calling it loads the
+    upload like read_spilled (so it can serve as a job's dataset loader).
+    Released explicitly with release(), or when the lease is garbage collected.
+    """
+
+    def __init__(self, spill_dir: str):
+        self.spill_dir = spill_dir
+        _retain_spill(spill_dir)
+        self._finalizer = weakref.finalize(self, _release_spill, spill_dir)
+
+    def share(self) -> "SpillLease":
+        """Another lease on the same directory, for a holder with its own lifetime."""
+        return SpillLease(self.spill_dir)
+
+    def release(self) -> None:
+        """Drop this reference (idempotent)."""
+        self._finalizer()
+
+    def __call__(self, columns: List[str] | None = None) -> pd.DataFrame:
+        return read_spilled(self.spill_dir, columns)
+
+
+def upload_digest(uploaded_file) -> str:
+    """SHA-256 of the upload's bytes (name-independent), without copying them."""
+    if hasattr(uploaded_file, "getbuffer"):
+        data = uploaded_file.getbuffer()
+    else:
+        pos = uploaded_file.tell()
+        uploaded_file.seek(0)
+        data = uploaded_file.read()
+        uploaded_file.seek(pos)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _public_result(result: Dict, digest: str, cached: bool) -> Dict:
+    # Called under _UPLOAD_LOCK, so the lease is taken before any eviction
+    out = dict(result, digest=digest, cached=cached)
+    if out["df"] is not None:
+        out["df"] = out["df"].copy(deep=False)
+    out["spill_lease"] = SpillLease(out["spill_dir"]) if out["spill_dir"] is not None else None
+    return out
+
+
+def ingest_upload_cached(uploaded_file, max_entries: int | None = None, **kwargs) -> Dict:
+    """
+    ingest_upload() behind a bounded, process-wide LRU keyed on content hash:
+    identical bytes are parsed once per process, whichever session uploads
+    them. Same return shape as ingest_upload plus "digest", "cached" and
+    "spill_lease" (a SpillLease the caller owns when the upload spilled).
+    """
+    digest = upload_digest(uploaded_file)
+    kind = "xlsx" if uploaded_file.name.lower().endswith((".xlsx", ".xls")) else "csv"
+    key = f"{kind}:{digest}"
+
+    with _UPLOAD_LOCK:
+        hit = _UPLOAD_CACHE.get(key)
+        if hit is not None and (hit["spill_dir"] is None or os.path.isdir(hit["spill_dir"])):
+            _UPLOAD_CACHE.move_to_end(key)
+            _UPLOAD_STATS["hits"] += 1
+            return _public_result(hit, digest, cached=True)
+
+    uploaded_file.seek(0)
+    result = ingest_upload(uploaded_file, **kwargs)
+
+    evicted: List[Dict] = []
+    with _UPLOAD_LOCK:
+        _UPLOAD_STATS["misses"] += 1
+        previous = _UPLOAD_CACHE.pop(key, None)
+        if previous is not None:
+            evicted.append(previous)  # concurrent parse of the same bytes: keep the newest
+        _UPLOAD_CACHE[key] = result
+        if result["spill_dir"] is not None:
+            _retain_spill(result["spill_dir"])
+        limit = max(max_entries or UPLOAD_CACHE_ENTRIES, 1)
+        while len(_UPLOAD_CACHE) > limit:
+            _, old = _UPLOAD_CACHE.popitem(last=False)
+            evicted.append(old)
+            _UPLOAD_STATS["evictions"] += 1
+        public = _public_result(result, digest, cached=False)
+
+    # Spills still leased by a session or job stay on disk until released
+    for old in evicted:
+        if old["spill_dir"] is not None:
+            _release_spill(old["spill_dir"])
+    return public
+
+
+def upload_cache_stats() -> Dict[str, int]:
+    """Hit/miss/eviction counters plus current entry count."""
+    with _UPLOAD_LOCK:
+        return dict(_UPLOAD_STATS, entries=len(_UPLOAD_CACHE))